@@ -1,14 +1,83 @@
-from fastapi import FastAPI, HTTPException
+import time
+# Reference point for the startup report (see /api/system/startup)
+_process_started = time.perf_counter()
+
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse, PlainTextResponse
+from pydantic import BaseModel, ValidationError
 import pandas as pd
 import numpy as np
+import anyio
+import asyncio
+import contextlib
+import functools
+import json
+import logging
+import os
+import threading
 from typing import List, Optional, Dict, Any
 
-from backend.utils.data_loader import load_data, get_data_dictionary
-from backend.utils.stat_utils import fit_distribution, ks_test_normality, calculate_entropy, perform_pca, regression_analysis, cramers_v, perform_ttest, calculate_gini
+from backend.utils.data_loader import load_data, default_dataset_path
+from backend.utils.stat_utils import fit_distribution, regression_analysis, perform_ttest, calculate_gini
+from backend.utils.model_selection import cross_validate_models
+from backend.utils.decomposition import fit_pca, pca_from_comoments, pca_scores, project_rows, factor_analysis, sample_rows
+from backend.utils.clustering import cluster_sweep
+from backend.utils.resampling import permutation_test, bootstrap_means
+from backend.utils.composite_index import build_index
+from backend.utils.counterfactual import fit_counterfactual_model, counterfactual_curve
+from backend.utils.classification import fit_classifier
+from backend.utils.jobs import JobManager
+from backend.utils.singleflight import SingleFlight, coalesce, singleflight_stats
+from backend.utils.cache import cache_stats, dataset_version
+from backend.utils.result_store import persist, default_store, operation_name, result_key
+from backend.utils.instrumentation import InstrumentedRoute, GaugeFunction, metrics_middleware, phase, registry
+from backend.utils.correlation import correlation_matrix, correlation_result, to_json_matrix
+from backend.utils.hypothesis import cramers_v_matrix, two_group_test, k_group_test, chi_square_test, chi_square_from_table, sweep_group_tests, TWO_GROUP_TESTS, K_GROUP_TESTS
+from backend.utils.shared_data import attach_dataset
+from backend.utils.scatter import scatter_summary
+from backend.utils.frequency import column_frequencies, frequencies_for, density
+from backend.utils.profiling import profile_for
+from backend.utils.export import EXPORT_FORMATS, BATCH_ROWS, check_format, segment_mask, frame_batches, stream_frames
+from backend.utils.information import cube_information, ranked_pairs
+from backend.utils.contingency import cube_for, normalize_table, DEFAULT_BINS as CUBE_BINS
+from backend.utils.chunked import ChunkedDataset, describe_moments, ols_from_sums, gini_from_counts, bootstrap_means_from_counts, DEFAULT_CHUNK_SIZE
+from backend.utils.lazy import lazy_import, lazy_status, preload_in_background
+
+# Heavy scientific libraries are imported on first use (or by the background preload)
+stats = lazy_import("scipy.stats")
+
+logger = logging.getLogger(__name__)
+
+startup = {"import_seconds": time.perf_counter() - _process_started}
+
+def _warm_dataset_caches():
+    started = time.perf_counter()
+    profile_for(df)
+    startup["profile_seconds"] = time.perf_counter() - started
+    started = time.perf_counter()
+    frequencies_for(df)
+    startup["frequencies_seconds"] = time.perf_counter() - started
 
-app = FastAPI(title="Social Media Addiction API", version="1.0")
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    startup["ready_seconds"] = time.perf_counter() - _process_started
+    # Once the server is accepting requests, warm the lazy modules so first requests don't pay for them
+    startup["preload"] = os.environ.get("LAZY_PRELOAD", "1") != "0"
+    if startup["preload"]:
+        preload_in_background()
+        # Data profile and histogram/value-count caches, so requests never rescan the data for them
+        if not df.empty:
+            threading.Thread(target=_warm_dataset_caches, name="dataset-caches", daemon=True).start()
+    logger.info("API ready in %.2fs (imports %.2fs, dataset %.2fs)",
+                startup["ready_seconds"], startup["import_seconds"], startup["dataset_seconds"])
+    yield
+
+app = FastAPI(title="Social Media Addiction API", version="1.0", lifespan=lifespan)
+# Times (and optionally profiles) every endpoint declared below
+app.router.route_class = InstrumentedRoute
+app.middleware("http")(metrics_middleware)
 
 # Enable CORS for React Frontend
 app.add_middleware(
@@ -19,8 +88,133 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Load Data Once
-df = load_data()
+_dataset_started = time.perf_counter()
+# Load Data Once. DATASET_MODE=chunked streams DATASET_PATH in row chunks instead
+# (for snapshots larger than memory); endpoints that need the whole frame then answer 501.
+if os.environ.get("DATASET_MODE", "memory") == "chunked":
+    chunked = ChunkedDataset(os.environ.get("DATASET_PATH") or default_dataset_path(),
+                             chunk_size=int(os.environ.get("CHUNK_SIZE", DEFAULT_CHUNK_SIZE)))
+    df = pd.DataFrame()
+elif os.environ.get("DATASET_SHARED_DIR"):
+    # Read-only views over column files exported once by backend/serve.py and shared by all workers
+    chunked = None
+    df = attach_dataset(os.environ["DATASET_SHARED_DIR"])
+else:
+    chunked = None
+    df = load_data()
+startup["dataset_seconds"] = time.perf_counter() - _dataset_started
+
+def _not_in_chunked_mode():
+    return HTTPException(status_code=501, detail="Not available in chunked dataset mode")
+
+def memory_only(fn):
+    """For endpoints that need the whole dataset in memory: 501 in chunked mode."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if chunked is not None:
+            raise _not_in_chunked_mode()
+        return fn(*args, **kwargs)
+    return wrapper
+
+def _complete_rows(cols):
+    return chunked.complete_rows(cols) if chunked is not None else profile_for(df).effective_n(cols)
+
+def _sample_size(cols=None, n=None):
+    """
+    effective_n (rows an analysis used) and rows_dropped (rows it lost to missing values).
+    Given both cols and n (the rows a filtered analysis used), rows_filtered counts the
+    complete rows in cols that the filter excluded.
+    """
+    total = chunked.n_rows if chunked is not None else len(df)
+    if n is None or cols is None:
+        n = _complete_rows(cols) if n is None else n
+        return {"effective_n": int(n), "rows_dropped": int(total - n)}
+    complete = _complete_rows(cols)
+    return {"effective_n": int(n), "rows_dropped": int(total - complete), "rows_filtered": int(complete - n)}
+
+def sample_size(columns):
+    """
+    Adds _sample_size over columns(*route args) to a route's dict response: the rows complete
+    in every column the analysis reads. Routes with pairwise deletion report their own.
+    """
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            result = fn(*args, **kwargs)
+            if isinstance(result, dict) and "effective_n" not in result:
+                # A new dict: the result may be shared with a cache
+                result = {**result, **_sample_size(columns(*args, **kwargs))}
+            return result
+        return wrapper
+    return decorate
+
+# Background jobs for long-running computations
+jobs = JobManager(max_workers=int(os.environ.get("JOB_WORKERS", "2")))
+
+# Identical concurrent analytical requests share one execution
+analysis_flights = SingleFlight("analysis")
+
+def _dataset_token():
+    # Content hash in memory/shared mode; path, size and mtime of the snapshot in chunked mode
+    return chunked.version if chunked is not None else dataset_version(df)
+
+# Finished analytical results are kept on disk across restarts and shared by workers
+stored = persist(dataset=_dataset_token)
+
+def _stored_key(fn):
+    """Key function of the result @stored keeps for fn(req=...) (FastAPI passes the body by name)."""
+    name = operation_name(fn)
+    return lambda req: result_key(name, [(), {"req": req}], _dataset_token())
+
+def _seeded_key(fn):
+    """_stored_key for random draws: only a seeded request has a reproducible result to keep."""
+    key = _stored_key(fn)
+    return lambda req: key(req) if req.seed is not None else None
+
+# --- Metrics collected at scrape time ---
+_dataset_bytes = int(df.memory_usage(deep=True).sum()) if not df.empty else 0
+
+def _threadpool_stats():
+    limiter = anyio.to_thread.current_default_thread_limiter().statistics()
+    return {("busy",): limiter.borrowed_tokens, ("waiting",): limiter.tasks_waiting}
+
+registry.add(GaugeFunction("dataset_memory_bytes", "In-memory size of the loaded dataset.", (),
+                           lambda: {(): _dataset_bytes}))
+registry.add(GaugeFunction("dataset_rows", "Rows in the loaded dataset.", (), lambda: {(): len(df)}))
+registry.add(GaugeFunction("threadpool_workers", "Request worker threads by state.", ("state",), _threadpool_stats))
+registry.add(GaugeFunction("job_queue_depth", "Background jobs waiting for a worker.", (),
+                           lambda: {(): jobs.queue_depth()}))
+registry.add(GaugeFunction("jobs_active", "Background jobs queued or running.", (),
+                           lambda: {(): len(jobs.active_jobs())}))
+registry.add(GaugeFunction("cache_hits_total", "Result cache hits.", ("cache",),
+                           lambda: {(name,): st["hits"] for name, st in cache_stats().items()}, "counter"))
+registry.add(GaugeFunction("cache_misses_total", "Result cache misses.", ("cache",),
+                           lambda: {(name,): st["misses"] for name, st in cache_stats().items()}, "counter"))
+registry.add(GaugeFunction("cache_entries", "Entries currently held per cache.", ("cache",),
+                           lambda: {(name,): st["size"] for name, st in cache_stats().items()}))
+registry.add(GaugeFunction("singleflight_coalesced_total", "Requests that waited on an identical in-flight computation.",
+                           ("group",), lambda: {(name,): st["coalesced"] for name, st in singleflight_stats().items()},
+                           "counter"))
+registry.add(GaugeFunction("singleflight_executions_total", "Computations actually executed per single-flight group.",
+                           ("group",), lambda: {(name,): st["executions"] for name, st in singleflight_stats().items()},
+                           "counter"))
+
+def _result_store_stats():
+    store = default_store()
+    return store.stats() if store is not None else None
+
+def _result_store_gauge(field):
+    def collect():
+        st = _result_store_stats()
+        return {(): st[field]} if st is not None else {}
+    return collect
+
+registry.add(GaugeFunction("result_store_hits_total", "Results served from the on-disk store.", (),
+                           _result_store_gauge("hits"), "counter"))
+registry.add(GaugeFunction("result_store_misses_total", "Results computed because the on-disk store had none.", (),
+                           _result_store_gauge("misses"), "counter"))
+registry.add(GaugeFunction("result_store_bytes", "Size of the results held in the on-disk store.", (),
+                           _result_store_gauge("bytes")))
 
 # --- Models ---
 class RegressionRequest(BaseModel):
@@ -34,8 +228,37 @@ class RegressionRequest(BaseModel):
 def read_root():
     return {"message": "Social Media Addiction Analysis API is running."}
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    # Rendered on the event loop so the threadpool limiter can be inspected
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/api/system/startup")
+def get_startup_report():
+    """Seconds from the start of this module's import to end of imports and to ready, dataset load time, and lazy module state."""
+    return {**startup, "lazy_modules": lazy_status()}
+
+@app.get("/api/system/result_store")
+def get_result_store_stats():
+    return _result_store_stats() or {"enabled": False}
+
+@app.delete("/api/system/result_store")
+def clear_result_store():
+    store = default_store()
+    if store is not None:
+        store.clear()
+    return _result_store_stats() or {"enabled": False}
+
+@app.get("/api/system/coalescing")
+def get_coalescing_stats():
+    return singleflight_stats()
+
 @app.get("/api/summary")
+@coalesce(analysis_flights)
+@stored
 def get_summary():
+    if chunked is not None:
+        return _chunked_summary()
     if df.empty:
         raise HTTPException(status_code=500, detail="Data not loaded")
     
@@ -49,21 +272,79 @@ def get_summary():
     }
     return summary
 
+def _chunked_summary():
+    cols = ['Avg_Daily_Usage_Hours', 'Addicted_Score', 'Mental_Health_Score']
+    means = chunked.moments(cols)['mean']
+    return {
+        "total_students": int(chunked.n_rows),
+        "avg_usage": float(means[0]),
+        "avg_addiction": float(means[1]),
+        "avg_mental_health": float(means[2]),
+        "columns": chunked.columns
+    }
+
+@app.get("/api/profile")
+def get_profile():
+    """
+    Data-quality profile computed once per dataset version: missing, coerced, distinct,
+    min/max, outlier and type-violation counts per column.
+    """
+    if chunked is not None:
+        return chunked.profile()
+    if df.empty:
+        raise HTTPException(status_code=500, detail="Data not loaded")
+    return profile_for(df).to_dict()
+
 @app.get("/api/raw_data")
 def get_raw_data(limit: int = 100):
+    if chunked is not None:
+        return chunked.head(limit).fillna("").to_dict(orient="records")
     if df.empty:
         return []
-    return df.head(limit).fillna("").to_dict(orient="records")
+    # object dtype so categorical (shared-mode) columns accept the "" filler too
+    return df.head(limit).astype(object).fillna("").to_dict(orient="records")
+
+def _parse_bins(bins):
+    """A bin count or 'fd' (Freedman-Diaconis) from the query string."""
+    if bins == "fd":
+        return bins
+    try:
+        value = int(bins)
+    except ValueError:
+        value = 0
+    if value < 1:
+        raise HTTPException(status_code=400, detail="bins must be a positive integer or 'fd'")
+    return value
+
+def _column_frequencies(col):
+    if chunked is not None:
+        if col not in chunked.columns:
+            raise HTTPException(status_code=404, detail="Column not found")
+        return chunked.frequencies(col)
+    if col not in df.columns:
+        raise HTTPException(status_code=404, detail="Column not found")
+    return column_frequencies(df, col)
 
 @app.get("/api/eda/dist/{col}")
-def get_distribution(col: str, dist_type: str = "norm"):
+@coalesce(analysis_flights)
+@stored
+@sample_size(lambda col, **_: [col])
+def get_distribution(col: str, dist_type: str = "norm", bins: str = "30"):
+    """Histogram (a bin count or 'fd') re-aggregated from the cached column frequencies, plus the fitted curve."""
+    bins = _parse_bins(bins)
+    if chunked is not None:
+        return _chunked_distribution(col, dist_type, bins)
     if col not in df.columns:
         raise HTTPException(status_code=404, detail="Column not found")
     
-    data = df[col].dropna()
+    with phase("load"):
+        data = df[col].dropna()
     
     # Histogram Data
-    hist_values, bin_edges = np.histogram(data, bins=30, density=True)
+    try:
+        counts, bin_edges = _column_frequencies(col).histogram(bins)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     # Fitted Curve
     x_vals, pdf_vals, params = fit_distribution(data, dist_type)
@@ -71,7 +352,8 @@ def get_distribution(col: str, dist_type: str = "norm"):
     return {
         "histogram": {
             "x": ((bin_edges[:-1] + bin_edges[1:]) / 2).tolist(),
-            "y": hist_values.tolist()
+            "y": density(counts, bin_edges).tolist(),
+            "edges": bin_edges.tolist()
         },
         "fitted": {
             "x": x_vals.tolist() if x_vals is not None else [],
@@ -86,116 +368,558 @@ def get_distribution(col: str, dist_type: str = "norm"):
         }
     }
 
+def _chunked_distribution(col, dist_type, bins):
+    if col not in chunked.columns:
+        raise HTTPException(status_code=404, detail="Column not found")
+    try:
+        counts, edges = chunked.frequencies(col).histogram(bins)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    moments = chunked.describe(col)
+
+    if dist_type == "norm":
+        # The normal MLE only needs the mean and the (ddof=0) variance
+        n = moments["count"]
+        mu, std = moments["mean"], moments["std"] * np.sqrt((n - 1) / n)
+        x_vals = np.linspace(moments["min"], moments["max"], 100)
+        pdf_vals, params = stats.norm.pdf(x_vals, mu, std), {"mu": mu, "std": std}
+    else:
+        # Other families are fitted on a uniform reservoir sample
+        x_vals, pdf_vals, params = fit_distribution(pd.Series(chunked.reservoir_sample(col)), dist_type)
+
+    return {
+        "histogram": {
+            "x": ((edges[:-1] + edges[1:]) / 2).tolist(),
+            "y": density(counts, edges).tolist(),
+            "edges": edges.tolist()
+        },
+        "fitted": {
+            "x": x_vals.tolist() if x_vals is not None else [],
+            "y": pdf_vals.tolist() if pdf_vals is not None else [],
+            "params": params
+        },
+        "stats": {k: moments[k] for k in ("skewness", "kurtosis", "mean", "std")}
+    }
+
+@app.get("/api/eda/pmf/{col}")
+@sample_size(lambda col: [col])
+def get_pmf(col: str):
+    """Exact probability of each value of a discrete column, from the cached column frequencies."""
+    freq = _column_frequencies(col)
+    try:
+        pmf = freq.pmf()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "values": pmf.index.tolist(),
+        "probability": pmf.tolist(),
+        "n": int(freq.n),
+        "missing": int(freq.missing)
+    }
+
+class CorrelationRequest(BaseModel):
+    cols: Optional[List[str]] = None
+    method: str = "pearson"
+    partial: bool = False
+    confidence: float = 0.95
+
 @app.post("/api/bivariate/correlation")
-def get_correlation_matrix():
-    numeric_df = df.select_dtypes(include=[np.number])
-    # Exclude ID
-    if 'Student_ID' in numeric_df.columns:
-        numeric_df = numeric_df.drop(columns=['Student_ID'])
+@coalesce(analysis_flights)
+@stored
+def get_correlation_matrix(req: Optional[CorrelationRequest] = None):
+    req = req or CorrelationRequest()
+    columns = chunked.columns if chunked is not None else df.columns
+    if req.cols:
+        cols = req.cols
+        missing = [c for c in cols if c not in columns]
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Column not found: {', '.join(missing)}")
+    else:
+        # All numeric columns except the ID
+        numeric = chunked.numeric_columns if chunked is not None else df.select_dtypes(include=[np.number]).columns
+        cols = [c for c in numeric if c != 'Student_ID']
+
+    try:
+        if chunked is not None:
+            # Only Pearson co-moments merge across chunks; rank methods need the full column
+            if req.method != "pearson":
+                raise _not_in_chunked_mode()
+            r, n = chunked.pearson(cols)
+            result = correlation_result(r, n, partial=req.partial, confidence=req.confidence)
+        else:
+            result = correlation_matrix(df, cols, method=req.method, partial=req.partial, confidence=req.confidence)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    response = {
+        "x": cols,
+        "y": cols,
+        "z": to_json_matrix(result['r']),
+        "method": req.method,
+        "n": result['n'].astype(int).tolist(),
+        # Pairwise deletion: the smallest pair's n
+        **_sample_size(n=result['n'].min()),
+        "p_values": to_json_matrix(result['p_value']),
+        "ci_low": to_json_matrix(result['ci_low']),
+        "ci_high": to_json_matrix(result['ci_high'])
+    }
+    if req.partial:
+        response["partial"] = to_json_matrix(result['partial'])
+        response["partial_p_values"] = to_json_matrix(result.get('partial_p_value'))
+    return response
+
+class ScatterRequest(BaseModel):
+    x_col: str
+    y_col: str
+    color_col: Optional[str] = None
+    mode: str = "auto"
+    # Plot size in pixels; sets the point budget and the hexagon grid
+    width: int = 800
+    height: int = 500
+    max_points: Optional[int] = None
+    hex_px: int = 12
+    confidence: float = 0.95
+    seed: int = 0
+
+@app.post("/api/bivariate/scatter")
+@memory_only
+@coalesce(analysis_flights)
+@stored
+@sample_size(lambda req: [req.x_col, req.y_col] + ([req.color_col] if req.color_col else []))
+def get_scatter(req: ScatterRequest):
+    """Downsampled points or hexbin counts sized to the plot, with OLS lines and confidence bands."""
+    cols = [req.x_col, req.y_col] + ([req.color_col] if req.color_col else [])
+    missing = [c for c in cols if c not in df.columns]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Column not found: {', '.join(missing)}")
+    if not all(pd.api.types.is_numeric_dtype(df[c]) for c in (req.x_col, req.y_col)):
+        raise HTTPException(status_code=400, detail="x_col and y_col must be numeric")
+    if not (1 <= req.width <= 10_000 and 1 <= req.height <= 10_000 and 2 <= req.hex_px <= req.width):
+        raise HTTPException(status_code=400, detail="width/height must be in [1, 10000] and hex_px in [2, width]")
+    try:
+        with phase("load"):
+            return scatter_summary(df, req.x_col, req.y_col, req.color_col, mode=req.mode, width=req.width,
+                                   height=req.height, max_points=req.max_points, hex_px=req.hex_px,
+                                   confidence=req.confidence, seed=req.seed)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+class CrosstabRequest(BaseModel):
+    row: str
+    col: Optional[str] = None
+    given: Dict[str, List[str]] = {}
+    normalize: str = "none"
+    chi_square: bool = False
+
+def _contingency_cube():
+    return chunked.contingency_cube(CUBE_BINS) if chunked is not None else cube_for(df, CUBE_BINS)
+
+@app.get("/api/bivariate/crosstab")
+def get_crosstab_dimensions():
+    """
+    Columns of the contingency cube and their levels (numeric columns appear as bins), and
+    the columns a conditional (`given`) table can use.
+    """
+    cube = _contingency_cube()
+    return {"dimensions": cube.levels, "conditional": cube.joint_names, "cells": int(cube.n_cells)}
+
+@app.post("/api/bivariate/crosstab")
+def get_crosstab(req: CrosstabRequest):
+    """
+    Marginal (row only), joint (row by col) or conditional (normalize='index'/'columns', or
+    `given` levels of any other columns) counts and probabilities, sliced from the
+    contingency cube rather than the rows.
+    """
+    cube = _contingency_cube()
+    missing = [c for c in [req.row, req.col, *req.given] if c is not None and c not in cube.levels]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Column not found: {', '.join(missing)}")
+    try:
+        table = cube.table(req.row, req.col, req.given)
+        probabilities = normalize_table(table, req.normalize)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    response = {
+        "row": req.row,
+        "col": req.col,
+        "given": req.given,
+        "normalize": req.normalize,
+        "n": int(table.to_numpy().sum()),
+        # The `given` levels select a subset of the complete rows
+        **_sample_size([req.row] + ([req.col] if req.col else []) + list(req.given), n=table.to_numpy().sum()),
+        "rows": [str(r) for r in table.index],
+        "cols": [str(c) for c in table.columns] if req.col is not None else [],
+        "counts": table.to_numpy().tolist(),
+        "values": probabilities.to_numpy().tolist()
+    }
+    if req.chi_square:
+        if req.col is None:
+            raise HTTPException(status_code=400, detail="chi_square needs both row and col")
+        try:
+            response["chi_square"] = chi_square_from_table(table)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    return response
+
+class CramersRequest(BaseModel):
+    cols: Optional[List[str]] = None
+
+@app.post("/api/bivariate/cramers")
+@coalesce(analysis_flights)
+@stored
+def get_cramers_matrix(req: Optional[CramersRequest] = None):
+    """Cramér's V of every pair of columns from the contingency cube (numeric columns use its bins)."""
+    req = req or CramersRequest()
+    cube = _contingency_cube()
+    cols = req.cols or cube.names
+    missing = [c for c in cols if c not in cube.levels]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Column not found: {', '.join(missing)}")
+    try:
+        result = cramers_v_matrix(cube, cols)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "cols": cols,
+        # Pairwise deletion: the smallest pair's n
+        **_sample_size(n=result["pair_n"].min()),
+        "cramers_v": to_json_matrix(result["cramers_v"].to_numpy())
+    }
+
+class InformationRequest(BaseModel):
+    cols: Optional[List[str]] = None
+    top: int = 20
+
+@app.post("/api/bivariate/information")
+@coalesce(analysis_flights)
+@stored
+def get_information_matrices(req: Optional[InformationRequest] = None):
+    """
+    Entropy of every column and pairwise mutual information, normalized MI and conditional
+    entropy (bits), from the contingency cube: numeric columns use its bins.
+    """
+    req = req or InformationRequest()
+    cube = _contingency_cube()
+    cols = req.cols or cube.names
+    missing = [c for c in cols if c not in cube.levels]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Column not found: {', '.join(missing)}")
+
+    result = cube_information(cube, cols)
+    return {
+        "cols": cols,
+        "entropy": dict(zip(cols, result["entropy"].tolist())),
+        "n": dict(zip(cols, result["n"].tolist())),
+        # Pairwise deletion: the smallest pair's n
+        **_sample_size(n=result["pair_n"].min()),
+        "mutual_information": to_json_matrix(result["mutual_information"]),
+        "normalized_mi": to_json_matrix(result["normalized_mi"]),
+        # conditional_entropy[i][j] = H(cols[i] | cols[j])
+        "conditional_entropy": to_json_matrix(result["conditional_entropy"]),
+        "top_pairs": ranked_pairs(result, req.top)
+    }
+
+def _regression_payload(req: RegressionRequest, progress=None):
+    # progress(fraction) is called between stages; the fit itself is one statsmodels call
+    progress = progress or (lambda fraction: None)
+    if chunked is not None:
+        return _chunked_regression_payload(req, progress)
+    if req.model_type == "Logit":
+        # Shares the cached fit behind /api/models/predict
+        try:
+            model = fit_classifier(df, req.target, req.predictors).result
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    else:
+        model = regression_analysis(df, req.target, req.predictors, req.model_type)
+    if model is None:
+        raise HTTPException(status_code=400, detail="Model training failed")
+    progress(0.8)
         
-    corr_matrix = numeric_df.corr().fillna(0)
+    summary_html = model.summary().as_html()
+    
+    # Extract key metrics
+    diagnostics = {
+        "r_squared": model.rsquared if hasattr(model, 'rsquared') else model.prsquared,
+        "aic": model.aic,
+        "params": model.params.to_dict(),
+        "pvalues": model.pvalues.to_dict()
+    }
     
     return {
-        "x": corr_matrix.columns.tolist(),
-        "y": corr_matrix.columns.tolist(),
-        "z": corr_matrix.values.tolist()
+        "summary_html": summary_html,
+        "diagnostics": diagnostics
+    }
+
+def _chunked_regression_payload(req: RegressionRequest, progress):
+    # OLS is solved from X'X / X'y accumulated per chunk; Logit needs iterative passes
+    if req.model_type != "OLS":
+        raise _not_in_chunked_mode()
+    missing = [c for c in [req.target] + req.predictors if c not in chunked.columns]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Column not found: {', '.join(missing)}")
+    names = ["const"] + req.predictors
+    fit = ols_from_sums(*chunked.ols_sums(req.target, req.predictors, check=lambda: progress(0.0)), names)
+    progress(0.8)
+    table = pd.DataFrame({k: fit[k] for k in ("params", "bse", "tvalues", "pvalues")})
+    table.columns = ["coef", "std err", "t", "P>|t|"]
+    summary_html = (f"<p>OLS Regression Results: Dep. Variable {req.target}, "
+                    f"No. Observations {fit['nobs']}, R-squared {fit['rsquared']:.3f}, AIC {fit['aic']:.1f}</p>"
+                    + table.to_html(float_format=lambda v: f"{v:.4f}"))
+    return {
+        "summary_html": summary_html,
+        "diagnostics": {
+            "r_squared": fit["rsquared"],
+            "aic": fit["aic"],
+            "params": fit["params"],
+            "pvalues": fit["pvalues"]
+        }
     }
 
 @app.post("/api/models/regression")
+@coalesce(analysis_flights)
+@stored
+@sample_size(lambda req: [req.target] + req.predictors)
 def run_regression(req: RegressionRequest):
     try:
-        model = regression_analysis(df, req.target, req.predictors, req.model_type)
-        if model is None:
-            raise HTTPException(status_code=400, detail="Model training failed")
-            
-        summary_html = model.summary().as_html()
-        
-        # Extract key metrics
-        diagnostics = {
-            "r_squared": model.rsquared if hasattr(model, 'rsquared') else model.prsquared,
-            "aic": model.aic,
-            "params": model.params.to_dict(),
-            "pvalues": model.pvalues.to_dict()
-        }
-        
-        return {
-            "summary_html": summary_html,
-            "diagnostics": diagnostics
-        }
+        return _regression_payload(req)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+class PredictRequest(BaseModel):
+    target: str = "Affects_Academic_Performance"
+    predictors: List[str] = ['Addicted_Score']
+    positive_label: str = "Yes"
+    # Feature vectors ({predictor: value}) to score with the fitted model
+    rows: List[Dict[str, float]] = []
+    curves: bool = True
+
+def _arrays_to_lists(d):
+    return {k: v.tolist() for k, v in d.items()}
+
+@app.post("/api/models/predict")
+@memory_only
+@sample_size(lambda req: [req.target] + req.predictors)
+def predict_classifier(req: PredictRequest):
+    """
+    Logistic regression fitted once per dataset and model; supplied rows are scored with the
+    cached coefficients. Also returns ROC/AUC, calibration bins and per-predictor probability curves.
+    """
+    missing = [c for c in [req.target] + req.predictors if c not in df.columns]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Column not found: {', '.join(missing)}")
+    if not req.predictors:
+        raise HTTPException(status_code=400, detail="At least one predictor is required")
+
+    try:
+        with phase("load"):
+            model = fit_classifier(df, req.target, req.predictors, req.positive_label)
+        new_rows = np.array([[row[c] for c in req.predictors] for row in req.rows],
+                            dtype=float).reshape(-1, len(req.predictors))
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=f"Row is missing predictor {e}")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if np.isnan(new_rows).any():
+        raise HTTPException(status_code=400, detail="Rows must not contain missing values")
+
+    scores = model.predict(new_rows, interval=True)
+    return {
+        "target": model.target,
+        "positive_label": model.positive_label,
+        "n": model.n,
+        "coefficients": dict(zip(["const"] + model.predictors, model.params.tolist())),
+        "metrics": model.metrics,
+        "roc": _arrays_to_lists(model.roc),
+        "calibration": _arrays_to_lists(model.calibration),
+        "curves": {c: _arrays_to_lists(curve) for c, curve in model.curves.items()} if req.curves else None,
+        "predictions": [{k: float(v[i]) for k, v in scores.items()} for i in range(len(new_rows))]
+    }
+
+class CrossValidationRequest(BaseModel):
+    target: str
+    candidates: List[List[str]]
+    model_type: str = "OLS"
+    k: int = 5
+    repeats: int = 1
+    seed: int = 0
+    positive_label: str = "Yes"
+
+def _cross_validation_payload(req: CrossValidationRequest, progress=None):
+    if not req.candidates or any(len(c) == 0 for c in req.candidates):
+        raise HTTPException(status_code=400, detail="Each candidate needs at least one predictor")
+    cols = {req.target} | {c for cand in req.candidates for c in cand}
+    missing = sorted(cols - set(df.columns))
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Column not found: {', '.join(missing)}")
+
+    try:
+        results = cross_validate_models(df, req.target, req.candidates, req.model_type,
+                                        k=req.k, repeats=req.repeats, seed=req.seed,
+                                        positive_label=req.positive_label, progress=progress)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {
+        "model_type": req.model_type,
+        "k": req.k,
+        "repeats": req.repeats,
+        "seed": req.seed,
+        "results": results
+    }
+
+@app.post("/api/models/cv")
+@memory_only
+@coalesce(analysis_flights)
+@stored
+def run_cross_validation(req: CrossValidationRequest):
+    return _cross_validation_payload(req)
+
 class PcaRequest(BaseModel):
     cols: List[str]
+    n_components: Optional[int] = None
+    method: str = "auto"
+    max_points: int = 2000
+
+def _chunked_pca(req):
+    """PCA from the complete-row co-moments; biplot scores project a reservoir sample of rows."""
+    if req.method not in ('auto', 'comoments'):
+        raise ValueError("Only the 'comoments' PCA method is available in chunked mode")
+    if req.max_points < 0:
+        raise ValueError("max_points must be non-negative")
+    fit = pca_from_comoments(*chunked.complete_comoments(req.cols), n_components=req.n_components)
+    rows, sample = chunked.reservoir_rows(req.cols, req.max_points)
+    scores = ((sample - fit['mean']) / fit['scale']) @ fit['components'][:2].T
+    return fit['explained_variance_ratio'], fit['components'], 'comoments', fit['n_samples'], rows, scores
 
 @app.post("/api/multivariate/pca")
+@coalesce(analysis_flights)
+@stored
+@sample_size(lambda req: req.cols)
 def get_pca(req: PcaRequest):
+    columns = chunked.columns if chunked is not None else df.columns
+    missing = [c for c in req.cols if c not in columns]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Column not found: {', '.join(missing)}")
+    if len(req.cols) < 2:
+        raise HTTPException(status_code=400, detail="Select at least 2 columns")
+
     try:
-        pca, scaled_data, components = perform_pca(df, req.cols)
-        
+        if chunked is not None:
+            ratio, components, method, n_samples, rows, scores = _chunked_pca(req)
+        else:
+            fit = fit_pca(df, req.cols, n_components=req.n_components, method=req.method)
+            ratio, components = fit['pca'].explained_variance_ratio_, fit['pca'].components_
+            method, n_samples = fit['method'], fit['n_samples']
+            rows, scores = pca_scores(df, req.cols, fit, max_points=req.max_points)
+
         return {
-            "explained_variance": pca.explained_variance_ratio_.tolist(),
-            "cumulative_variance": np.cumsum(pca.explained_variance_ratio_).tolist(),
-            "components": pca.components_.tolist(),
-            "feature_names": req.cols
+            "explained_variance": ratio.tolist(),
+            "cumulative_variance": np.cumsum(ratio).tolist(),
+            "components": components.tolist(),
+            "feature_names": req.cols,
+            "method": method,
+            "n_samples": n_samples,
+            "scores": {
+                "x": scores[:, 0].tolist(),
+                "y": scores[:, 1].tolist() if scores.shape[1] > 1 else [],
+                "row": rows.tolist()
+            }
         }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-class BoxPlotRequest(BaseModel):
-    x_col: str
-    y_col: str
+class FactorRequest(BaseModel):
+    cols: List[str]
+    n_factors: int = 2
+    rotation: Optional[str] = "varimax"
 
-@app.post("/api/bivariate/boxplot")
-def get_boxplot_stats(req: BoxPlotRequest):
-    if req.x_col not in df.columns or req.y_col not in df.columns:
-        raise HTTPException(status_code=404, detail="Column not found")
-        
-    data = df[[req.x_col, req.y_col]].dropna()
-    
-    results = []
-    groups = data.groupby(req.x_col)[req.y_col]
-    
-    for name, group in groups:
-        # Calculate quartiles using numpy
-        q1 = np.percentile(group, 25)
-        median = np.percentile(group, 50)
-        q3 = np.percentile(group, 75)
-        iqr = q3 - q1
-        
-        # Calculate whiskers (1.5 * IQR rule)
-        lower_whisker = max(group.min(), q1 - 1.5 * iqr)
-        upper_whisker = min(group.max(), q3 + 1.5 * iqr)
-        
-        # Identify outliers
-        outliers = group[(group < lower_whisker) | (group > upper_whisker)].tolist()
-        
-        # Count for sizing/info
-        count = len(group)
-        
-        results.append({
-            "category": str(name),
-            "min": float(lower_whisker),
-            "q1": float(q1),
-            "median": float(median),
-            "q3": float(q3),
-            "max": float(upper_whisker),
-            "outliers": [float(x) for x in outliers],
-            "count": int(count)
-        })
-        
-    return results
+@app.post("/api/multivariate/factor")
+@memory_only
+@coalesce(analysis_flights)
+@stored
+@sample_size(lambda req: req.cols)
+def get_factor_analysis(req: FactorRequest):
+    missing = [c for c in req.cols if c not in df.columns]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Column not found: {', '.join(missing)}")
+
+    try:
+        fa = factor_analysis(df, req.cols, n_factors=req.n_factors, rotation=req.rotation)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {
+        "feature_names": req.cols,
+        "factor_names": [f"F{i+1}" for i in range(req.n_factors)],
+        "loadings": fa['loadings'].tolist(),
+        "communalities": fa['communalities'].tolist(),
+        "uniquenesses": fa['uniquenesses'].tolist(),
+        "variance_explained": fa['variance_explained'].tolist(),
+        "rotation": req.rotation,
+        "n_samples": fa['n_samples']
+    }
+
+class ClusterRequest(BaseModel):
+    cols: List[str]
+    k_min: int = 2
+    k_max: int = 8
+    algorithm: str = "auto"
+    seed: int = 0
+    max_points: int = 2000
+
+@app.post("/api/multivariate/cluster")
+@memory_only
+@coalesce(analysis_flights)
+@stored
+@sample_size(lambda req: req.cols)
+def get_clusters(req: ClusterRequest):
+    missing = [c for c in req.cols if c not in df.columns]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Column not found: {', '.join(missing)}")
+
+    try:
+        result = cluster_sweep(df, req.cols, k_min=req.k_min, k_max=req.k_max,
+                               algorithm=req.algorithm, seed=req.seed)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    picked = sample_rows(len(result['labels']), req.max_points, req.seed)
+
+    return {
+        "feature_names": req.cols,
+        "algorithm": result['algorithm'],
+        "n_samples": result['n_samples'],
+        "sweep": result['sweep'],
+        "best_k": result['best_k'],
+        "centroids": result['centroids'].tolist(),
+        "sizes": result['sizes'].tolist(),
+        "assignments": {
+            "row": result['rows'][picked].tolist(),
+            "cluster": result['labels'][picked].tolist()
+        }
+    }
 
 class BoxPlotRequest(BaseModel):
     x_col: str
     y_col: str
 
 @app.post("/api/bivariate/boxplot")
+@memory_only
+@coalesce(analysis_flights)
+@stored
+@sample_size(lambda req: [req.x_col, req.y_col])
 def get_boxplot_stats(req: BoxPlotRequest):
     if req.x_col not in df.columns or req.y_col not in df.columns:
         raise HTTPException(status_code=404, detail="Column not found")
         
-    data = df[[req.x_col, req.y_col]].dropna()
+    with phase("load"):
+        data = df[[req.x_col, req.y_col]].dropna()
     
     results = []
     groups = data.groupby(req.x_col)[req.y_col]
@@ -228,46 +952,572 @@ def get_boxplot_stats(req: BoxPlotRequest):
             "count": int(count)
         })
         
-    return results
+    return {"groups": results}
 
-@app.get("/api/metrics/monte_carlo")
-def run_monte_carlo(n_sim: int = 1000):
-    data_col = df['Addicted_Score'].dropna().values
-    sample_means = []
-    
-    for _ in range(n_sim):
-        resample = np.random.choice(data_col, size=len(data_col), replace=True)
-        sample_means.append(np.mean(resample))
-        
+def _bootstrap_summary(sample_means):
     lower_ci = np.percentile(sample_means, 2.5)
     upper_ci = np.percentile(sample_means, 97.5)
     
     hist, bins = np.histogram(sample_means, bins=30)
     
     return {
-        "ci_95": [lower_ci, upper_ci],
+        "ci_95": [float(lower_ci), float(upper_ci)],
+        "n_sim": int(len(sample_means)),
         "dist": {
             "x": ((bins[:-1] + bins[1:]) / 2).tolist(),
             "y": hist.tolist()
         }
     }
+
+@app.get("/api/metrics/monte_carlo")
+@coalesce(analysis_flights)
+@sample_size(lambda **_: ['Addicted_Score'])
+def run_monte_carlo(n_sim: int = 1000):
+    if chunked is not None:
+        # Resampling n rows is a multinomial draw over the distinct values
+        counts = chunked.value_counts('Addicted_Score')
+        return _bootstrap_summary(np.concatenate(list(bootstrap_means_from_counts(counts, n_sim))))
+    with phase("load"):
+        data_col = df['Addicted_Score'].dropna().values
+    sample_means = np.concatenate(list(bootstrap_means(data_col, n_sim)))
+    return _bootstrap_summary(sample_means)
+
 class TTestRequest(BaseModel):
     group_col: str
     value_col: str
 
 @app.post("/api/inference/ttest")
+@coalesce(analysis_flights)
+@stored
+@sample_size(lambda req: [req.group_col, req.value_col])
 def run_ttest(req: TTestRequest):
-    result = perform_ttest(df, req.group_col, req.value_col)
+    columns = chunked.columns if chunked is not None else df.columns
+    if req.group_col not in columns or req.value_col not in columns:
+        raise HTTPException(status_code=404, detail="Column not found")
+    numeric = chunked.numeric_columns if chunked is not None else df.select_dtypes(include=[np.number]).columns
+    if req.value_col not in numeric:
+        raise HTTPException(status_code=400, detail=f"'{req.value_col}' is not numeric")
+    if chunked is not None:
+        result = _chunked_ttest(req)
+    else:
+        result = perform_ttest(df, req.group_col, req.value_col)
     if result is None:
         raise HTTPException(status_code=400, detail="Group column must have exactly 2 unique values")
     return result
 
+def _chunked_ttest(req: TTestRequest):
+    groups = chunked.group_moments(req.group_col, req.value_col)
+    if len(groups) != 2:
+        return None
+    (name1, m1), (name2, m2) = [(name, describe_moments(m, 0)) for name, m in groups.items()]
+    t_stat, p_val = stats.ttest_ind_from_stats(m1["mean"], m1["std"], m1["count"],
+                                               m2["mean"], m2["std"], m2["count"])
+    return {
+        "groups": [str(name1), str(name2)],
+        "means": [m1["mean"], m2["mean"]],
+        "t_statistic": float(t_stat),
+        "p_value": float(p_val)
+    }
+
+class HypothesisTestRequest(BaseModel):
+    test: str = "welch"
+    group_col: str
+    value_col: str
+    posthoc: bool = True
+
+@app.post("/api/inference/test")
+@coalesce(analysis_flights)
+@stored
+@sample_size(lambda req: [req.group_col, req.value_col])
+def run_hypothesis_test(req: HypothesisTestRequest):
+    if chunked is not None:
+        # Contingency tables merge across chunks; median- and rank-based outputs do not
+        if req.test != "chi_square":
+            raise _not_in_chunked_mode()
+        if req.group_col not in chunked.columns or req.value_col not in chunked.columns:
+            raise HTTPException(status_code=404, detail="Column not found")
+        try:
+            return chi_square_from_table(chunked.crosstab(req.group_col, req.value_col))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    if req.group_col not in df.columns or req.value_col not in df.columns:
+        raise HTTPException(status_code=404, detail="Column not found")
+
+    try:
+        if req.test in TWO_GROUP_TESTS:
+            result = two_group_test(df, req.group_col, req.value_col, method=req.test)
+            if result is None:
+                raise HTTPException(status_code=400, detail=f"'{req.test}' requires exactly 2 groups; use 'anova' or 'kruskal'")
+            return result
+        if req.test in K_GROUP_TESTS:
+            return k_group_test(df, req.group_col, req.value_col, method=req.test, posthoc=req.posthoc)
+        if req.test == "chi_square":
+            return chi_square_test(df, req.group_col, req.value_col)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    raise HTTPException(status_code=400, detail=f"Unsupported test '{req.test}'")
+
+class AllPairsRequest(BaseModel):
+    cat_cols: Optional[List[str]] = None
+    num_cols: Optional[List[str]] = None
+    method: str = "auto"
+    correction: str = "holm"
+    alpha: float = 0.05
+
+@app.post("/api/inference/all_pairs")
+@memory_only
+@coalesce(analysis_flights)
+@stored
+def run_all_pairs(req: AllPairsRequest):
+    cat_cols = req.cat_cols or [c for c in df.select_dtypes(exclude=[np.number]).columns]
+    num_cols = req.num_cols or [c for c in df.select_dtypes(include=[np.number]).columns if c != 'Student_ID']
+    missing = [c for c in cat_cols + num_cols if c not in df.columns]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Column not found: {', '.join(missing)}")
+
+    try:
+        results = sweep_group_tests(df, cat_cols, num_cols, method=req.method,
+                                    correction=req.correction, alpha=req.alpha)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {
+        "correction": req.correction,
+        "alpha": req.alpha,
+        "n_tests": len(results),
+        "n_significant": sum(r["significant"] for r in results),
+        "results": results
+    }
+
+class PermutationRequest(BaseModel):
+    group_col: str
+    value_col: str
+    statistic: str = "mean_diff"
+    n_resamples: int = 10000
+    alternative: str = "two-sided"
+    alpha: float = 0.05
+    confidence: float = 0.99
+    seed: int = 0
+
+@app.post("/api/inference/permutation")
+@memory_only
+@coalesce(analysis_flights)
+@stored
+@sample_size(lambda req: [req.group_col, req.value_col])
+def run_permutation_test(req: PermutationRequest):
+    if req.group_col not in df.columns or req.value_col not in df.columns:
+        raise HTTPException(status_code=404, detail="Column not found")
+
+    with phase("load"):
+        data = df[[req.group_col, req.value_col]].dropna()
+    try:
+        return permutation_test(data[req.value_col].to_numpy(), data[req.group_col].to_numpy(),
+                                statistic=req.statistic, n_resamples=req.n_resamples,
+                                alternative=req.alternative, alpha=req.alpha,
+                                confidence=req.confidence, seed=req.seed)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+class CounterfactualRequest(BaseModel):
+    target: str = "Addicted_Score"
+    predictors: List[str] = ["Avg_Daily_Usage_Hours"]
+    intervention: str = "Avg_Daily_Usage_Hours"
+    # Additive changes to the intervened predictor, evaluated as one grid
+    shift_min: float = -5.0
+    shift_max: float = 0.0
+    steps: int = 51
+    # Intervened values are clipped to these bounds (e.g. usage can't go below 0 hours)
+    lower: Optional[float] = 0.0
+    upper: Optional[float] = None
+    n_boot: int = 1000
+    confidence: float = 0.95
+    seed: int = 0
+
+@app.post("/api/inference/counterfactual")
+@memory_only
+@coalesce(analysis_flights)
+@stored
+@sample_size(lambda req: [req.target] + req.predictors)
+def run_counterfactual(req: CounterfactualRequest):
+    """
+    Projected target mean for a whole grid of interventions on one predictor of an OLS
+    model, with bootstrap bands; the client looks values up instead of refitting.
+    """
+    missing = [c for c in [req.target, *req.predictors] if c not in df.columns]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Column not found: {', '.join(missing)}")
+    if not 2 <= req.steps <= 10_000 or not 10 <= req.n_boot <= 100_000:
+        raise HTTPException(status_code=400, detail="steps must be in [2, 10000] and n_boot in [10, 100000]")
+
+    try:
+        with phase("load"):
+            model = fit_counterfactual_model(df, req.target, req.predictors, n_boot=req.n_boot, seed=req.seed)
+        curve = counterfactual_curve(model, req.intervention, np.linspace(req.shift_min, req.shift_max, req.steps),
+                                     lower=req.lower, upper=req.upper, confidence=req.confidence)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    tail = (1 - req.confidence) / 2 * 100
+    ci = np.percentile(model["draws"], [tail, 100 - tail], axis=0)
+    return {
+        "target": req.target,
+        "predictors": req.predictors,
+        "intervention": req.intervention,
+        "n": model["n"],
+        "n_boot": req.n_boot,
+        "baseline_mean": model["baseline_mean"],
+        "coefficients": dict(zip(model["names"], model["coefficients"].tolist())),
+        "coefficient_ci": {name: [float(lo), float(hi)] for name, lo, hi in zip(model["names"], ci[0], ci[1])},
+        "curve": {k: v.tolist() for k, v in curve.items()}
+    }
+
+# Columns Gini is reported for when none are requested
+GINI_COLUMNS = ['Avg_Daily_Usage_Hours', 'Addicted_Score', 'Mental_Health_Score']
+
+def _gini_columns(cols=None):
+    """The requested columns, or the default ones the dataset has."""
+    available = chunked.columns if chunked is not None else df.columns
+    return cols or [c for c in GINI_COLUMNS if c in available]
+
 @app.get("/api/metrics/inequality")
-def get_inequality_metrics():
-    # Calculate Gini for relevant continuous variables
-    metrics = {}
-    for col in ['Avg_Daily_Usage_Hours', 'Addicted_Score', 'Mental_Health_Score']:
-        if col in df.columns:
+@coalesce(analysis_flights)
+@stored
+@sample_size(_gini_columns)
+def get_inequality_metrics(cols: Optional[List[str]] = Query(None)):
+    """Gini of the requested columns (relevant continuous ones by default) and the rows each used."""
+    if cols:
+        available = chunked.columns if chunked is not None else df.columns
+        missing = [c for c in cols if c not in available]
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Column not found: {', '.join(missing)}")
+        numeric = chunked.numeric_columns if chunked is not None else df.select_dtypes(include=[np.number]).columns
+        if any(c not in numeric for c in cols):
+            raise HTTPException(status_code=400, detail="Gini needs numeric columns")
+    metrics, n = {}, {}
+    for col in _gini_columns(cols):
+        if chunked is not None:
+            counts = chunked.value_counts(col)
+            metrics[col], n[col] = gini_from_counts(counts), int(counts.sum())
+        else:
             data = df[col].dropna().values
-            metrics[col] = calculate_gini(data)
-    return metrics
+            metrics[col], n[col] = calculate_gini(data), len(data)
+    # Each column's Gini uses its own non-missing rows (n); effective_n is the rows complete in all of them
+    return {"gini": metrics, "n": n}
+
+class IndexRequest(BaseModel):
+    cols: List[str] = ['Avg_Daily_Usage_Hours', 'Addicted_Score', 'Conflicts_Over_Social_Media']
+    weighting: str = "equal"
+    weights: Optional[List[float]] = None
+    normalization: str = "zscore"
+    # New rows ({column: value}) scored against the population; append=True also adds them
+    # to the population this response's percentile ranks and distribution use (the cached
+    # index shared by other requests is not changed)
+    rows: List[Dict[str, float]] = []
+    append: bool = False
+    bins: int = 30
+
+@app.post("/api/metrics/index")
+@memory_only
+@sample_size(lambda req: req.cols)
+def build_composite_index(req: IndexRequest):
+    """
+    Composite index (weighted sum of z-scored or min-max scaled columns) built once per
+    dataset and definition; supplied rows are scored with the cached normalization.
+    """
+    missing = [c for c in req.cols if c not in df.columns]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Column not found: {', '.join(missing)}")
+    if not req.cols:
+        raise HTTPException(status_code=400, detail="At least one column is required")
+    if req.bins < 1:
+        raise HTTPException(status_code=400, detail="bins must be at least 1")
+
+    try:
+        with phase("load"):
+            index = build_index(df, req.cols, req.weighting, req.weights, req.normalization)
+        new_rows = np.array([[row[c] for c in req.cols] for row in req.rows], dtype=float).reshape(-1, len(req.cols))
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=f"Row is missing column {e}")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if np.isnan(new_rows).any():
+        raise HTTPException(status_code=400, detail="Rows must not contain missing values")
+
+    scores = index.score(new_rows)
+    if req.append and len(new_rows):
+        index = index.with_rows(new_rows)
+    hist, edges = np.histogram(index.rescale(index.sorted_scores), bins=req.bins)
+    return {
+        "cols": index.cols,
+        "weighting": index.weighting,
+        "normalization": index.normalization,
+        "weights": dict(zip(index.cols, index.weights.tolist())),
+        "parameters": {c: {k: float(v[j]) for k, v in index.params.items()} for j, c in enumerate(index.cols)},
+        "index_range": [index.index_min, index.index_max],
+        "n_fitted": index.n_fitted,
+        "n": index.n,
+        "distribution": {
+            "x": ((edges[:-1] + edges[1:]) / 2).tolist(),
+            "y": hist.tolist()
+        },
+        "scores": [{k: float(v[i]) for k, v in scores.items()} for i in range(len(new_rows))]
+    }
+
+# --- Background Jobs ---
+
+class MonteCarloRequest(BaseModel):
+    col: str = "Addicted_Score"
+    n_sim: int = 10000
+    seed: Optional[int] = None
+
+def _monte_carlo_job(job, req: MonteCarloRequest):
+    if req.col not in df.columns:
+        raise ValueError(f"Column not found: {req.col}")
+    data_col = df[req.col].dropna().values
+    blocks = []
+    done = 0
+    for block in bootstrap_means(data_col, req.n_sim, seed=req.seed):
+        blocks.append(block)
+        done += len(block)
+        running = np.concatenate(blocks)
+        job.report(done / req.n_sim, {
+            "n_done": done,
+            "ci_95": [float(np.percentile(running, 2.5)), float(np.percentile(running, 97.5))]
+        })
+    return _bootstrap_summary(np.concatenate(blocks))
+
+@sample_size(lambda job, req: [req.target] + req.predictors)
+def _regression_job(job, req: RegressionRequest):
+    # Cancellation and the time budget are checked before the fit (between chunks in chunked
+    # mode) and before the summary is rendered, not during a single in-memory fit
+    job.report(0.0)
+    return _regression_payload(req, progress=job.report)
+
+def _cv_job(job, req: CrossValidationRequest):
+    return _cross_validation_payload(req, progress=job.report)
+
+@sample_size(lambda job, req: [req.group_col, req.value_col])
+def _permutation_job(job, req: PermutationRequest):
+    data = df[[req.group_col, req.value_col]].dropna()
+    return permutation_test(data[req.value_col].to_numpy(), data[req.group_col].to_numpy(),
+                            statistic=req.statistic, n_resamples=req.n_resamples,
+                            alternative=req.alternative, alpha=req.alpha,
+                            confidence=req.confidence, seed=req.seed, progress=job.report)
+
+# Parameter model, handler and the result store key of completed jobs: that of the matching
+# synchronous route, so either one serves the other's result
+JOB_KINDS = {
+    "monte_carlo": (MonteCarloRequest, _monte_carlo_job, _seeded_key(_monte_carlo_job)),
+    "regression": (RegressionRequest, _regression_job, _stored_key(run_regression)),
+    "cv": (CrossValidationRequest, _cv_job, _stored_key(run_cross_validation)),
+    "permutation": (PermutationRequest, _permutation_job, _stored_key(run_permutation_test)),
+}
+# Job kinds whose computation also runs on a chunked dataset
+CHUNKED_JOB_KINDS = ("regression",)
+for _kind, (_, _handler, _key) in JOB_KINDS.items():
+    jobs.register(_kind, _handler, result_key=_key)
+
+class JobSubmitRequest(BaseModel):
+    params: Dict[str, Any] = {}
+    time_budget: Optional[float] = None
+
+@app.post("/api/jobs/{kind}")
+def submit_job(kind: str, req: JobSubmitRequest):
+    if kind not in JOB_KINDS:
+        raise HTTPException(status_code=404, detail=f"Unknown job kind. Available: {', '.join(JOB_KINDS)}")
+    if chunked is not None and kind not in CHUNKED_JOB_KINDS:
+        raise _not_in_chunked_mode()
+    try:
+        params = JOB_KINDS[kind][0](**req.params)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=jsonable_encoder(e.errors()))
+
+    job = jobs.submit(kind, params, time_budget=req.time_budget)
+    return {"id": job.id, "status": job.status, "events": f"/api/jobs/{job.id}/events"}
+
+@app.get("/api/jobs")
+def list_jobs():
+    return [job.to_dict(include_result=False) for job in jobs.active_jobs()]
+
+@app.get("/api/jobs/{job_id}")
+def get_job(job_id: str):
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+@app.delete("/api/jobs/{job_id}")
+def cancel_job(job_id: str):
+    job = jobs.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict(include_result=False)
+
+@app.get("/api/jobs/{job_id}/events")
+async def stream_job_events(job_id: str, poll_interval: float = 0.2):
+    """Server-Sent Events stream of job progress; the final 'done' event carries the result."""
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def events():
+        last_version = -1
+        last_sent = time.time()
+        while True:
+            if job.version != last_version:
+                last_version = job.version
+                finished = job.done
+                payload = json.dumps(jsonable_encoder(job.to_dict(include_result=finished)))
+                yield f"event: {'done' if finished else 'progress'}\ndata: {payload}\n\n"
+                last_sent = time.time()
+                if finished:
+                    return
+            elif time.time() - last_sent > 15:
+                # Comment line keeps proxies from closing an idle stream
+                yield ": keep-alive\n\n"
+                last_sent = time.time()
+            await asyncio.sleep(poll_interval)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+# --- Bulk Export ---
+
+class ExportRequest(BaseModel):
+    format: str = "csv"
+    columns: Optional[List[str]] = None
+    # Segment filter: one of the listed values per column, and [lo, hi] ranges (null = open)
+    where: Dict[str, List[Any]] = {}
+    ranges: Dict[str, List[Optional[float]]] = {}
+    batch_rows: int = BATCH_ROWS
+
+def _check_export(fmt, batch_rows):
+    try:
+        check_format(fmt)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except LookupError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    if not 1 <= batch_rows <= 10_000_000:
+        raise HTTPException(status_code=400, detail="batch_rows must be between 1 and 10,000,000")
+
+def _export_response(frames, fmt, name):
+    media_type, extension = EXPORT_FORMATS[fmt]
+    try:
+        # Encodes the first batch now, so errors are reported before the response starts
+        body = stream_frames(frames, fmt)
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return StreamingResponse(body, media_type=media_type,
+                             headers={"Content-Disposition": f'attachment; filename="{name}.{extension}"'})
+
+@app.post("/api/export/dataset")
+def export_rows(req: ExportRequest):
+    """
+    The dataset, or a filtered segment of it, streamed as CSV, Arrow IPC or Parquet in batches
+    of batch_rows; only the requested columns are read.
+    """
+    _check_export(req.format, req.batch_rows)
+    available = chunked.columns if chunked is not None else df.columns
+    # Repeated columns are exported once
+    columns = list(dict.fromkeys(req.columns or available))
+    missing = [c for c in [*columns, *req.where, *req.ranges] if c not in available]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Column not found: {', '.join(missing)}")
+    numeric = chunked.numeric_columns if chunked is not None else df.select_dtypes(include=[np.number]).columns
+    if any(len(bounds) != 2 for bounds in req.ranges.values()) or any(c not in numeric for c in req.ranges):
+        raise HTTPException(status_code=400, detail="ranges must map numeric columns to [lo, hi]")
+
+    if chunked is not None:
+        read = list(dict.fromkeys([*columns, *req.where, *req.ranges]))
+        def frames():
+            for chunk in chunked.chunks(read):
+                mask = segment_mask(chunk, req.where, req.ranges)
+                yield from frame_batches(chunk, columns, mask, req.batch_rows)
+        return _export_response(frames(), req.format, "dataset")
+
+    mask = segment_mask(df, req.where, req.ranges)
+    return _export_response(frame_batches(df, columns, mask, req.batch_rows), req.format, "dataset")
+
+def _bootstrap_frames(req: MonteCarloRequest, batch_rows):
+    if req.col not in df.columns:
+        raise HTTPException(status_code=404, detail="Column not found")
+    if req.n_sim < 1:
+        raise HTTPException(status_code=400, detail="n_sim must be at least 1")
+    data_col = df[req.col].dropna().to_numpy(dtype=float)
+    if len(data_col) == 0:
+        raise HTTPException(status_code=400, detail="Column has no values")
+
+    def frames():
+        done = 0
+        for block in bootstrap_means(data_col, req.n_sim, seed=req.seed, block_size=batch_rows):
+            yield pd.DataFrame({"draw": np.arange(done, done + len(block)), "mean": block})
+            done += len(block)
+    return frames()
+
+def _pca_score_frames(req: PcaRequest, batch_rows):
+    missing = [c for c in req.cols if c not in df.columns]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Column not found: {', '.join(missing)}")
+    if len(req.cols) < 2:
+        raise HTTPException(status_code=400, detail="PCA needs at least 2 columns")
+    try:
+        fit = fit_pca(df, req.cols, n_components=req.n_components, method=req.method)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    rows = fit['rows']
+    names = [f"PC{i + 1}" for i in range(fit['pca'].n_components_)]
+
+    def frames():
+        # Every retained row (row = position in the dataset), standardized and projected one batch at a time
+        for lo in range(0, len(rows), batch_rows):
+            scores = project_rows(df, req.cols, fit, rows[lo:lo + batch_rows])
+            yield pd.DataFrame({"row": rows[lo:lo + batch_rows], **dict(zip(names, scores.T))})
+    return frames()
+
+def _index_frames(req: IndexRequest, batch_rows):
+    missing = [c for c in req.cols if c not in df.columns]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Column not found: {', '.join(missing)}")
+    if not req.cols:
+        raise HTTPException(status_code=400, detail="At least one column is required")
+    try:
+        index = build_index(df, req.cols, req.weighting, req.weights, req.normalization)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    def frames():
+        # Complete rows of every batch scored with the cached normalization
+        selected = df[req.cols]
+        for lo in range(0, len(selected), batch_rows):
+            part = selected.iloc[lo:lo + batch_rows]
+            complete = part.notna().all(axis=1).to_numpy()
+            scores = index.score(part.to_numpy(dtype=float)[complete])
+            yield pd.DataFrame({"row": lo + np.flatnonzero(complete), **scores})
+    return frames()
+
+# Computed artifacts that can be exported: parameter model and frame generator
+EXPORT_ARTIFACTS = {
+    "bootstrap": (MonteCarloRequest, _bootstrap_frames),
+    "pca_scores": (PcaRequest, _pca_score_frames),
+    "index": (IndexRequest, _index_frames),
+}
+
+class ArtifactExportRequest(BaseModel):
+    format: str = "csv"
+    params: Dict[str, Any] = {}
+    batch_rows: int = BATCH_ROWS
+
+@app.post("/api/export/artifacts/{kind}")
+@memory_only
+def export_artifact(kind: str, req: ArtifactExportRequest):
+    """Computed artifacts (bootstrap draws, PCA scores of every row, index values) streamed like /api/export/dataset."""
+    if kind not in EXPORT_ARTIFACTS:
+        raise HTTPException(status_code=404, detail=f"Unknown artifact. Available: {', '.join(EXPORT_ARTIFACTS)}")
+    _check_export(req.format, req.batch_rows)
+    model, make_frames = EXPORT_ARTIFACTS[kind]
+    try:
+        params = model(**req.params)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=jsonable_encoder(e.errors()))
+    return _export_response(make_frames(params, req.batch_rows), req.format, kind)
@@ -0,0 +1,47 @@
+import argparse
+import os
+import tempfile
+
+import uvicorn
+
+from backend.utils.data_loader import load_data, default_dataset_path
+from backend.utils.shared_data import export_dataset, export_is_current
+
+def default_shared_dir():
+    # /dev/shm is RAM-backed on Linux; elsewhere the page cache does the sharing
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(base, "social-media-addiction-dataset")
+
+def prepare_shared_dataset(directory=None, path=None):
+    """
+    Parses the dataset once and exports its typed columns for memory-mapping.
+    An existing export of the same source file (path, size and mtime) is reused, so
+    restarts skip the parse entirely. Returns the export directory.
+    """
+    directory = directory or default_shared_dir()
+    path = os.path.abspath(path or os.environ.get("DATASET_PATH") or default_dataset_path())
+    stat = os.stat(path)
+    source = {"path": path, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if not export_is_current(directory, source):
+        df = load_data(path)
+        if df.empty:
+            raise SystemExit(f"Could not load {path}")
+        export_dataset(df, directory, source)
+    return directory
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run the API with several workers sharing one memory-mapped copy of the dataset.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--shared-dir", help="Where the column files live (default: under /dev/shm)")
+    args = parser.parse_args(argv)
+
+    directory = prepare_shared_dataset(args.shared_dir)
+    # Workers are fresh processes that inherit the environment; main.py attaches to the export
+    os.environ["DATASET_SHARED_DIR"] = directory
+    uvicorn.run("backend.main:app", host=args.host, port=args.port, workers=args.workers)
+
+if __name__ == "__main__":
+    main()
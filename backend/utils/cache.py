@@ -0,0 +1,108 @@
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+class LRUCache:
+    """
+    Thread-safe, size-bounded LRU cache with hit/miss counters.
+    Every instance registers itself by name so cache stats can be reported in one place.
+    """
+    registry = {}
+
+    def __init__(self, name, maxsize=64):
+        self.name = name
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        LRUCache.registry[name] = self
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_compute(self, key, compute):
+        """Returns the cached value for key, calling compute() and storing its result on a miss."""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+
+        # Computed outside the lock so slow misses don't block unrelated lookups
+        value = compute()
+        self.set(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        return {"size": len(self._data), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+def cache_stats():
+    """Stats for every registered cache, keyed by cache name."""
+    return {name: cache.stats() for name, cache in LRUCache.registry.items()}
+
+_versions = {}
+_versions_lock = threading.Lock()
+
+def _layout(df):
+    columns = tuple(df.columns) if isinstance(df, pd.DataFrame) else (df.name,)
+    return (columns, df.shape)
+
+def dataset_version(df):
+    """
+    Content hash identifying a DataFrame (or Series), used as the dataset part of cache keys.
+    Memoized per object (and per column layout, so frames that gain columns are rehashed).
+    """
+    layout = _layout(df)
+    with _versions_lock:
+        entry = _versions.get(id(df))
+        if entry is not None and entry[0]() is df and entry[1] == layout:
+            return entry[2]
+
+    row_hashes = pd.util.hash_pandas_object(df, index=True).to_numpy()
+    digest = hashlib.sha1(row_hashes.tobytes())
+    digest.update(repr(layout).encode())
+    dtypes = df.dtypes.astype(str).tolist() if isinstance(df, pd.DataFrame) else [str(df.dtype)]
+    digest.update(repr(dtypes).encode())
+    token = digest.hexdigest()[:16]
+
+    with _versions_lock:
+        # Drop entries whose frames have been garbage collected
+        for key in [k for k, v in _versions.items() if v[0]() is None]:
+            del _versions[key]
+        _versions[id(df)] = (weakref.ref(df), layout, token)
+    return token
+
+def set_dataset_version(df, token):
+    """Records a precomputed content hash for df (e.g. one stored alongside a shared export)."""
+    layout = _layout(df)
+    with _versions_lock:
+        _versions[id(df)] = (weakref.ref(df), layout, token)
+
+def readonly(array):
+    """Marks a numpy array read-only so cached arrays can be shared safely."""
+    array = np.asarray(array)
+    array.setflags(write=False)
+    return array
@@ -0,0 +1,398 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from backend.utils.cache import LRUCache
+from backend.utils.contingency import ContingencyCube, cube_dimensions, DEFAULT_BINS
+from backend.utils.correlation import pairwise_sums, pearson_from_sums
+from backend.utils.data_loader import coerce_numeric
+from backend.utils.frequency import ColumnFrequencies
+from backend.utils.lazy import available, lazy_import
+from backend.utils.profiling import profile_from_counts
+
+stats = lazy_import("scipy.stats")
+# Optional; only needed for Parquet snapshots
+pq = lazy_import("pyarrow.parquet")
+
+DEFAULT_CHUNK_SIZE = 250_000
+RESERVOIR_SIZE = 100_000
+
+_chunked_cache = LRUCache("chunked", maxsize=128)
+
+def _merge_moments(a, b):
+    """
+    Combines per-column (count, mean, M2, M3, M4, min, max) partials of two row blocks
+    using the pairwise update formulas of Chan et al. / Pebay, so the merge is exact.
+    """
+    if a is None:
+        return b
+    na, nb = a['n'], b['n']
+    n = na + nb
+    with np.errstate(divide='ignore', invalid='ignore'):
+        delta = np.where(n > 0, b['mean'] - a['mean'], 0.0)
+        safe_n = np.maximum(n, 1)
+        mean = np.where(n > 0, a['mean'] + delta * nb / safe_n, 0.0)
+        m2 = a['m2'] + b['m2'] + delta ** 2 * na * nb / safe_n
+        m3 = (a['m3'] + b['m3'] + delta ** 3 * na * nb * (na - nb) / safe_n ** 2
+              + 3 * delta * (na * b['m2'] - nb * a['m2']) / safe_n)
+        m4 = (a['m4'] + b['m4'] + delta ** 4 * na * nb * (na ** 2 - na * nb + nb ** 2) / safe_n ** 3
+              + 6 * delta ** 2 * (na ** 2 * b['m2'] + nb ** 2 * a['m2']) / safe_n ** 2
+              + 4 * delta * (na * b['m3'] - nb * a['m3']) / safe_n)
+    return {'n': n, 'mean': mean, 'm2': m2, 'm3': m3, 'm4': m4,
+            'min': np.fmin(a['min'], b['min']), 'max': np.fmax(a['max'], b['max'])}
+
+def _block_moments(X):
+    """Central moment partials of one (rows x columns) block, NaNs skipped."""
+    present = ~np.isnan(X)
+    n = present.sum(axis=0).astype(float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = np.where(n > 0, np.nansum(X, axis=0) / np.maximum(n, 1), 0.0)
+    d = np.where(present, X - mean, 0.0)
+    d2 = d * d
+    with np.errstate(all='ignore'):
+        lo = np.where(n > 0, np.nanmin(np.where(present, X, np.inf), axis=0), np.nan)
+        hi = np.where(n > 0, np.nanmax(np.where(present, X, -np.inf), axis=0), np.nan)
+    return {'n': n, 'mean': mean, 'm2': d2.sum(axis=0), 'm3': (d2 * d).sum(axis=0),
+            'm4': (d2 * d2).sum(axis=0), 'min': lo, 'max': hi}
+
+def describe_moments(m, i):
+    """Count, mean, std (ddof=1), skewness and excess kurtosis (pandas' bias-corrected forms) of column i."""
+    n, m2, m3, m4 = m['n'][i], m['m2'][i], m['m3'][i], m['m4'][i]
+    out = {'count': int(n), 'mean': float(m['mean'][i]) if n else np.nan,
+           'min': float(m['min'][i]), 'max': float(m['max'][i]),
+           'std': float(np.sqrt(m2 / (n - 1))) if n > 1 else np.nan,
+           'skewness': np.nan, 'kurtosis': np.nan}
+    if n > 2 and m2 > 0:
+        g1 = np.sqrt(n) * m3 / m2 ** 1.5
+        out['skewness'] = float(g1 * np.sqrt(n * (n - 1)) / (n - 2))
+    if n > 3 and m2 > 0:
+        g2 = n * m4 / m2 ** 2 - 3
+        out['kurtosis'] = float(((n + 1) * g2 + 6) * (n - 1) / ((n - 2) * (n - 3)))
+    return out
+
+class ChunkedDataset:
+    """
+    A CSV or Parquet snapshot processed in row chunks instead of being loaded whole.
+    Every aggregate is computed by merging per-chunk partials, so memory stays bounded by
+    chunk_size; only the requested columns are read. Results are cached per file version.
+    """
+    def __init__(self, path, chunk_size=DEFAULT_CHUNK_SIZE):
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        self.path = path
+        self.chunk_size = chunk_size
+        self.parquet = path.endswith(('.parquet', '.pq'))
+        if self.parquet and not available("pyarrow"):
+            raise ValueError("Parquet snapshots require pyarrow")
+        schema = self.head(1000)
+        self.columns = schema.columns.tolist()
+        self.numeric_columns = schema.select_dtypes(include=[np.number]).columns.tolist()
+
+    @property
+    def version(self):
+        stat = os.stat(self.path)
+        return (os.path.abspath(self.path), stat.st_size, stat.st_mtime_ns)
+
+    def _cached(self, op, args, compute):
+        return _chunked_cache.get_or_compute((self.version, op, args), compute)
+
+    def chunks(self, columns=None):
+        """Yields DataFrames of at most chunk_size rows holding only `columns` (all by default)."""
+        if self.parquet:
+            batches = pq.ParquetFile(self.path).iter_batches(batch_size=self.chunk_size, columns=columns)
+            for batch in batches:
+                yield coerce_numeric(batch.to_pandas())
+        else:
+            with pd.read_csv(self.path, usecols=columns, chunksize=self.chunk_size) as reader:
+                for chunk in reader:
+                    yield coerce_numeric(chunk)
+
+    def head(self, n=100):
+        if self.parquet:
+            batch = next(pq.ParquetFile(self.path).iter_batches(batch_size=n), None)
+            return coerce_numeric(batch.to_pandas()) if batch is not None else pd.DataFrame()
+        return coerce_numeric(pd.read_csv(self.path, nrows=n))
+
+    @property
+    def n_rows(self):
+        return self._cached('n_rows', (), lambda: sum(len(c) for c in self.chunks(self.columns[:1])))
+
+    def complete_rows(self, cols):
+        """Rows with no missing value in any of cols."""
+        cols = list(cols)
+        def compute():
+            if not cols:
+                return self.n_rows
+            return int(sum(chunk[cols].notna().all(axis=1).sum() for chunk in self.chunks(cols)))
+        return self._cached('complete_rows', tuple(cols), compute)
+
+    def moments(self, cols):
+        """Per-column moment partials merged over all chunks (see describe_moments)."""
+        cols = tuple(cols)
+        def compute():
+            total = None
+            for chunk in self.chunks(list(cols)):
+                total = _merge_moments(total, _block_moments(chunk[list(cols)].to_numpy(dtype=float)))
+            return total
+        return self._cached('moments', cols, compute)
+
+    def describe(self, col):
+        return describe_moments(self.moments([col]), 0)
+
+    def histogram(self, col, bins=30):
+        """(counts, edges) over the column's full range; the range comes from a first (cached) pass."""
+        def compute():
+            m = self.moments([col])
+            lo, hi = m['min'][0], m['max'][0]
+            edges = np.histogram_bin_edges([lo, hi], bins=bins)
+            counts = np.zeros(bins, dtype=np.int64)
+            for chunk in self.chunks([col]):
+                values = chunk[col].dropna().to_numpy(dtype=float)
+                counts += np.histogram(values, bins=edges)[0]
+            return counts, edges
+        return self._cached('histogram', (col, bins), compute)
+
+    def frequencies(self, col):
+        """ColumnFrequencies of col merged over all chunks; numeric grids span the full range."""
+        def compute():
+            grid = None
+            if col in self.numeric_columns:
+                m = self.moments([col])
+                # An all-missing column has no range; its chunks carry no counts either
+                grid = None if np.isnan(m['min'][0]) else (m['min'][0], m['max'][0])
+            total = None
+            for chunk in self.chunks([col]):
+                part = ColumnFrequencies.build(chunk[col], grid)
+                total = part if total is None else total.merge(part)
+            return total
+        return self._cached('frequencies', (col,), compute)
+
+    def value_counts(self, col):
+        """Counts of every distinct non-missing value, sorted by value."""
+        def compute():
+            total = None
+            for chunk in self.chunks([col]):
+                counts = chunk[col].value_counts()
+                total = counts if total is None else total.add(counts, fill_value=0)
+            return total.sort_index().astype(np.int64)
+        return self._cached('value_counts', (col,), compute)
+
+    def crosstab(self, row_col, col_col):
+        """Contingency table of two columns (rows with either value missing are skipped)."""
+        def compute():
+            total = None
+            for chunk in self.chunks([row_col, col_col]):
+                table = pd.crosstab(chunk[row_col], chunk[col_col])
+                total = table if total is None else total.add(table, fill_value=0)
+            return total.fillna(0).sort_index().sort_index(axis=1).astype(np.int64)
+        return self._cached('crosstab', (row_col, col_col), compute)
+
+    def contingency_cube(self, bins=DEFAULT_BINS):
+        """Contingency cube over all columns; numeric bins span each column's full range (one extra pass)."""
+        def compute():
+            numeric = [c for c in self.numeric_columns if not c.endswith('_ID')]
+            m = self.moments(numeric)
+            ranges = {c: (m['min'][k], m['max'][k]) for k, c in enumerate(numeric)}
+            dims = cube_dimensions(self.head(1000), bins, ranges)
+            return ContingencyCube.from_chunks(self.chunks([d["name"] for d in dims]), dims)
+        return self._cached('contingency_cube', (bins,), compute)
+
+    def group_moments(self, group_col, value_col):
+        """Moment partials of value_col per level of group_col, in order of first appearance."""
+        def compute():
+            groups = {}
+            for chunk in self.chunks([group_col, value_col]):
+                data = chunk.dropna()
+                for name, values in data.groupby(group_col, sort=False)[value_col]:
+                    block = _block_moments(values.to_numpy(dtype=float)[:, None])
+                    groups[name] = _merge_moments(groups.get(name), block)
+            return groups
+        return self._cached('group_moments', (group_col, value_col), compute)
+
+    def comoments(self, cols):
+        """Pairwise-complete sums for Pearson correlations, accumulated around a fixed shift."""
+        cols = tuple(cols)
+        def compute():
+            # Shifting by the global means keeps the accumulated sums well conditioned
+            shift = self.moments(cols)['mean']
+            total = None
+            for chunk in self.chunks(list(cols)):
+                sums = pairwise_sums(chunk[list(cols)].to_numpy(dtype=float), shift)
+                total = sums if total is None else tuple(t + s for t, s in zip(total, sums))
+            return total
+        return self._cached('comoments', cols, compute)
+
+    def complete_comoments(self, cols):
+        """
+        Listwise counterpart of comoments: (n, means, centered scatter matrix) over the rows
+        complete in every one of cols, as PCA's standardization uses them.
+        """
+        cols = tuple(cols)
+        def compute():
+            shift = np.nan_to_num(self.moments(cols)['mean'])
+            n = 0
+            s = np.zeros(len(cols))
+            S = np.zeros((len(cols), len(cols)))
+            for chunk in self.chunks(list(cols)):
+                X = chunk[list(cols)].dropna().to_numpy(dtype=float) - shift
+                n += len(X)
+                s += X.sum(axis=0)
+                S += X.T @ X
+            if n == 0:
+                return 0, shift, S
+            return n, shift + s / n, S - np.outer(s, s) / n
+        return self._cached('complete_comoments', cols, compute)
+
+    def pearson(self, cols):
+        return pearson_from_sums(*self.comoments(cols))
+
+    def ols_sums(self, target, predictors, check=None):
+        """
+        OLS sufficient statistics over complete rows: (n, X'X, X'y, y'y) with an intercept column.
+        check(), if given, runs between chunks and may raise to abandon the pass.
+        """
+        def compute():
+            cols = [target] + list(predictors)
+            n = 0
+            xtx = np.zeros((len(cols), len(cols)))
+            xty = np.zeros(len(cols))
+            yty = 0.0
+            for chunk in self.chunks(cols):
+                if check is not None:
+                    check()
+                data = chunk[cols].dropna()
+                X = np.column_stack([np.ones(len(data)), data[list(predictors)].to_numpy(dtype=float)])
+                y = data[target].to_numpy(dtype=float)
+                n += len(data)
+                xtx += X.T @ X
+                xty += X.T @ y
+                yty += y @ y
+            return n, xtx, xty, yty
+        return self._cached('ols_sums', (target, tuple(predictors)), compute)
+
+    def profile(self):
+        """
+        The data-quality profile (see profiling.DatasetProfile) from a single pass that merges
+        each column's value counts, coerced counts and dtypes over the chunks.
+        """
+        def compute():
+            levels, dtypes, coerced = {}, {}, {}
+            complete = 0
+            for chunk in self.chunks():
+                complete += int(chunk.notna().all(axis=1).sum())
+                for col, count in chunk.attrs.get("coerced", {}).items():
+                    coerced[col] = coerced.get(col, 0) + count
+                for col in self.columns:
+                    counts = chunk[col].value_counts()
+                    levels[col] = counts if col not in levels else levels[col].add(counts, fill_value=0)
+                    dtypes.setdefault(col, set()).add(chunk[col].dtype)
+            columns = {}
+            for col in self.columns:
+                kinds = dtypes.get(col, set())
+                numeric = bool(kinds) and all(pd.api.types.is_numeric_dtype(d) and not pd.api.types.is_bool_dtype(d)
+                                              for d in kinds)
+                # Chunks disagree when only some hold missing values (int64 vs float64)
+                dtype = str(next(iter(kinds))) if len(kinds) == 1 else str(np.result_type(*kinds)) if numeric else "object"
+                counts = levels.get(col, pd.Series(dtype=np.int64)).astype(np.int64)
+                columns[col] = (dtype, counts, numeric, coerced.get(col, 0) if numeric else 0)
+            return profile_from_counts(self.n_rows, complete, columns)
+        return self._cached('profile', (), compute)
+
+    def reservoir_sample(self, col, size=RESERVOIR_SIZE, seed=0):
+        """Uniform sample of up to `size` non-missing values (Algorithm R, vectorized per chunk)."""
+        def compute():
+            rng = np.random.default_rng(seed)
+            sample = np.empty(0)
+            seen = 0
+            for chunk in self.chunks([col]):
+                values = chunk[col].dropna().to_numpy(dtype=float)
+                fill = min(size - len(sample), len(values))
+                sample = np.concatenate([sample, values[:fill]])
+                rest = values[fill:]
+                if len(rest):
+                    # Item number t (1-based) replaces a random slot with probability size / t
+                    t = seen + fill + np.arange(1, len(rest) + 1)
+                    slots = (rng.random(len(rest)) * t).astype(np.int64)
+                    keep = slots < size
+                    sample[slots[keep]] = rest[keep]
+                seen += len(values)
+            return sample
+        return self._cached('reservoir', (col, size, seed), compute)
+
+    def reservoir_rows(self, cols, size, seed=0):
+        """
+        Uniform sample of up to `size` rows complete in cols, as (sorted row positions, values),
+        drawn in one pass like reservoir_sample.
+        """
+        cols = list(cols)
+        def compute():
+            rng = np.random.default_rng(seed)
+            rows = np.empty(0, dtype=np.int64)
+            sample = np.empty((0, len(cols)))
+            seen = offset = 0
+            for chunk in self.chunks(cols):
+                mask = chunk[cols].notna().all(axis=1).to_numpy()
+                positions = offset + np.flatnonzero(mask)
+                values = chunk[cols].to_numpy(dtype=float)[mask]
+                offset += len(chunk)
+                fill = min(size - len(rows), len(values))
+                rows = np.concatenate([rows, positions[:fill]])
+                sample = np.concatenate([sample, values[:fill]])
+                if len(values) > fill:
+                    t = seen + fill + np.arange(1, len(values) - fill + 1)
+                    slots = (rng.random(len(t)) * t).astype(np.int64)
+                    keep = slots < size
+                    # Later rows win when several land on one slot, as in the sequential algorithm
+                    rows[slots[keep]] = positions[fill:][keep]
+                    sample[slots[keep]] = values[fill:][keep]
+                seen += len(values)
+            order = np.argsort(rows)
+            return rows[order], sample[order]
+        return self._cached('reservoir_rows', (tuple(cols), size, seed), compute)
+
+def ols_from_sums(n, xtx, xty, yty, names):
+    """OLS estimates and the statsmodels-style diagnostics from sufficient statistics."""
+    k = xtx.shape[0]
+    beta = np.linalg.solve(xtx, xty)
+    rss = float(yty - beta @ xty)
+    tss = float(yty - xty[0] ** 2 / n)
+    dof = n - k
+    sigma2 = rss / dof
+    bse = np.sqrt(np.diag(np.linalg.inv(xtx)) * sigma2)
+    tvalues = beta / bse
+    llf = -n / 2 * (np.log(2 * np.pi) + np.log(rss / n) + 1)
+    return {
+        'params': dict(zip(names, beta.tolist())),
+        'bse': dict(zip(names, bse.tolist())),
+        'tvalues': dict(zip(names, tvalues.tolist())),
+        'pvalues': dict(zip(names, (2 * stats.t.sf(np.abs(tvalues), dof)).tolist())),
+        'rsquared': 1 - rss / tss,
+        'aic': float(-2 * llf + 2 * k),
+        'nobs': int(n),
+        'df_resid': int(dof)
+    }
+
+def gini_from_counts(counts):
+    """calculate_gini computed from a sorted value -> count table instead of the raw values."""
+    values = counts.index.to_numpy(dtype=float)
+    c = counts.to_numpy(dtype=float)
+    if values.min() < 0:
+        values = values - values.min()
+    n = c.sum()
+    # Ranks s+1..s+c of a tied block contribute sum(2i - n - 1) = c * (2s + c - n)
+    start = np.concatenate([[0.0], np.cumsum(c)[:-1]])
+    return float(np.sum(values * c * (2 * start + c - n)) / (n * np.sum(values * c)))
+
+def bootstrap_means_from_counts(counts, n_sim, seed=None, block_size=1_000):
+    """Bootstrap resample means drawn as multinomial counts over the distinct values."""
+    values = counts.index.to_numpy(dtype=float)
+    probs = counts.to_numpy(dtype=float)
+    n = int(probs.sum())
+    probs /= probs.sum()
+    rng = np.random.default_rng(seed)
+    done = 0
+    while done < n_sim:
+        b = min(block_size, n_sim - done)
+        yield rng.multinomial(n, probs, size=b) @ values / n
+        done += b
@@ -0,0 +1,128 @@
+import functools
+
+import numpy as np
+
+from backend.utils.cache import LRUCache, dataset_version, readonly
+from backend.utils.lazy import lazy_import
+from backend.utils.model_selection import roc_auc, log_loss
+from backend.utils.stat_utils import encode_binary_target, regression_analysis
+
+special = lazy_import("scipy.special")
+stats = lazy_import("scipy.stats")
+
+CALIBRATION_BINS = 10
+CURVE_POINTS = 100
+# Upper bound on the points returned for the ROC curve
+ROC_POINTS = 200
+
+_classifier_cache = LRUCache("classifier", maxsize=16)
+
+def roc_curve(y_true, scores, max_points=ROC_POINTS):
+    """False and true positive rates at every distinct score threshold (thinned to max_points)."""
+    y_true = np.asarray(y_true, dtype=bool)
+    order = np.argsort(-scores, kind='stable')
+    sorted_scores, hits = scores[order], y_true[order]
+    # Last position of each distinct threshold
+    cuts = np.append(np.flatnonzero(np.diff(sorted_scores)), len(sorted_scores) - 1)
+    tps = np.cumsum(hits)[cuts]
+    fps = (cuts + 1) - tps
+    tpr = np.concatenate([[0.0], tps / max(tps[-1], 1)])
+    fpr = np.concatenate([[0.0], fps / max(fps[-1], 1)])
+    # The (0, 0) point's threshold lies above every score (finite, so it serializes to JSON)
+    thresholds = np.concatenate([[sorted_scores[0] + 1], sorted_scores[cuts]])
+    if len(tpr) > max_points:
+        keep = np.unique(np.round(np.linspace(0, len(tpr) - 1, max_points)).astype(np.int64))
+        fpr, tpr, thresholds = fpr[keep], tpr[keep], thresholds[keep]
+    return {"fpr": fpr, "tpr": tpr, "threshold": thresholds}
+
+def calibration_bins(y_true, probs, bins=CALIBRATION_BINS):
+    """Mean predicted probability against the observed rate in equal-width probability bins."""
+    idx = np.minimum((probs * bins).astype(np.int64), bins - 1)
+    count = np.bincount(idx, minlength=bins)
+    predicted = np.bincount(idx, weights=probs, minlength=bins)
+    observed = np.bincount(idx, weights=np.asarray(y_true, dtype=float), minlength=bins)
+    occupied = count > 0
+    return {
+        "bin_low": np.arange(bins)[occupied] / bins,
+        "predicted": predicted[occupied] / count[occupied],
+        "observed": observed[occupied] / count[occupied],
+        "count": count[occupied]
+    }
+
+class LogitClassifier:
+    """
+    A fitted logistic regression plus everything the UI shows about it: ROC/AUC and
+    calibration bins on the training rows, and probability curves per predictor with the
+    other predictors at their means. Scoring new rows only needs the coefficients, so it
+    never refits.
+    """
+    def __init__(self, result, target, predictors, positive_label, X, y, confidence=0.95):
+        self.result = result
+        self.target = target
+        self.predictors = list(predictors)
+        self.positive_label = positive_label
+        self.params = readonly(result.params.to_numpy())
+        self.cov = readonly(result.cov_params().to_numpy())
+        self.n = len(y)
+        self.z = float(stats.norm.ppf(0.5 + confidence / 2))
+
+        probs = self.predict(X)["probability"]
+        self.metrics = {
+            "auc": float(roc_auc(y, probs)),
+            "log_loss": log_loss(y, probs),
+            "accuracy": float(np.mean((probs >= 0.5) == y)),
+            "brier": float(np.mean((probs - y) ** 2)),
+            "positive_rate": float(y.mean()),
+            "pseudo_r_squared": float(result.prsquared),
+            "aic": float(result.aic)
+        }
+        self.roc = roc_curve(y, probs)
+        self.calibration = calibration_bins(y, probs)
+
+        means, lows, highs = X.mean(axis=0), X.min(axis=0), X.max(axis=0)
+        self.curves = {}
+        for j, col in enumerate(self.predictors):
+            grid = np.linspace(lows[j], highs[j], CURVE_POINTS)
+            rows = np.tile(means, (CURVE_POINTS, 1))
+            rows[:, j] = grid
+            self.curves[col] = {"x": grid, **self.predict(rows, interval=True)}
+
+    def predict(self, X, interval=False):
+        """
+        Linear predictor and probability for each row of X (columns in predictor order);
+        interval=True adds a delta-method confidence band on the probability.
+        """
+        design = np.column_stack([np.ones(len(X)), np.asarray(X, dtype=float)])
+        eta = design @ self.params
+        out = {"linear": eta, "probability": special.expit(eta)}
+        if interval:
+            se = np.sqrt(np.einsum('ij,jk,ik->i', design, self.cov, design))
+            out["ci_low"] = special.expit(eta - self.z * se)
+            out["ci_high"] = special.expit(eta + self.z * se)
+        return out
+
+    @functools.cached_property
+    def summary_text(self):
+        return self.result.summary().as_text()
+
+def fit_classifier(df, target, predictors, positive_label='Yes'):
+    """
+    LogitClassifier of target (encoded against positive_label unless already 0/1) on
+    predictors, cached per (dataset version, model).
+    """
+    predictors = list(predictors)
+    key = (dataset_version(df), target, tuple(predictors), positive_label)
+
+    def compute():
+        data = df[[target] + predictors].dropna()
+        y = encode_binary_target(data[target], positive_label).to_numpy(dtype=float)
+        if not np.isin(y, (0.0, 1.0)).all():
+            raise ValueError(f"'{target}' must be binary (0/1 or labels compared to '{positive_label}')")
+        if len(np.unique(y)) < 2:
+            raise ValueError(f"'{target}' has only one outcome")
+        data[target] = y
+        result = regression_analysis(data, target, predictors, model_type='Logit')
+        return LogitClassifier(result, target, predictors, positive_label,
+                               data[predictors].to_numpy(dtype=float), y)
+
+    return _classifier_cache.get_or_compute(key, compute)
@@ -0,0 +1,80 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from backend.utils.cache import LRUCache, dataset_version
+from backend.utils.decomposition import standardize, sample_rows
+from backend.utils.lazy import lazy_import
+
+cluster = lazy_import("sklearn.cluster")
+metrics = lazy_import("sklearn.metrics")
+
+# Above this many rows 'auto' switches to mini-batch k-means
+MINIBATCH_MIN_ROWS = 50_000
+# Silhouette is O(n^2); score it on a fixed random subsample
+SILHOUETTE_SAMPLE_SIZE = 5_000
+
+_sweep_cache = LRUCache("cluster_sweep", maxsize=32)
+
+def _make_model(algorithm, k, seed):
+    if algorithm == 'minibatch':
+        return cluster.MiniBatchKMeans(n_clusters=k, batch_size=4096, n_init=3, random_state=seed)
+    return cluster.KMeans(n_clusters=k, n_init=4, random_state=seed)
+
+def cluster_sweep(df, cols, k_min=2, k_max=8, algorithm='auto', seed=0, n_jobs=None):
+    """
+    Fits k-means for every k in [k_min, k_max] on the cached standardized matrix,
+    in parallel, and scores each fit with inertia and a subsampled silhouette.
+    Cached per (dataset version, column set, k range, algorithm, seed).
+    Returns a dict with per-k scores, the best k (max silhouette) and its cluster profile.
+    """
+    cols = list(cols)
+    scaler, scaled_data, rows = standardize(df, cols)
+    n_samples = scaled_data.shape[0]
+    if k_min < 2 or k_max < k_min:
+        raise ValueError("k range must satisfy 2 <= k_min <= k_max")
+    if k_max >= n_samples:
+        raise ValueError(f"k_max must be smaller than the number of complete rows ({n_samples})")
+    if algorithm == 'auto':
+        algorithm = 'minibatch' if n_samples >= MINIBATCH_MIN_ROWS else 'kmeans'
+    if algorithm not in ('kmeans', 'minibatch'):
+        raise ValueError(f"Unsupported clustering algorithm '{algorithm}'")
+
+    key = (dataset_version(df), tuple(cols), k_min, k_max, algorithm, seed)
+
+    def compute():
+        # Same silhouette subsample for every k so scores are comparable
+        sil_rows = sample_rows(n_samples, SILHOUETTE_SAMPLE_SIZE, seed)
+        sil_data = scaled_data[sil_rows]
+
+        def fit_k(k):
+            model = _make_model(algorithm, k, seed).fit(scaled_data)
+            sil_labels = model.predict(sil_data)
+            silhouette = metrics.silhouette_score(sil_data, sil_labels) if len(np.unique(sil_labels)) > 1 else np.nan
+            return k, model, float(model.inertia_), float(silhouette)
+
+        ks = list(range(k_min, k_max + 1))
+        workers = n_jobs or min(len(ks), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            fits = list(pool.map(fit_k, ks))
+
+        scored = [f for f in fits if not np.isnan(f[3])]
+        best = max(scored, key=lambda f: f[3]) if scored else fits[0]
+        best_k, best_model = best[0], best[1]
+        labels = best_model.predict(scaled_data)
+        sizes = np.bincount(labels, minlength=best_k)
+
+        return {
+            'algorithm': algorithm,
+            'n_samples': int(n_samples),
+            'sweep': [{'k': k, 'inertia': inertia, 'silhouette': None if np.isnan(sil) else sil}
+                      for k, _, inertia, sil in fits],
+            'best_k': int(best_k),
+            'centroids': scaler.inverse_transform(best_model.cluster_centers_),
+            'sizes': sizes,
+            'labels': labels,
+            'rows': rows,
+        }
+
+    return _sweep_cache.get_or_compute(key, compute)
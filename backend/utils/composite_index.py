@@ -0,0 +1,110 @@
+import copy
+
+import numpy as np
+
+from backend.utils.cache import LRUCache, dataset_version, readonly
+
+WEIGHTINGS = ('equal', 'pca', 'custom')
+NORMALIZATIONS = ('zscore', 'minmax')
+
+_index_cache = LRUCache("composite_index", maxsize=32)
+
+def _weights(normalized, weighting, weights=None):
+    """Column weights, scaled so their absolute values sum to 1."""
+    k = normalized.shape[1]
+    if weighting == 'equal':
+        w = np.ones(k)
+    elif weighting == 'pca':
+        # First principal axis of the normalized columns, oriented so the index rises with them
+        _, vectors = np.linalg.eigh(np.cov(normalized, rowvar=False).reshape(k, k))
+        w = vectors[:, -1]
+        w = -w if w.sum() < 0 else w
+    elif weighting == 'custom':
+        if weights is None or len(weights) != k:
+            raise ValueError(f"Custom weighting needs one weight per column ({k})")
+        w = np.asarray(weights, dtype=float)
+    else:
+        raise ValueError(f"Unsupported weighting '{weighting}'")
+    total = np.abs(w).sum()
+    if not np.isfinite(total) or total == 0:
+        raise ValueError("Weights must not all be zero")
+    return w / total
+
+class CompositeIndex:
+    """
+    Weighted sum of normalized columns, with the population's per-column mean/std/min/max
+    and index range kept so new rows are scored in O(rows): no re-normalization of the
+    population. Percentile ranks come from a sorted array of population scores; with_rows()
+    merges extra rows into a copy of it without refitting the normalization.
+    """
+    def __init__(self, cols, data, weighting='equal', weights=None, normalization='zscore'):
+        if normalization not in NORMALIZATIONS:
+            raise ValueError(f"Unsupported normalization '{normalization}'")
+        if len(data) < 2:
+            raise ValueError("Need at least 2 complete rows to build an index")
+        self.cols = list(cols)
+        self.weighting = weighting
+        self.normalization = normalization
+        self.params = {
+            'mean': data.mean(axis=0),
+            'std': data.std(axis=0),
+            'min': data.min(axis=0),
+            'max': data.max(axis=0)
+        }
+        if normalization == 'zscore':
+            self.center, self.scale = self.params['mean'], self.params['std']
+        else:
+            self.center, self.scale = self.params['min'], self.params['max'] - self.params['min']
+        # Constant columns contribute 0 instead of dividing by zero
+        self.scale = np.where(self.scale > 0, self.scale, 1.0)
+        self.weights = _weights((data - self.center) / self.scale, weighting, weights)
+
+        raw = self.raw(data)
+        self.n_fitted = len(raw)
+        self.index_min, self.index_max = float(raw.min()), float(raw.max())
+        self.sorted_scores = readonly(np.sort(raw))
+
+    def raw(self, X):
+        return ((np.asarray(X, dtype=float) - self.center) / self.scale) @ self.weights
+
+    def rescale(self, raw):
+        """Raw index values on a 0-100 scale over the fitted population's range."""
+        span = self.index_max - self.index_min
+        return (np.asarray(raw) - self.index_min) / span * 100 if span > 0 else np.zeros_like(raw)
+
+    def score(self, X):
+        """Raw index, its 0-100 rescaling and the percentile rank of each row of X."""
+        raw = self.raw(X)
+        sorted_scores = self.sorted_scores
+        return {
+            'raw': raw,
+            'scaled': self.rescale(raw),
+            # Share of the population scoring at or below each row
+            'percentile': np.searchsorted(sorted_scores, raw, side='right') / len(sorted_scores) * 100
+        }
+
+    def with_rows(self, X):
+        """
+        A copy whose percentile reference also holds the rows of X (a sorted merge); the
+        normalization stays fixed and this index, which may be shared by a cache, is unchanged.
+        """
+        new = np.sort(self.raw(X))
+        extended = copy.copy(self)
+        extended.sorted_scores = readonly(np.insert(self.sorted_scores, np.searchsorted(self.sorted_scores, new), new))
+        return extended
+
+    @property
+    def n(self):
+        return len(self.sorted_scores)
+
+def index_rows(df, cols):
+    """Complete rows of cols as a float array."""
+    return df[list(cols)].dropna().to_numpy(dtype=float)
+
+def build_index(df, cols, weighting='equal', weights=None, normalization='zscore'):
+    """CompositeIndex over df's complete rows, cached per (dataset version, definition)."""
+    cols = list(cols)
+    key = (dataset_version(df), tuple(cols), weighting,
+           tuple(weights) if weighting == 'custom' and weights is not None else None, normalization)
+    return _index_cache.get_or_compute(
+        key, lambda: CompositeIndex(cols, index_rows(df, cols), weighting, weights, normalization))
@@ -0,0 +1,194 @@
+import numpy as np
+import pandas as pd
+
+from backend.utils.cache import LRUCache, dataset_version, readonly
+from backend.utils.information import joint_counts
+
+DEFAULT_BINS = 10
+# Columns with more levels than this (e.g. Country) are left out of the conditional cells
+MAX_JOINT_LEVELS = 20
+NORMALIZE_OPTIONS = ("none", "all", "index", "columns")
+
+_cube_cache = LRUCache("contingency_cube", maxsize=4)
+
+def _numeric_dimension(name, lo, hi, integer, bins):
+    """One bin per value for short integer ranges (scores, counts), equal-width bins otherwise."""
+    if integer and hi - lo + 1 <= bins:
+        values = np.arange(int(lo), int(hi) + 1)
+        return {"name": name, "kind": "numeric", "edges": np.append(values, hi + 1) - 0.5,
+                "levels": [str(v) for v in values]}
+    edges = np.histogram_bin_edges([lo, hi], bins=bins)
+    levels = [f"[{a:.4g}, {b:.4g})" for a, b in zip(edges[:-1], edges[1:])]
+    levels[-1] = levels[-1][:-1] + "]"
+    return {"name": name, "kind": "numeric", "edges": edges, "levels": levels}
+
+def cube_dimensions(sample, bins=DEFAULT_BINS, ranges=None):
+    """
+    Dimension specs for a cube over the columns of `sample`: every non-numeric column, plus
+    every numeric column binned over its (lo, hi) range in `ranges` (default: the sample's
+    range). ID columns (*_ID) are left out.
+    """
+    ranges = ranges or {}
+    dims = []
+    for col in sample.columns:
+        if col.endswith('_ID'):
+            continue
+        series = sample[col]
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            values = series.dropna().to_numpy(dtype=float)
+            lo, hi = ranges.get(col, (values.min(), values.max()) if len(values) else (np.nan, np.nan))
+            if np.isnan(lo) or np.isnan(hi):
+                continue
+            integer = bool(np.all(values == np.round(values)))
+            dims.append(_numeric_dimension(col, lo, hi, integer, bins))
+        else:
+            dims.append({"name": col, "kind": "categorical"})
+    return dims
+
+def _chunk_keys(chunk, dims):
+    """The chunk's dimension values: categories as strings, numerics as bin numbers (NaN = missing)."""
+    keys = {}
+    for d in dims:
+        values = chunk[d["name"]]
+        if d["kind"] == "numeric":
+            x = values.to_numpy(dtype=float)
+            codes = np.clip(np.searchsorted(d["edges"], x, side='right') - 1, 0, len(d["levels"]) - 1)
+            keys[d["name"]] = np.where(np.isnan(x), np.nan, codes)
+        else:
+            keys[d["name"]] = np.where(values.notna().to_numpy(), values.astype(str).to_numpy(dtype=object), np.nan)
+    return pd.DataFrame(keys)
+
+class ContingencyCube:
+    """
+    Count summary of categorical and binned numeric columns. Every pair's joint table is a
+    block of one level-by-level count matrix (pair_counts), whose size depends on the levels
+    and never on the rows, so marginal and joint tables are slices of it. Conditional tables
+    (`given`) come from a sparse cell list: one row of small integer level codes per observed
+    combination (-1 = missing) and its count, over the columns with at most MAX_JOINT_LEVELS
+    levels, so queries never touch the raw rows.
+    """
+    def __init__(self, dims, codes, counts):
+        self.dims = dims
+        self.names = [d["name"] for d in dims]
+        self.levels = {d["name"]: d["levels"] for d in dims}
+        n_levels = np.array([len(d["levels"]) for d in dims], dtype=np.int64)
+        starts = np.concatenate([[0], np.cumsum(n_levels)]).tolist()
+        self._spans = {name: slice(starts[j], starts[j + 1]) for j, name in enumerate(self.names)}
+        self.pair_counts = readonly(np.rint(joint_counts(codes, counts, n_levels)).astype(np.int64))
+
+        joint = [j for j, k in enumerate(n_levels) if k <= MAX_JOINT_LEVELS]
+        self.joint_names = [self.names[j] for j in joint]
+        codes = codes[:, joint]
+        if len(codes) and joint:
+            # Dropping columns merges cells that only differed in them
+            merged = pd.Series(counts).groupby([codes[:, j] for j in range(len(joint))], sort=False).sum()
+            codes = np.column_stack([merged.index.get_level_values(j) for j in range(len(joint))]).astype(codes.dtype)
+            counts = merged.to_numpy()
+        self.codes = readonly(codes)
+        self.counts = readonly(np.asarray(counts, dtype=np.int64))
+
+    @classmethod
+    def from_chunks(cls, chunks, dims):
+        """Builds the cube from an iterable of DataFrames, merging per-chunk cell counts."""
+        names = [d["name"] for d in dims]
+        total = None
+        for chunk in chunks:
+            counts = _chunk_keys(chunk, dims).groupby(names, dropna=False, sort=False).size()
+            total = counts if total is None else (
+                pd.concat([total, counts]).groupby(level=list(range(len(names))), dropna=False, sort=False).sum())
+
+        n_cells = 0 if total is None else len(total)
+        columns = []
+        dims = [dict(d) for d in dims]
+        for j, d in enumerate(dims):
+            values = total.index.get_level_values(j) if n_cells else pd.Index([])
+            if d["kind"] == "numeric":
+                columns.append(np.nan_to_num(np.asarray(values, dtype=float), nan=-1).astype(np.int64))
+            else:
+                level_codes, levels = pd.factorize(values, sort=True)
+                columns.append(level_codes)
+                d["levels"] = [str(v) for v in levels]
+        # int16 codes unless some column has more levels than that holds
+        widest = max((len(d["levels"]) for d in dims), default=0)
+        dtype = np.int16 if widest < np.iinfo(np.int16).max else np.int32
+        codes = np.column_stack(columns).astype(dtype) if columns else np.empty((n_cells, 0), dtype=dtype)
+        counts = total.to_numpy(dtype=np.int64) if n_cells else np.zeros(0, dtype=np.int64)
+        return cls(dims, codes, counts)
+
+    @property
+    def n_cells(self):
+        return len(self.counts)
+
+    def span(self, name):
+        """The rows/columns of pair_counts that hold the levels of column `name`."""
+        if name not in self._spans:
+            raise KeyError(name)
+        return self._spans[name]
+
+    def _joint_dim(self, name):
+        self.span(name)
+        if name not in self.joint_names:
+            raise ValueError(f"{name} has more than {MAX_JOINT_LEVELS} levels; "
+                             f"conditional tables can only use {', '.join(self.joint_names)}")
+        return self.joint_names.index(name)
+
+    def _mask(self, given):
+        """Cells matching every {column: [allowed levels]} condition."""
+        mask = np.ones(self.n_cells, dtype=bool)
+        for name, allowed in (given or {}).items():
+            j = self._joint_dim(name)
+            unknown = [v for v in allowed if v not in self.levels[name]]
+            if unknown:
+                raise ValueError(f"Unknown level(s) of {name}: {', '.join(map(str, unknown))}")
+            wanted = [self.levels[name].index(v) for v in allowed]
+            mask &= np.isin(self.codes[:, j], wanted)
+        return mask
+
+    def _conditional_counts(self, row, col, given):
+        i = self._joint_dim(row)
+        mask = self._mask(given) & (self.codes[:, i] >= 0)
+        if col is None:
+            return np.bincount(self.codes[mask, i], weights=self.counts[mask], minlength=len(self.levels[row]))
+        j = self._joint_dim(col)
+        mask &= self.codes[:, j] >= 0
+        kr, kc = len(self.levels[row]), len(self.levels[col])
+        flat = self.codes[mask, i].astype(np.int64) * kc + self.codes[mask, j]
+        return np.bincount(flat, weights=self.counts[mask], minlength=kr * kc).reshape(kr, kc)
+
+    def table(self, row, col=None, given=None):
+        """
+        Counts of `row` (by `col` when given) over the rows matching `given`, as a Series or a
+        DataFrame; rows missing either value are skipped and empty levels are dropped, as in pd.crosstab.
+        Without `given` the table is a slice of pair_counts.
+        """
+        if given:
+            counts = self._conditional_counts(row, col, given)
+        elif col is None:
+            i = self.span(row)
+            counts = self.pair_counts[i, i].diagonal()
+        else:
+            counts = self.pair_counts[self.span(row), self.span(col)]
+
+        if col is None:
+            series = pd.Series(counts.astype(np.int64), index=pd.Index(self.levels[row], name=row), name="count")
+            return series[series > 0]
+        table = pd.DataFrame(counts.astype(np.int64), index=pd.Index(self.levels[row], name=row),
+                             columns=pd.Index(self.levels[col], name=col))
+        return table.loc[table.sum(axis=1) > 0, table.sum(axis=0) > 0]
+
+def normalize_table(table, normalize="none"):
+    """Probabilities from a table of counts, with the pd.crosstab meanings of normalize."""
+    if normalize not in NORMALIZE_OPTIONS:
+        raise ValueError(f"normalize must be one of {', '.join(NORMALIZE_OPTIONS)}")
+    if normalize == "none":
+        return table
+    if normalize == "all" or isinstance(table, pd.Series):
+        return table / table.to_numpy().sum()
+    if normalize == "index":
+        return table.div(table.sum(axis=1), axis=0)
+    return table.div(table.sum(axis=0), axis=1)
+
+def cube_for(df, bins=DEFAULT_BINS):
+    """The contingency cube of an in-memory DataFrame, built once per dataset version."""
+    return _cube_cache.get_or_compute(
+        (dataset_version(df), bins), lambda: ContingencyCube.from_chunks([df], cube_dimensions(df, bins)))
@@ -0,0 +1,160 @@
+import numpy as np
+
+from backend.utils.cache import LRUCache, dataset_version, readonly
+from backend.utils.lazy import lazy_import
+
+stats = lazy_import("scipy.stats")
+
+CORRELATION_METHODS = ('pearson', 'spearman', 'kendall')
+
+# Standard error multipliers for the Fisher-z interval (Bonett & Wright 2000 for rank methods)
+_FISHER_SE = {
+    'pearson': lambda n: 1 / np.sqrt(n - 3),
+    'spearman': lambda n: np.sqrt(1.06 / (n - 3)),
+    'kendall': lambda n: np.sqrt(0.437 / (n - 4)),
+}
+
+_rank_cache = LRUCache("ranks", maxsize=256)
+_correlation_cache = LRUCache("correlation", maxsize=64)
+
+def column_ranks(df, col):
+    """Average ranks of one column (NaNs kept as NaN), cached per dataset version and column."""
+    key = (dataset_version(df), col)
+    return _rank_cache.get_or_compute(key, lambda: readonly(df[col].rank().to_numpy(dtype=float)))
+
+def _pairwise_spearman(df, cols):
+    """
+    Spearman rho over pairwise-complete rows. Cached per-column ranks are exact for pairs
+    whose columns are missing on the same rows; any other pair is re-ranked within its own
+    complete rows.
+    """
+    R = np.column_stack([column_ranks(df, c) for c in cols])
+    r, n = pairwise_pearson(R)
+    present = ~np.isnan(R)
+    for i in range(len(cols)):
+        for j in range(i + 1, len(cols)):
+            if np.array_equal(present[:, i], present[:, j]):
+                continue
+            both = present[:, i] & present[:, j]
+            pair = df[[cols[i], cols[j]]].to_numpy(dtype=float)[both]
+            if len(pair) >= 2:
+                r[i, j] = r[j, i] = pairwise_pearson(stats.rankdata(pair, axis=0))[0][0, 1]
+    return r, n
+
+def pairwise_pearson(X):
+    """
+    Pearson correlations over pairwise-complete rows for every column pair of X (NaN = missing).
+    Pair counts and co-moments come from masked matrix products rather than per-pair loops.
+    Returns (r, n) as (p x p) arrays; r is NaN where a pair has fewer than 2 rows or no variance.
+    """
+    X = np.asarray(X, dtype=float)
+    # Centering by the column mean first keeps the sums well conditioned
+    return pearson_from_sums(*pairwise_sums(X, np.nanmean(X, axis=0)))
+
+def pairwise_sums(X, shift):
+    """
+    Pairwise-complete sums of X - shift: (n, sx, sxx, sxy), where sx[i, j] is the sum of
+    column i over rows where both i and j are present. Sums from row blocks can be added.
+    """
+    present = ~np.isnan(X)
+    X0 = np.where(present, X - shift, 0.0)
+    M = present.astype(float)
+    return M.T @ M, X0.T @ M, (X0 ** 2).T @ M, X0.T @ X0
+
+def pearson_from_sums(n, sx, sxx, sxy):
+    """Pearson r (and pair counts) from the pairwise sums of pairwise_sums()."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = n * sxy - sx * sx.T
+        var_i = n * sxx - sx ** 2
+        r = cov / np.sqrt(var_i * var_i.T)
+    r = np.clip(r, -1.0, 1.0)
+    r[n < 2] = np.nan
+    return r, n
+
+def _pairwise_kendall(X):
+    """Kendall tau-b for every pair via scipy's O(n log n) algorithm on pairwise-complete rows."""
+    p = X.shape[1]
+    r = np.eye(p)
+    pvals = np.zeros((p, p))
+    present = ~np.isnan(X)
+    for i in range(p):
+        for j in range(i + 1, p):
+            both = present[:, i] & present[:, j]
+            if both.sum() < 2:
+                r[i, j] = r[j, i] = pvals[i, j] = pvals[j, i] = np.nan
+                continue
+            tau, pv = stats.kendalltau(X[both, i], X[both, j])
+            r[i, j] = r[j, i] = tau
+            pvals[i, j] = pvals[j, i] = pv
+    n = present.T.astype(float) @ present.astype(float)
+    return r, n, pvals
+
+def partial_correlations(r):
+    """Partial correlations (each pair controlling for all other columns) from the precision matrix."""
+    if np.isnan(r).any():
+        return None
+    precision = np.linalg.pinv(r)
+    d = np.sqrt(np.diag(precision))
+    partial = -precision / np.outer(d, d)
+    np.fill_diagonal(partial, 1.0)
+    return np.clip(partial, -1.0, 1.0)
+
+def _t_pvalues(r, dof):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = r * np.sqrt(dof / (1 - r ** 2))
+        p = 2 * stats.t.sf(np.abs(t), dof)
+    p[np.abs(r) >= 1] = 0.0
+    return p
+
+def correlation_matrix(df, cols, method='pearson', partial=False, confidence=0.95):
+    """
+    Correlation matrix with pairwise counts, p-values and Fisher-z confidence intervals.
+    Spearman correlates ranks that are cached per column, re-ranking only pairs whose missing
+    rows differ. Results are cached per (dataset version, method, column set, partial, confidence).
+    Returns a dict of (p x p) arrays: 'r', 'n', 'p_value', 'ci_low', 'ci_high' and optionally 'partial'.
+    """
+    if method not in CORRELATION_METHODS:
+        raise ValueError(f"Unsupported correlation method '{method}'")
+    cols = list(cols)
+    key = (dataset_version(df), method, tuple(cols), partial, confidence)
+
+    def compute():
+        if method == 'kendall':
+            r, n, pvals = _pairwise_kendall(df[cols].to_numpy(dtype=float))
+            return correlation_result(r, n, method, partial, confidence, pvals)
+        if method == 'spearman':
+            r, n = _pairwise_spearman(df, cols)
+        else:
+            r, n = pairwise_pearson(df[cols].to_numpy(dtype=float))
+        return correlation_result(r, n, method, partial, confidence)
+
+    return _correlation_cache.get_or_compute(key, compute)
+
+def correlation_result(r, n, method='pearson', partial=False, confidence=0.95, pvals=None):
+    """Adds p-values (t-test unless given), Fisher-z intervals and optional partial correlations to r."""
+    if pvals is None:
+        pvals = _t_pvalues(r, n - 2)
+
+    z_crit = stats.norm.ppf(0.5 + confidence / 2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = np.arctanh(np.clip(r, -0.999999, 0.999999))
+        se = _FISHER_SE[method](n)
+        ci_low = np.tanh(z - z_crit * se)
+        ci_high = np.tanh(z + z_crit * se)
+    np.fill_diagonal(ci_low, 1.0)
+    np.fill_diagonal(ci_high, 1.0)
+
+    result = {'r': r, 'n': n, 'p_value': pvals, 'ci_low': ci_low, 'ci_high': ci_high}
+    if partial:
+        pc = partial_correlations(r)
+        result['partial'] = pc
+        if pc is not None:
+            # Each partial correlation conditions on the remaining p - 2 columns
+            result['partial_p_value'] = _t_pvalues(pc, n.min() - r.shape[0])
+    return {k: (readonly(v) if isinstance(v, np.ndarray) else v) for k, v in result.items()}
+
+def to_json_matrix(matrix):
+    """Nested lists with NaN replaced by None (NaN is not valid JSON)."""
+    if matrix is None:
+        return None
+    return [[None if np.isnan(v) else float(v) for v in row] for row in matrix]
@@ -0,0 +1,111 @@
+import numpy as np
+
+from backend.utils.cache import LRUCache, dataset_version, readonly
+from backend.utils.resampling import MAX_BLOCK_ELEMENTS
+
+_model_cache = LRUCache("counterfactual_model", maxsize=16)
+
+def _design(df, target, predictors):
+    """Complete rows of target and predictors as (X with a leading constant column, y)."""
+    data = df[[target] + list(predictors)].dropna().to_numpy(dtype=float)
+    X = np.column_stack([np.ones(len(data)), data[:, 1:]])
+    return X, data[:, 0]
+
+def bootstrap_coefficients(X, y, n_boot, seed=0, block_size=1_000):
+    """
+    OLS coefficients of n_boot row-resampled fits, as an (n_boot x p) array. Each block of
+    draws turns its resampled indices into per-row weights, so every fit is a weighted
+    normal-equation solve done as one matrix product for the whole block.
+    """
+    n, p = X.shape
+    rng = np.random.default_rng(seed)
+    # Per-row outer products, so X'WX for a block of weight rows is one matmul
+    outer = (X[:, :, None] * X[:, None, :]).reshape(n, p * p)
+    cross = X * y[:, None]
+    block = max(1, min(block_size, MAX_BLOCK_ELEMENTS // max(n, 1)))
+
+    draws = np.empty((n_boot, p))
+    done = 0
+    while done < n_boot:
+        b = min(block, n_boot - done)
+        cells = rng.integers(0, n, size=(b, n)) + (np.arange(b) * n)[:, None]
+        W = np.bincount(cells.ravel(), minlength=b * n).reshape(b, n).astype(float)
+        XtWX = (W @ outer).reshape(b, p, p)
+        # pinv keeps draws that happen to be rank-deficient from failing the whole block
+        draws[done:done + b] = (np.linalg.pinv(XtWX) @ (W @ cross)[:, :, None])[:, :, 0]
+        done += b
+    return draws
+
+def fit_counterfactual_model(df, target, predictors, n_boot=1000, seed=0):
+    """
+    OLS fit of target on predictors plus bootstrapped coefficient draws, cached per
+    (dataset version, model, n_boot, seed) so grid evaluations never refit.
+    """
+    predictors = list(predictors)
+    key = (dataset_version(df), target, tuple(predictors), n_boot, seed)
+
+    def compute():
+        X, y = _design(df, target, predictors)
+        if len(y) <= X.shape[1]:
+            raise ValueError("Not enough complete rows to fit the model")
+        beta = np.linalg.lstsq(X, y, rcond=None)[0]
+        return {
+            "names": ["const"] + predictors,
+            "coefficients": readonly(beta),
+            "draws": readonly(bootstrap_coefficients(X, y, n_boot, seed)),
+            "n": int(len(y)),
+            "baseline_mean": float(y.mean()),
+            # Only the intervened column's observed values are needed for the grid
+            "sorted_predictors": {c: readonly(np.sort(X[:, j + 1])) for j, c in enumerate(predictors)}
+        }
+
+    return _model_cache.get_or_compute(key, compute)
+
+def mean_shift_curve(sorted_values, shifts, lower=None, upper=None):
+    """
+    Mean change of a column when every value moves by each shift and is clipped to
+    [lower, upper]. Uses prefix sums over the sorted values, so the whole grid costs
+    O(len(shifts) * log n).
+    """
+    x = np.asarray(sorted_values, dtype=float)
+    shifts = np.asarray(shifts, dtype=float)
+    n = len(x)
+    prefix = np.concatenate([[0.0], np.cumsum(x)])
+    lo = -np.inf if lower is None else lower
+    hi = np.inf if upper is None else upper
+
+    # Values with x + shift below lower (or above upper) are clipped to that bound
+    k_lo = np.searchsorted(x, lo - shifts, side='left')
+    k_hi = np.searchsorted(x, hi - shifts, side='right')
+    k_hi = np.maximum(k_hi, k_lo)
+    inside = prefix[k_hi] - prefix[k_lo] + (k_hi - k_lo) * shifts
+    total = inside
+    if lower is not None:
+        total = total + k_lo * lower
+    if upper is not None:
+        total = total + (n - k_hi) * upper
+    return total / n - prefix[-1] / n
+
+def counterfactual_curve(model, intervention, shifts, lower=None, upper=None, confidence=0.95):
+    """
+    Projected mean of the target over a grid of additive interventions on one predictor:
+    observed mean plus the intervened coefficient times the mean change of that predictor.
+    Bands are percentiles of the same quantity over the bootstrapped coefficient draws.
+    """
+    if intervention not in model["sorted_predictors"]:
+        raise ValueError(f"'{intervention}' must be one of the model's predictors")
+    j = model["names"].index(intervention)
+    delta = mean_shift_curve(model["sorted_predictors"][intervention], shifts, lower, upper)
+
+    effect = model["coefficients"][j] * delta
+    draws = model["draws"][:, j][:, None] * delta[None, :]
+    tail = (1 - confidence) / 2 * 100
+    ci_low, ci_high = np.percentile(draws, [tail, 100 - tail], axis=0)
+    return {
+        "shift": np.asarray(shifts, dtype=float),
+        "mean_change": delta,
+        "effect": effect,
+        "projected_mean": model["baseline_mean"] + effect,
+        "ci_low": model["baseline_mean"] + ci_low,
+        "ci_high": model["baseline_mean"] + ci_high
+    }
@@ -1,11 +1,30 @@
+import logging
 import pandas as pd
 import os
 
-def load_data():
+logger = logging.getLogger(__name__)
+
+NUMERIC_COLUMNS = ['Age', 'Avg_Daily_Usage_Hours', 'Sleep_Hours_Per_Night',
+                   'Mental_Health_Score', 'Conflicts_Over_Social_Media', 'Addicted_Score']
+# Numeric columns that hold whole numbers (ages, scores, counts)
+INTEGER_COLUMNS = ['Age', 'Mental_Health_Score', 'Conflicts_Over_Social_Media', 'Addicted_Score']
+
+def coerce_numeric(df):
     """
-    Loads the Students Social Media Addiction dataset.
-    Performs basic cleaning and ensures correct data types.
+    Ensures the numeric survey columns are actually numeric (unparseable values become NaN).
+    How many values each column lost is kept in df.attrs['coerced'] for the data profile.
     """
+    coerced = {}
+    for col in NUMERIC_COLUMNS:
+        if col in df.columns:
+            values = pd.to_numeric(df[col], errors='coerce')
+            coerced[col] = int(values.isna().sum() - df[col].isna().sum())
+            df[col] = values
+    df.attrs["coerced"] = coerced
+    return df
+
+def default_dataset_path():
+    """Location of the bundled survey CSV, or None if it cannot be found."""
     # Look for the file in the parent project directory relative to this backend file
     # Assuming structure: /project_QT/backend/utils/data_loader.py or similar
     # We need to find "Students Social Media Addiction.csv" in /project_QT/
@@ -21,31 +40,38 @@ def load_data():
         "/Users/gg/Documents/project_QT/Students Social Media Addiction.csv"
     ]
     
-    file_path = None
     for path in possible_paths:
         if os.path.exists(path):
-            file_path = path
-            break
+            return path
+    return None
+
+def load_data(path=None):
+    """
+    Loads the Students Social Media Addiction dataset.
+    Performs basic cleaning and ensures correct data types.
+    The file is `path`, else the DATASET_PATH environment variable (e.g. a synthetic
+    export from backend.utils.synthetic), else the bundled CSV.
+    """
+    file_path = path or os.environ.get("DATASET_PATH") or default_dataset_path()
             
-    if not file_path:
-        print("Dataset not found.")
+    if not file_path or not os.path.exists(file_path):
+        logger.warning("Dataset not found (%s)", file_path)
         return pd.DataFrame()
     
     try:
-        df = pd.read_csv(file_path)
-        
-        # Ensure numeric columns are actually numeric
-        numeric_cols = ['Age', 'Avg_Daily_Usage_Hours', 'Sleep_Hours_Per_Night', 
-                        'Mental_Health_Score', 'Conflicts_Over_Social_Media', 'Addicted_Score']
+        if file_path.endswith(('.parquet', '.pq')):
+            df = pd.read_parquet(file_path)
+        else:
+            df = pd.read_csv(file_path)
         
-        for col in numeric_cols:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-                
+        df = coerce_numeric(df)
+        for col, count in df.attrs["coerced"].items():
+            if count:
+                logger.warning("%s: %d unparseable values set to NaN", col, count)
         return df
         
-    except Exception as e:
-        print(f"An error occurred while loading data: {e}")
+    except Exception:
+        logger.exception("Failed to load dataset %s", file_path)
         return pd.DataFrame()
 
 def get_data_dictionary():
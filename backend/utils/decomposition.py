@@ -0,0 +1,212 @@
+import numpy as np
+
+from backend.utils.cache import LRUCache, dataset_version, readonly
+from backend.utils.lazy import lazy_import
+
+sk_decomposition = lazy_import("sklearn.decomposition")
+preprocessing = lazy_import("sklearn.preprocessing")
+
+# Shape thresholds for automatic solver selection
+RANDOMIZED_MIN_FEATURES = 50
+INCREMENTAL_MIN_ROWS = 200_000
+INCREMENTAL_BATCH_SIZE = 50_000
+# Components kept for wide data when the caller doesn't ask for a number
+DEFAULT_WIDE_COMPONENTS = 10
+
+_standardized_cache = LRUCache("standardized", maxsize=8)
+_pca_cache = LRUCache("pca", maxsize=32)
+_factor_cache = LRUCache("factor_analysis", maxsize=32)
+
+def standardize(df, cols):
+    """
+    Drops incomplete rows of the selected columns and z-scores them.
+    Cached per (dataset version, column set); returns (scaler, scaled_data, row_positions)
+    where row_positions are the integer positions of the retained rows in df.
+    """
+    cols = list(cols)
+    key = (dataset_version(df), tuple(cols))
+
+    def compute():
+        data = df[cols]
+        mask = data.notna().all(axis=1).to_numpy()
+        scaler = preprocessing.StandardScaler()
+        scaled_data = scaler.fit_transform(data.to_numpy(dtype=float)[mask])
+        return scaler, readonly(scaled_data), readonly(np.flatnonzero(mask))
+
+    return _standardized_cache.get_or_compute(key, compute)
+
+def component_count(n_samples, n_features, n_components=None):
+    """
+    Components to fit: the requested number clipped to the data's rank or, for wide data
+    with none requested, DEFAULT_WIDE_COMPONENTS so the randomized solver can stop early.
+    None keeps every component.
+    """
+    max_components = min(n_samples, n_features)
+    if n_components is not None:
+        return max(1, min(int(n_components), max_components))
+    if n_features >= RANDOMIZED_MIN_FEATURES:
+        return min(max_components, DEFAULT_WIDE_COMPONENTS)
+    return None
+
+def choose_pca_method(n_samples, n_features, n_components=None):
+    """
+    Picks a PCA solver from the data shape:
+    'incremental' for tall data (bounded memory, batched partial fits),
+    'randomized' for wide data when only a few components are kept,
+    'full' (exact LAPACK SVD) otherwise.
+    """
+    if n_samples >= INCREMENTAL_MIN_ROWS:
+        return 'incremental'
+    if n_features >= RANDOMIZED_MIN_FEATURES and n_components is not None \
+            and n_components < 0.8 * min(n_samples, n_features):
+        return 'randomized'
+    return 'full'
+
+def _complete_rows(df, cols):
+    """Integer positions of the rows of df with every one of cols present."""
+    return np.flatnonzero(df[cols].notna().all(axis=1).to_numpy())
+
+def _row_batches(df, cols, rows, bounds):
+    """The float values of df[cols] at rows[lo:hi] for consecutive (lo, hi) in bounds."""
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        yield df[cols].iloc[rows[lo:hi]].to_numpy(dtype=float)
+
+def fit_pca(df, cols, n_components=None, method='auto', random_state=0):
+    """
+    Fits PCA on the standardized selection, caching the fitted decomposition per
+    (dataset version, column set, n_components, method).
+    Returns a dict with the fitted 'pca', its 'scaler', the solver 'method' used,
+    'n_samples' and the retained 'rows' (integer positions in df).
+    The 'incremental' solver never holds more than one standardized batch: the scaler
+    and the decomposition are both fitted with partial_fit, one batch of rows at a time.
+    """
+    cols = list(cols)
+    rows = _complete_rows(df, cols)
+    n_samples, n_features = len(rows), len(cols)
+
+    n_components = component_count(n_samples, n_features, n_components)
+    if method == 'auto':
+        method = choose_pca_method(n_samples, n_features, n_components)
+    if method not in ('full', 'randomized', 'incremental'):
+        raise ValueError(f"Unsupported PCA method '{method}'")
+
+    key = (dataset_version(df), tuple(cols), n_components, method)
+
+    def compute():
+        if method == 'incremental':
+            batch_size = max(INCREMENTAL_BATCH_SIZE, n_components or n_features)
+            bounds = list(range(0, n_samples, batch_size)) + [n_samples]
+            # partial_fit needs at least n_components rows; fold a short tail into the previous batch
+            if len(bounds) > 2 and bounds[-1] - bounds[-2] < (n_components or n_features):
+                del bounds[-2]
+            scaler = preprocessing.StandardScaler()
+            for X in _row_batches(df, cols, rows, bounds):
+                scaler.partial_fit(X)
+            pca = sk_decomposition.IncrementalPCA(n_components=n_components, batch_size=batch_size)
+            for X in _row_batches(df, cols, rows, bounds):
+                pca.partial_fit(scaler.transform(X))
+        else:
+            scaler, scaled_data, _ = standardize(df, cols)
+            if method == 'randomized':
+                # Randomized SVD needs an explicit rank
+                k = n_components or min(n_samples, n_features)
+                pca = sk_decomposition.PCA(n_components=k, svd_solver='randomized',
+                                           random_state=random_state).fit(scaled_data)
+            else:
+                pca = sk_decomposition.PCA(n_components=n_components, svd_solver='full').fit(scaled_data)
+
+        return {
+            'pca': pca,
+            'scaler': scaler,
+            'method': method,
+            'n_samples': int(n_samples),
+            'rows': readonly(rows),
+        }
+
+    return _pca_cache.get_or_compute(key, compute)
+
+def pca_from_comoments(n, mean, scatter, n_components=None):
+    """
+    PCA of the standardized data from its sufficient statistics: the complete-row count,
+    column means and centered scatter matrix (sum of outer products of deviations).
+    Eigenvectors of the correlation matrix are the principal axes, so this matches
+    fit_pca on the same rows (signs follow sklearn's convention) without the rows themselves.
+    Returns the explained_variance_ratio, components, the scaler's mean and scale, and n_samples.
+    """
+    n_features = len(mean)
+    if n < 1:
+        raise ValueError("No complete rows for the selected columns")
+    # StandardScaler's population std, with constant columns left unscaled
+    scale = np.sqrt(np.diag(scatter) / n)
+    scale = np.where(scale > 0, scale, 1.0)
+    corr = scatter / n / np.outer(scale, scale)
+    eigenvalues, eigenvectors = np.linalg.eigh(corr)
+    order = np.argsort(eigenvalues)[::-1]
+    eigenvalues = np.clip(eigenvalues[order], 0, None)
+    components = eigenvectors[:, order].T
+    # sklearn's svd_flip(u_based_decision=False): the largest loading of each axis is positive
+    signs = np.sign(components[np.arange(n_features), np.argmax(np.abs(components), axis=1)])
+    components *= np.where(signs == 0, 1, signs)[:, None]
+
+    k = component_count(n, n_features, n_components) or min(n, n_features)
+    total = eigenvalues.sum()
+    ratio = eigenvalues / total if total > 0 else np.zeros(n_features)
+    return {
+        'explained_variance_ratio': ratio[:k],
+        'components': components[:k],
+        'mean': np.asarray(mean, dtype=float),
+        'scale': scale,
+        'n_samples': int(n),
+    }
+
+def sample_rows(n_rows, max_points, seed=0):
+    """Sorted random subset of row positions, at most max_points long (all rows if fewer)."""
+    if max_points is None or n_rows <= max_points:
+        return np.arange(n_rows)
+    rng = np.random.default_rng(seed)
+    return np.sort(rng.choice(n_rows, size=max_points, replace=False))
+
+def project_rows(df, cols, fit, positions):
+    """Component scores of the rows of df at `positions` (a subset of fit['rows'])."""
+    X = df[list(cols)].iloc[positions].to_numpy(dtype=float)
+    return fit['pca'].transform(fit['scaler'].transform(X))
+
+def pca_scores(df, cols, fit, max_points=2000, n_scores=2, seed=0):
+    """
+    Projects a downsampled set of rows onto the first n_scores components for biplots.
+    Returns the sampled row positions (in df) and the (n_points, n_scores) score matrix.
+    """
+    rows = fit['rows']
+    picked = rows[sample_rows(len(rows), max_points, seed)]
+    return picked, project_rows(df, cols, fit, picked)[:, :n_scores]
+
+def factor_analysis(df, cols, n_factors=2, rotation='varimax', random_state=0):
+    """
+    Maximum-likelihood factor analysis on the standardized selection (shared with PCA).
+    Cached per (dataset version, column set, n_factors, rotation).
+    Returns loadings (features x factors), communalities and uniquenesses.
+    """
+    cols = list(cols)
+    _, scaled_data, _ = standardize(df, cols)
+    n_samples, n_features = scaled_data.shape
+    if not 1 <= n_factors <= n_features:
+        raise ValueError(f"n_factors must be between 1 and {n_features}")
+    if rotation not in (None, 'varimax', 'quartimax'):
+        raise ValueError(f"Unsupported rotation '{rotation}'")
+
+    key = (dataset_version(df), tuple(cols), n_factors, rotation)
+
+    def compute():
+        fa = sk_decomposition.FactorAnalysis(n_components=n_factors, rotation=rotation, random_state=random_state)
+        fa.fit(scaled_data)
+        loadings = fa.components_.T
+        communalities = np.sum(loadings ** 2, axis=1)
+        return {
+            'loadings': loadings,
+            'communalities': communalities,
+            'uniquenesses': fa.noise_variance_,
+            'variance_explained': np.sum(loadings ** 2, axis=0) / n_features,
+            'n_samples': int(n_samples),
+        }
+
+    return _factor_cache.get_or_compute(key, compute)
@@ -0,0 +1,151 @@
+import numpy as np
+import pandas as pd
+
+from backend.utils.lazy import available, lazy_import
+
+# Optional; only needed for Arrow and Parquet exports (and the faster CSV writer)
+HAS_PYARROW = available("pyarrow")
+pa = lazy_import("pyarrow")
+pa_csv = lazy_import("pyarrow.csv")
+pa_ipc = lazy_import("pyarrow.ipc")
+pq = lazy_import("pyarrow.parquet")
+
+# Media type and file extension per export format
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+    "parquet": ("application/vnd.apache.parquet", "parquet")
+}
+BATCH_ROWS = 65_536
+
+def check_format(fmt):
+    """Raises ValueError for unknown formats and LookupError when the format needs pyarrow."""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported format '{fmt}'. Available: {', '.join(EXPORT_FORMATS)}")
+    if fmt != "csv" and not HAS_PYARROW:
+        raise LookupError(f"{fmt} exports require pyarrow")
+
+def segment_mask(frame, where=None, ranges=None):
+    """
+    Rows of frame in the segment: each `where` column takes one of the listed values (compared
+    as numbers for numeric columns) and each `ranges` column lies in [lo, hi] (None = open).
+    Returns None when there is no filter.
+    """
+    if not where and not ranges:
+        return None
+    mask = np.ones(len(frame), dtype=bool)
+    for col, values in (where or {}).items():
+        series = frame[col]
+        if pd.api.types.is_numeric_dtype(series):
+            values = pd.to_numeric(pd.Series(values), errors='coerce').dropna()
+        mask &= series.isin(values).to_numpy()
+    for col, (lo, hi) in (ranges or {}).items():
+        x = frame[col].to_numpy(dtype=float)
+        if lo is not None:
+            mask &= x >= lo
+        if hi is not None:
+            mask &= x <= hi
+    return mask
+
+def frame_batches(df, columns=None, mask=None, batch_rows=BATCH_ROWS):
+    """
+    Yields row slices of df (projected to columns, filtered by mask) of at most batch_rows
+    source rows each. Slices are views of the in-memory columns; only a filtered slice is
+    copied. Always yields at least one (possibly empty) frame so writers know the schema.
+    """
+    columns = list(columns) if columns else list(df.columns)
+    projected = df[columns]
+    if len(df) == 0:
+        yield projected
+        return
+    for lo in range(0, len(df), batch_rows):
+        part = projected.iloc[lo:lo + batch_rows]
+        yield part if mask is None else part[mask[lo:lo + batch_rows]]
+
+class _ChunkSink:
+    """File-like target for the Arrow and Parquet writers; drain() hands over what was written since."""
+    def __init__(self):
+        self._parts = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+def _arrow_batch(frame, schema=None):
+    return pa.RecordBatch.from_pandas(frame, schema=schema, preserve_index=False)
+
+def stream_frames(frames, fmt):
+    """
+    Encodes an iterable of DataFrames with identical columns as one CSV, Arrow IPC stream or
+    Parquet file. The first frame is computed and encoded before this returns, so bad input
+    raises here rather than after a response has started; the returned generator then yields
+    bytes as each further frame is written (one record batch / row group per frame), so
+    nothing larger than a frame is held at once. CSV goes through pyarrow's writer when it is
+    installed and pandas otherwise.
+    """
+    check_format(fmt)
+    frames = iter(frames)
+    first = next(frames, None)
+    if first is None:
+        raise ValueError("Nothing to export")
+
+    if fmt == "csv" and not HAS_PYARROW:
+        head = first.to_csv(index=False).encode()
+        return _stream_pandas_csv(head, frames)
+
+    sink = _ChunkSink()
+    batch = _arrow_batch(first)
+    # Later frames are converted to the first one's types
+    source_schema = schema = batch.schema
+    if fmt == "csv":
+        # Dictionary (categorical) columns are written as their values
+        schema = pa.schema([f.with_type(f.type.value_type) if pa.types.is_dictionary(f.type) else f for f in schema])
+        writer = pa_csv.CSVWriter(sink, schema)
+        write = lambda b: writer.write_batch(b.cast(schema))
+    elif fmt == "arrow":
+        writer = pa_ipc.new_stream(sink, schema)
+        write = writer.write_batch
+    else:
+        writer = pq.ParquetWriter(sink, schema)
+        write = lambda b: writer.write_table(pa.Table.from_batches([b]))
+    try:
+        if batch.num_rows:
+            write(batch)
+    except BaseException:
+        writer.close()
+        raise
+    return _stream_arrow(sink, writer, write, frames, source_schema)
+
+def _stream_pandas_csv(head, frames):
+    yield head
+    for frame in frames:
+        if len(frame):
+            yield frame.to_csv(index=False, header=False).encode()
+
+def _stream_arrow(sink, writer, write, frames, schema):
+    try:
+        yield sink.drain()
+        for frame in frames:
+            if len(frame):
+                write(_arrow_batch(frame, schema))
+                yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
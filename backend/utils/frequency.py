@@ -0,0 +1,156 @@
+import numpy as np
+import pandas as pd
+
+from backend.utils.cache import LRUCache, dataset_version, readonly
+
+# Resolution of the cached histogram. 5040 is divisible by every bin count up to 10 and most
+# common ones beyond, so those are re-aggregated exactly; other counts snap to the fine edges.
+FINE_BINS = 5040
+# Histograms kept ready next to the Freedman-Diaconis one
+FIXED_LEVELS = (10, 30, 60, 120)
+# Integer-valued numeric columns with at most this many distinct values also keep exact counts
+MAX_DISCRETE_LEVELS = 50
+
+_frequency_cache = LRUCache("frequencies", maxsize=256)
+
+def _runs(sorted_values):
+    """Distinct values of a sorted array and how often each occurs."""
+    if len(sorted_values) == 0:
+        return sorted_values, np.zeros(0, dtype=np.int64)
+    starts = np.concatenate([[0], np.flatnonzero(sorted_values[1:] != sorted_values[:-1]) + 1])
+    return sorted_values[starts], np.diff(np.append(starts, len(sorted_values)))
+
+def _fine_counts(x, lo, hi):
+    """
+    Counts of x on the fine grid over [lo, hi]. Positions within rounding error of a grid line
+    snap onto it, so a value sitting exactly on a coarse edge lands in the bin to its right
+    whatever the bin count (the last bin is closed, as in np.histogram).
+    """
+    edges = np.histogram_bin_edges([lo, hi], bins=FINE_BINS)
+    position = (x - edges[0]) * (FINE_BINS / (edges[-1] - edges[0]))
+    nearest = np.round(position)
+    position = np.where(np.abs(position - nearest) < 1e-6, nearest, position)
+    inside = (position >= 0) & (position <= FINE_BINS)
+    return np.bincount(np.minimum(position[inside].astype(np.int64), FINE_BINS - 1), minlength=FINE_BINS)
+
+class ColumnFrequencies:
+    """
+    Frequency summary of one column: exact value counts for discrete columns (categories, and
+    short integer scales read off a single sort) and, for numeric columns, counts on a fine
+    equal-width grid over [lo, hi] that every coarser histogram is re-aggregated from.
+    Summaries built on the same grid (row chunks, filtered segments) merge by addition.
+    """
+    def __init__(self, name, n, missing, value_counts=None, lo=None, hi=None, fine=None):
+        self.name = name
+        self.n = n
+        self.missing = missing
+        self.value_counts = value_counts
+        self.lo, self.hi = lo, hi
+        self.fine = readonly(fine) if fine is not None else None
+        self.fine_edges = readonly(np.histogram_bin_edges([lo, hi], bins=FINE_BINS)) if fine is not None else None
+        self.levels = {}
+        if self.fine is not None and n > 0:
+            self.levels = {str(k): self._reaggregate(k) for k in FIXED_LEVELS}
+            self.levels["fd"] = self._reaggregate(self.fd_bins())
+
+    @classmethod
+    def build(cls, series, grid=None):
+        """
+        Summary of a Series. Numeric columns are binned over `grid` = (lo, hi), by default the
+        column's own range; pass the full column's range so segment summaries stay mergeable.
+        """
+        name = series.name
+        if not pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+            # Hashing beats sorting strings; only the distinct levels get sorted
+            counts = series.value_counts(sort=False)
+            counts.index = counts.index.astype(str)
+            counts = counts.groupby(level=0).sum().sort_index().astype(np.int64).rename(name)
+            return cls(name, int(counts.sum()), int(series.isna().sum()), counts)
+
+        x = np.sort(series.to_numpy(dtype=float))
+        n = len(x) - int(np.isnan(x).sum())
+        # NaNs sort last
+        x = x[:n]
+        value_counts = None
+        values, counts = _runs(x)
+        if len(values) <= MAX_DISCRETE_LEVELS and np.all(values == np.round(values)):
+            value_counts = pd.Series(counts, index=values.astype(np.int64), name=name)
+        if n == 0 and grid is None:
+            return cls(name, 0, len(series) - n, value_counts)
+
+        lo, hi = grid if grid is not None else (x[0], x[-1])
+        return cls(name, n, len(series) - n, value_counts, float(lo), float(hi), _fine_counts(x, lo, hi))
+
+    @property
+    def discrete(self):
+        return self.value_counts is not None
+
+    def pmf(self):
+        """Probability of each distinct value, sorted by value."""
+        if self.value_counts is None:
+            raise ValueError(f"'{self.name}' has too many distinct values for a PMF")
+        return self.value_counts / self.n
+
+    def quantile(self, q):
+        """Quantiles interpolated within the fine bins (exact to within one fine bin width)."""
+        cumulative = np.concatenate([[0], np.cumsum(self.fine)])
+        return np.interp(np.asarray(q) * self.n, cumulative, self.fine_edges)
+
+    def fd_bins(self):
+        """Freedman-Diaconis bin count: bin width 2 * IQR / n^(1/3)."""
+        q1, q3 = self.quantile([0.25, 0.75])
+        width = 2 * (q3 - q1) / np.cbrt(self.n)
+        if not width > 0:
+            return 1
+        return int(np.clip(np.ceil((self.hi - self.lo) / width), 1, FINE_BINS))
+
+    def _reaggregate(self, bins):
+        # Coarse edges are the fine edges nearest to an even split, so the counts stay exact
+        cuts = np.unique(np.round(np.linspace(0, FINE_BINS, min(bins, FINE_BINS) + 1)).astype(np.int64))
+        return np.add.reduceat(self.fine, cuts[:-1]), self.fine_edges[cuts]
+
+    def histogram(self, bins=30):
+        """(counts, edges) for a bin count or 'fd', re-aggregated from the fine grid."""
+        if self.fine is None:
+            raise ValueError(f"'{self.name}' is not numeric")
+        key = str(bins)
+        if key in self.levels:
+            return self.levels[key]
+        if isinstance(bins, str):
+            raise ValueError(f"Unsupported bins '{bins}'")
+        if bins < 1:
+            raise ValueError("bins must be at least 1")
+        return self._reaggregate(int(bins))
+
+    def merge(self, other):
+        """Summary of the union of both row sets; numeric summaries must share a grid."""
+        if (self.fine is None) != (other.fine is None) or (
+                self.fine is not None and (self.lo, self.hi) != (other.lo, other.hi)):
+            raise ValueError("Can only merge summaries built on the same grid")
+        value_counts = None
+        if self.value_counts is not None and other.value_counts is not None:
+            value_counts = self.value_counts.add(other.value_counts, fill_value=0).astype(np.int64)
+            if self.fine is not None and len(value_counts) > MAX_DISCRETE_LEVELS:
+                value_counts = None
+        fine = self.fine + other.fine if self.fine is not None else None
+        return ColumnFrequencies(self.name, self.n + other.n, self.missing + other.missing,
+                                 value_counts, self.lo, self.hi, fine)
+
+def column_frequencies(df, col):
+    """ColumnFrequencies of one column of an in-memory DataFrame, built once per dataset version."""
+    return _frequency_cache.get_or_compute((dataset_version(df), col), lambda: ColumnFrequencies.build(df[col]))
+
+def frequencies_for(df):
+    """ColumnFrequencies of every column, keyed by column name (e.g. to build them all at load)."""
+    return {col: column_frequencies(df, col) for col in df.columns}
+
+def segment_frequencies(df, col, mask):
+    """Summary of col over the rows selected by mask, on the full column's grid (so segments merge)."""
+    full = column_frequencies(df, col)
+    grid = (full.lo, full.hi) if full.fine is not None else None
+    return ColumnFrequencies.build(df.loc[mask, col], grid)
+
+def density(counts, edges):
+    """Histogram counts scaled to a probability density."""
+    total = counts.sum()
+    return counts / (total * np.diff(edges)) if total > 0 else np.zeros(len(counts))
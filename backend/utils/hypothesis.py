@@ -0,0 +1,273 @@
+import numpy as np
+import pandas as pd
+
+from backend.utils.lazy import lazy_import
+
+stats = lazy_import("scipy.stats")
+multitest = lazy_import("statsmodels.stats.multitest")
+
+TWO_GROUP_TESTS = ('welch', 'student', 'mannwhitney')
+K_GROUP_TESTS = ('anova', 'kruskal')
+CORRECTIONS = {'holm': 'holm', 'bh': 'fdr_bh', 'bonferroni': 'bonferroni', 'none': None}
+
+def _split_groups(df, group_col, value_col):
+    data = df[[group_col, value_col]].dropna()
+    groups = data.groupby(group_col, sort=True)[value_col]
+    names = list(groups.groups.keys())
+    samples = [groups.get_group(name).to_numpy(dtype=float) for name in names]
+    return names, samples
+
+def two_group_test(df, group_col, value_col, method='welch'):
+    """
+    Compares value_col between the two levels of group_col.
+    method: 'welch' (unequal-variance t), 'student' (pooled t) or 'mannwhitney'.
+    Returns None if group_col does not have exactly two levels.
+    """
+    if method not in TWO_GROUP_TESTS:
+        raise ValueError(f"Unsupported two-group test '{method}'")
+    names, samples = _split_groups(df, group_col, value_col)
+    if len(names) != 2:
+        return None
+    g1, g2 = samples
+
+    if method == 'mannwhitney':
+        stat, p = stats.mannwhitneyu(g1, g2, alternative='two-sided')
+        # Rank-biserial correlation
+        effect = 1 - 2 * stat / (len(g1) * len(g2))
+        effect_name = 'rank_biserial'
+    else:
+        stat, p = stats.ttest_ind(g1, g2, equal_var=(method == 'student'))
+        pooled_sd = np.sqrt(((len(g1) - 1) * g1.var(ddof=1) + (len(g2) - 1) * g2.var(ddof=1)) / (len(g1) + len(g2) - 2))
+        effect = (g1.mean() - g2.mean()) / pooled_sd if pooled_sd > 0 else np.nan
+        effect_name = 'cohens_d'
+
+    return {
+        "test": method,
+        "groups": [str(g) for g in names],
+        "n": [len(g1), len(g2)],
+        "means": [float(g1.mean()), float(g2.mean())],
+        "medians": [float(np.median(g1)), float(np.median(g2))],
+        "statistic": float(stat),
+        "p_value": float(p),
+        "effect_size": {effect_name: None if np.isnan(effect) else float(effect)}
+    }
+
+def k_group_test(df, group_col, value_col, method='anova', posthoc=True):
+    """
+    Compares value_col across all levels of group_col.
+    method: 'anova' (one-way F, with Tukey HSD post-hoc pairs) or 'kruskal' (Kruskal-Wallis H).
+    """
+    if method not in K_GROUP_TESTS:
+        raise ValueError(f"Unsupported k-group test '{method}'")
+    names, samples = _split_groups(df, group_col, value_col)
+    if len(names) < 2:
+        raise ValueError("Group column must have at least 2 levels")
+
+    if method == 'anova':
+        stat, p = stats.f_oneway(*samples)
+    else:
+        stat, p = stats.kruskal(*samples)
+
+    result = {
+        "test": method,
+        "groups": [str(g) for g in names],
+        "n": [len(s) for s in samples],
+        "means": [float(s.mean()) for s in samples],
+        "medians": [float(np.median(s)) for s in samples],
+        "statistic": float(stat),
+        "p_value": float(p)
+    }
+
+    if method == 'anova' and posthoc:
+        tukey = stats.tukey_hsd(*samples)
+        ci = tukey.confidence_interval()
+        pairs = []
+        for i in range(len(names)):
+            for j in range(i + 1, len(names)):
+                pairs.append({
+                    "group_a": str(names[i]),
+                    "group_b": str(names[j]),
+                    "mean_diff": float(samples[i].mean() - samples[j].mean()),
+                    "ci_low": float(ci.low[i, j]),
+                    "ci_high": float(ci.high[i, j]),
+                    "p_value": float(tukey.pvalue[i, j])
+                })
+        result["tukey_hsd"] = pairs
+
+    return result
+
+def chi_square_test(df, col_a, col_b):
+    """
+    Chi-square test of independence with the usual expected-count check
+    (no expected count below 1 and at most 20% of cells below 5).
+    """
+    return chi_square_from_table(pd.crosstab(df[col_a], df[col_b]))
+
+def chi_square_from_table(table):
+    """chi_square_test on an already tabulated contingency table (DataFrame of counts)."""
+    if min(table.shape) < 2:
+        raise ValueError("Both columns need at least 2 levels")
+    chi2, p, dof, expected = stats.chi2_contingency(table)
+    share_below_5 = float(np.mean(expected < 5))
+    n = table.to_numpy().sum()
+
+    return {
+        "test": "chi_square",
+        "rows": [str(r) for r in table.index],
+        "cols": [str(c) for c in table.columns],
+        "observed": table.to_numpy().tolist(),
+        "expected": expected.tolist(),
+        "statistic": float(chi2),
+        "dof": int(dof),
+        "p_value": float(p),
+        "cramers_v": float(np.sqrt(chi2 / n / (min(table.shape) - 1))),
+        "expected_check": {
+            "min_expected": float(expected.min()),
+            "share_below_5": share_below_5,
+            "assumptions_met": bool(expected.min() >= 1 and share_below_5 <= 0.2)
+        }
+    }
+
+def cramers_v_matrix(cube, cols):
+    """
+    Cramér's V of every pair of cols (1 on the diagonal) and each pair's complete-row count,
+    with every pair's table sliced from the contingency cube rather than the rows.
+    """
+    k = len(cols)
+    matrix, pair_n = np.eye(k), np.zeros((k, k), dtype=np.int64)
+    for i in range(k):
+        pair_n[i, i] = int(cube.table(cols[i]).to_numpy().sum())
+        for j in range(i + 1, k):
+            table = cube.table(cols[i], cols[j])
+            matrix[i, j] = matrix[j, i] = chi_square_from_table(table)["cramers_v"]
+            pair_n[i, j] = pair_n[j, i] = int(table.to_numpy().sum())
+    return {"cramers_v": pd.DataFrame(matrix, index=cols, columns=cols), "pair_n": pair_n}
+
+def _group_moments(values, codes, k):
+    """Per-group counts, sums and sums of squares for every column of values (NaNs skipped)."""
+    present = ~np.isnan(values)
+    filled = np.where(present, values, 0.0)
+    frame = pd.DataFrame(np.hstack([present, filled, filled ** 2]))
+    sums = frame.groupby(codes, sort=True).sum().reindex(range(k), fill_value=0).to_numpy()
+    p = values.shape[1]
+    return sums[:, :p], sums[:, p:2 * p], sums[:, 2 * p:]
+
+def _one_way(counts, sums, sumsq):
+    """Vectorized one-way ANOVA over columns given (k x p) group moments."""
+    N = counts.sum(axis=0)
+    k_eff = (counts > 0).sum(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        means = sums / counts
+        grand = sums.sum(axis=0) / N
+        ssb = np.nansum(counts * (means - grand) ** 2, axis=0)
+        ssw = np.nansum(sumsq - sums ** 2 / np.where(counts > 0, counts, np.nan), axis=0)
+        df_b = k_eff - 1
+        df_w = N - k_eff
+        F = (ssb / df_b) / (ssw / df_w)
+    return F, df_b, df_w
+
+def sweep_group_tests(df, cat_cols, num_cols, method='auto', correction='holm', alpha=0.05):
+    """
+    Tests every categorical x numeric pair in one sweep.
+    For each categorical column, group moments (or rank moments) for all numeric columns
+    are aggregated at once and the test statistics are computed as array ops across columns.
+    method: 'auto' (Welch for 2 groups, ANOVA otherwise), 'nonparametric' (Mann-Whitney /
+    Kruskal-Wallis) or a specific test name. P-values are corrected across the whole sweep.
+    """
+    if correction not in CORRECTIONS:
+        raise ValueError(f"Unsupported correction '{correction}'")
+    if method not in ('auto', 'nonparametric') + TWO_GROUP_TESTS + K_GROUP_TESTS:
+        raise ValueError(f"Unsupported method '{method}'")
+
+    rows = []
+    for cat in cat_cols:
+        keep = df[cat].notna().to_numpy()
+        codes, levels = pd.factorize(df[cat][keep], sort=True)
+        k = len(levels)
+        if k < 2:
+            continue
+        values = df.loc[keep, num_cols].to_numpy(dtype=float)
+
+        test = method
+        if method == 'auto':
+            test = 'welch' if k == 2 else 'anova'
+        elif method == 'nonparametric':
+            test = 'mannwhitney' if k == 2 else 'kruskal'
+        if test in TWO_GROUP_TESTS and k != 2:
+            test = 'anova' if test != 'mannwhitney' else 'kruskal'
+
+        if test in ('mannwhitney', 'kruskal'):
+            # Rank each column once (ties averaged); the H statistic with ties is
+            # (N - 1) * SSB / SST computed on the ranks
+            ranks = pd.DataFrame(values).rank().to_numpy()
+            counts, sums, sumsq = _group_moments(ranks, codes, k)
+            N = counts.sum(axis=0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                mean_rank = (N + 1) / 2
+                sst = sumsq.sum(axis=0) - N * mean_rank ** 2
+                ssb = np.nansum(sums ** 2 / np.where(counts > 0, counts, np.nan), axis=0) - N * mean_rank ** 2
+                if test == 'kruskal':
+                    stat = (N - 1) * ssb / sst
+                    dof = (counts > 0).sum(axis=0) - 1
+                    p = stats.chi2.sf(stat, dof)
+                else:
+                    n1, n2 = counts[0], counts[1]
+                    U = sums[0] - n1 * (n1 + 1) / 2
+                    # Tie term sum(t^3 - t) recovered from the rank variance
+                    ties = (N ** 3 - N) - 12 * sst
+                    sigma = np.sqrt(n1 * n2 / 12 * ((N + 1) - ties / (N * (N - 1))))
+                    z = (np.abs(U - n1 * n2 / 2) - 0.5) / sigma
+                    stat, dof = U, np.full_like(U, np.nan)
+                    p = np.minimum(1.0, 2 * stats.norm.sf(z))
+        else:
+            counts, sums, sumsq = _group_moments(values, codes, k)
+            if test == 'anova':
+                stat, df_b, df_w = _one_way(counts, sums, sumsq)
+                dof = df_b
+                p = stats.f.sf(stat, df_b, df_w)
+            else:
+                n1, n2 = counts[0], counts[1]
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    m1, m2 = sums[0] / n1, sums[1] / n2
+                    v1 = (sumsq[0] - n1 * m1 ** 2) / (n1 - 1)
+                    v2 = (sumsq[1] - n2 * m2 ** 2) / (n2 - 1)
+                    if test == 'welch':
+                        se2 = v1 / n1 + v2 / n2
+                        dof = se2 ** 2 / ((v1 / n1) ** 2 / (n1 - 1) + (v2 / n2) ** 2 / (n2 - 1))
+                    else:
+                        dof = n1 + n2 - 2
+                        se2 = ((n1 - 1) * v1 + (n2 - 1) * v2) / dof * (1 / n1 + 1 / n2)
+                    stat = (m1 - m2) / np.sqrt(se2)
+                p = 2 * stats.t.sf(np.abs(stat), dof)
+
+        for j, num in enumerate(num_cols):
+            rows.append({
+                "group_col": cat,
+                "value_col": num,
+                "test": test,
+                "k": int(k),
+                "n": int(counts[:, j].sum()),
+                "statistic": float(stat[j]),
+                "dof": None if np.isnan(dof[j]) else float(dof[j]),
+                "p_value": float(p[j])
+            })
+
+    valid = [i for i, r in enumerate(rows) if not np.isnan(r["p_value"])]
+    adjusted = np.full(len(rows), np.nan)
+    if valid:
+        pvals = np.array([rows[i]["p_value"] for i in valid])
+        if CORRECTIONS[correction] is None:
+            adjusted[valid] = pvals
+        else:
+            adjusted[valid] = multitest.multipletests(pvals, alpha=alpha, method=CORRECTIONS[correction])[1]
+
+    for i, r in enumerate(rows):
+        # NaN is not valid JSON; degenerate pairs are reported with null statistics
+        for key in ("statistic", "p_value"):
+            if np.isnan(r[key]):
+                r[key] = None
+        r["p_adjusted"] = None if np.isnan(adjusted[i]) else float(adjusted[i])
+        r["significant"] = r["p_adjusted"] is not None and r["p_adjusted"] < alpha
+
+    rows.sort(key=lambda r: (r["p_adjusted"] is None, r["p_adjusted"] or 0.0))
+    return rows
@@ -0,0 +1,91 @@
+import numpy as np
+
+from backend.utils.lazy import lazy_import
+
+sparse = lazy_import("scipy.sparse")
+
+def _xlogx(counts):
+    """Elementwise c * log2(c), with 0 for empty cells."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(counts > 0, counts * np.log2(np.where(counts > 0, counts, 1)), 0.0)
+
+def joint_counts(codes, weights, n_levels):
+    """
+    Counts of every pair of levels across all columns at once: the Gram matrix of the
+    one-hot encoding (missing codes, -1, encode as all zeros). codes is (cells x columns),
+    weights the count of each cell (all ones for raw rows). The encoding is sparse, one
+    entry per present value, so the cost scales with cells x columns rather than with the
+    total number of levels. Returns the (L x L) matrix, L = sum(n_levels).
+    """
+    n_levels = np.asarray(n_levels)
+    offsets = np.concatenate([[0], np.cumsum(n_levels)[:-1]]).astype(np.int64)
+    L = int(n_levels.sum())
+    rows, cols = np.nonzero(codes >= 0)
+    index = (rows, offsets[cols] + codes[rows, cols])
+    onehot = sparse.csr_matrix((np.ones(len(rows)), index), shape=(len(codes), L))
+    weighted = sparse.csr_matrix((np.asarray(weights, dtype=float)[rows], index), shape=(len(codes), L))
+    return (weighted.T @ onehot).toarray()
+
+def information_matrices(codes, weights, n_levels):
+    """
+    Entropy of every column plus pairwise mutual information, normalized MI (MI divided by
+    the geometric mean of the two entropies) and conditional entropy H(row | column), in bits.
+    Everything is derived from one joint_counts pass: block sums of c*log(c) over the
+    level-pair matrix give every joint and marginal entropy. Pairs use the rows where both
+    columns are present.
+    """
+    return information_from_joint(joint_counts(codes, np.asarray(weights, dtype=float), n_levels), n_levels)
+
+def information_from_joint(C, n_levels):
+    """information_matrices from an already built joint_counts matrix C."""
+    n_levels = np.asarray(n_levels)
+    starts = np.concatenate([[0], np.cumsum(n_levels)[:-1]])
+    C = np.asarray(C, dtype=float)
+
+    # Collapse the level-pair matrix into column-pair blocks
+    N = np.add.reduceat(np.add.reduceat(C, starts, axis=0), starts, axis=1)
+    S = np.add.reduceat(np.add.reduceat(_xlogx(C), starts, axis=0), starts, axis=1)
+    # Counts of each level of the row column among rows where the other column is present
+    R = np.add.reduceat(C, starts, axis=1)
+    A = np.add.reduceat(_xlogx(R), starts, axis=0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_n = np.log2(np.where(N > 0, N, 1))
+        h_joint = log_n - S / N
+        h_row = log_n - A / N
+        mi = np.maximum(h_row + h_row.T - h_joint, 0.0)
+        entropy = np.diag(h_joint).copy()
+        nmi = mi / np.sqrt(np.outer(entropy, entropy))
+    np.fill_diagonal(nmi, np.where(entropy > 0, 1.0, np.nan))
+
+    return {
+        "entropy": entropy,
+        "n": np.diag(N).astype(np.int64),
+        "pair_n": N.astype(np.int64),
+        "mutual_information": np.where(N > 0, mi, np.nan),
+        "normalized_mi": np.where(N > 0, nmi, np.nan),
+        "conditional_entropy": np.where(N > 0, h_row - mi, np.nan)
+    }
+
+def cube_information(cube, cols=None):
+    """information_matrices over columns of a ContingencyCube (numerics use its bins), from its pair counts."""
+    cols = list(cols) if cols else cube.names
+    idx = np.concatenate([np.arange(cube.span(c).start, cube.span(c).stop) for c in cols])
+    n_levels = [len(cube.levels[c]) for c in cols]
+    result = information_from_joint(cube.pair_counts[np.ix_(idx, idx)], n_levels)
+    result["cols"] = cols
+    return result
+
+def ranked_pairs(result, top=20):
+    """Column pairs ordered by normalized mutual information, strongest first."""
+    cols = result["cols"]
+    i, j = np.triu_indices(len(cols), k=1)
+    nmi = result["normalized_mi"][i, j]
+    order = np.argsort(-np.nan_to_num(nmi, nan=-1), kind='stable')[:top]
+    return [{
+        "a": cols[i[k]],
+        "b": cols[j[k]],
+        "mutual_information": float(result["mutual_information"][i[k], j[k]]),
+        "normalized_mi": float(nmi[k]),
+        "n": int(result["pair_n"][i[k], j[k]])
+    } for k in order if not np.isnan(nmi[k])]
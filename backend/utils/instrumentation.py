@@ -0,0 +1,216 @@
+import contextvars
+import cProfile
+import functools
+import inspect
+import io
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+
+from fastapi.routing import APIRoute
+
+try:
+    from pyinstrument import Profiler
+except ImportError:  # optional; cProfile is used instead
+    Profiler = None
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = tuple(256 * 4 ** i for i in range(10))
+
+# Per-request state: phase timings, whether profiling was requested, and the profile summary
+_request_state = contextvars.ContextVar("request_state", default=None)
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values)) + (extra or [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in pairs) + "}"
+
+class Counter:
+    def __init__(self, name, help_text, labelnames=()):
+        self.name, self.help, self.labelnames = name, help_text, tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels=(), amount=1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {value}")
+        return lines
+
+class Histogram:
+    def __init__(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name, self.help, self.labelnames = name, help_text, tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        with self._lock:
+            counts, total = self._series.get(labels, ([0] * len(self.buckets), [0.0, 0]))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            total[0] += value
+            total[1] += 1
+            self._series[labels] = (counts, total)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, (counts, (total, count)) in sorted(self._series.items()):
+                for bound, c in zip(self.buckets, counts):
+                    lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, [('le', bound)])} {c}")
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, [('le', '+Inf')])} {count}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {total}")
+                lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {count}")
+        return lines
+
+class GaugeFunction:
+    """Gauge whose samples are produced at scrape time by a callable returning {label_values: value}."""
+    def __init__(self, name, help_text, labelnames, collect, metric_type="gauge"):
+        self.name, self.help, self.labelnames = name, help_text, tuple(labelnames)
+        self.collect = collect
+        self.metric_type = metric_type
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.metric_type}"]
+        for labels, value in sorted(self.collect().items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {value}")
+        return lines
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics = []
+
+    def add(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+registry = MetricsRegistry()
+REQUEST_COUNT = registry.add(Counter(
+    "http_requests_total", "HTTP requests by route, method and status.", ("route", "method", "status")))
+REQUEST_LATENCY = registry.add(Histogram(
+    "http_request_duration_seconds", "End-to-end request latency.", ("route", "method")))
+PHASE_LATENCY = registry.add(Histogram(
+    "http_request_phase_seconds",
+    "Request time split into load (data selection), compute (endpoint body) and serialize "
+    "(response encoding plus framework overhead).", ("route", "phase")))
+RESPONSE_SIZE = registry.add(Histogram(
+    "http_response_size_bytes", "Response body size (when known from Content-Length).", ("route",),
+    buckets=SIZE_BUCKETS))
+
+@contextmanager
+def phase(name):
+    """Adds the time spent in the block to the current request's timing for phase `name`."""
+    state = _request_state.get()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if state is not None:
+            timings = state["timings"]
+            timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+
+def _profile_call(fn, args, kwargs):
+    """Runs fn under pyinstrument (if installed) or cProfile and returns (result, summary)."""
+    if Profiler is not None:
+        profiler = Profiler()
+        profiler.start()
+        try:
+            result = fn(*args, **kwargs)
+        finally:
+            profiler.stop()
+        return result, {"profiler": "pyinstrument", "text": profiler.output_text(unicode=False, color=False)}
+
+    profiler = cProfile.Profile()
+    result = profiler.runcall(fn, *args, **kwargs)
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(25)
+    return result, {"profiler": "cProfile", "text": out.getvalue()}
+
+def _with_profile(result, summary):
+    if isinstance(result, (dict, list)):
+        return {"result": result, "profile": summary}
+    return result
+
+class InstrumentedRoute(APIRoute):
+    """
+    APIRoute whose endpoint is timed as the 'compute' phase and, when the request asked
+    for it (?profile=1 or an X-Profile: 1 header), profiled in the thread that runs it.
+    Profiled JSON responses are wrapped as {"result": ..., "profile": {...}}.
+    """
+    def __init__(self, path, endpoint, **kwargs):
+        super().__init__(path, self._instrument(endpoint), **kwargs)
+
+    @staticmethod
+    def _instrument(endpoint):
+        if inspect.iscoroutinefunction(endpoint):
+            @functools.wraps(endpoint)
+            async def async_wrapper(*args, **kwargs):
+                with phase("compute"):
+                    return await endpoint(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            state = _request_state.get()
+            with phase("compute"):
+                if state is not None and state["profile"]:
+                    result, summary = _profile_call(endpoint, args, kwargs)
+                    return _with_profile(result, summary)
+                return endpoint(*args, **kwargs)
+        return wrapper
+
+def _profile_requested(request):
+    return request.query_params.get("profile") in ("1", "true") or request.headers.get("x-profile") in ("1", "true")
+
+async def metrics_middleware(request, call_next):
+    """Records per-route latency, phase split, status counts and response sizes."""
+    state = {"timings": {}, "profile": _profile_requested(request)}
+    token = _request_state.set(state)
+    start = time.perf_counter()
+    response = None
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        total = time.perf_counter() - start
+        _request_state.reset(token)
+        route = request.scope.get("route")
+        # Route templates keep label cardinality bounded; unmatched paths share one label
+        route_label = route.path if route is not None else "unmatched"
+        method = request.method
+
+        REQUEST_COUNT.inc((route_label, method, str(status)))
+        REQUEST_LATENCY.observe((route_label, method), total)
+
+        timings = state["timings"]
+        load = timings.get("load", 0.0)
+        compute = timings.get("compute", 0.0)
+        if route is not None:
+            PHASE_LATENCY.observe((route_label, "load"), load)
+            PHASE_LATENCY.observe((route_label, "compute"), max(compute - load, 0.0))
+            PHASE_LATENCY.observe((route_label, "serialize"), max(total - compute, 0.0))
+
+        if response is not None:
+            length = response.headers.get("content-length")
+            if length is not None:
+                RESPONSE_SIZE.observe((route_label,), int(length))
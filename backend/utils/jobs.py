@@ -0,0 +1,215 @@
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.utils.cache import LRUCache
+from backend.utils.result_store import default_store
+
+TERMINAL_STATES = ('completed', 'failed', 'cancelled', 'timed_out')
+
+class JobStopped(Exception):
+    """Raised inside a running job when it has been cancelled or has used up its time budget."""
+    def __init__(self, status):
+        super().__init__(status)
+        self.status = status
+
+class Job:
+    """
+    State of one submitted computation. Workers call report() to publish progress and
+    partial results; readers poll `version`, which increases on every change.
+    """
+    def __init__(self, kind, params, time_budget=None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.params = params
+        self.status = 'queued'
+        self.progress = 0.0
+        self.partial = None
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.time_budget = time_budget
+        self.version = 0
+        # Result store key of the completed result, when the job kind has one
+        self.result_key = None
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+
+    def _touch(self, **fields):
+        with self._lock:
+            for name, value in fields.items():
+                setattr(self, name, value)
+            self.version += 1
+
+    def report(self, progress, partial=None):
+        """Publishes progress (0-1) and an optional partial result; raises JobStopped if the job must stop."""
+        self._touch(progress=float(min(max(progress, 0.0), 1.0)),
+                    partial=partial if partial is not None else self.partial)
+        self.check()
+
+    def check(self):
+        if self._cancel.is_set():
+            raise JobStopped('cancelled')
+        if self.time_budget is not None and self.started is not None \
+                and time.time() - self.started > self.time_budget:
+            raise JobStopped('timed_out')
+
+    def cancel(self):
+        self._cancel.set()
+        if self.status == 'queued':
+            self._touch(status='cancelled', finished=time.time())
+
+    @property
+    def done(self):
+        return self.status in TERMINAL_STATES
+
+    def to_dict(self, include_result=True):
+        with self._lock:
+            state = {
+                "id": self.id,
+                "kind": self.kind,
+                "status": self.status,
+                "progress": self.progress,
+                "partial": self.partial,
+                "error": self.error,
+                "created": self.created,
+                "started": self.started,
+                "finished": self.finished,
+                "time_budget": self.time_budget,
+                "version": self.version
+            }
+            if include_result:
+                state["result"] = self.result
+            return state
+
+    def to_record(self):
+        """State kept in the result store once the job has finished; a keyed result is stored separately."""
+        record = self.to_dict(include_result=self.result_key is None or self.status != 'completed')
+        record["result_key"] = self.result_key
+        return record
+
+    @classmethod
+    def from_record(cls, record, result=None):
+        job = cls(record["kind"], None, record["time_budget"])
+        for name in ("id", "status", "progress", "partial", "error", "created", "started",
+                     "finished", "version", "result_key"):
+            setattr(job, name, record[name])
+        job.result = record["result"] if "result" in record else result
+        return job
+
+def _record_key(job_id):
+    return f"job:{job_id}"
+
+class JobManager:
+    """
+    Runs registered computations on an in-process worker pool.
+    Jobs wait in the executor's queue until a worker is free. Finished jobs are written to
+    the result store (state, and completed results under the key of the matching route), so
+    they survive restarts and are visible to every worker; a bounded LRU keeps recent ones.
+    """
+    def __init__(self, max_workers=2, keep=256, store=default_store):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._handlers = {}
+        self._result_keys = {}
+        self._active = {}
+        self._finished = LRUCache("job_results", maxsize=keep)
+        self._store = store
+        self._lock = threading.Lock()
+
+    def register(self, kind, handler, result_key=None):
+        """
+        handler(job, params) runs the computation, calling job.report() as it goes.
+        result_key(params), when given, is the result store key completed results are kept
+        under; a submission whose result is already stored completes immediately. A None
+        key (e.g. an unseeded random draw) means the result is neither looked up nor stored.
+        """
+        self._handlers[kind] = handler
+        if result_key is not None:
+            self._result_keys[kind] = result_key
+
+    @property
+    def kinds(self):
+        return sorted(self._handlers)
+
+    def submit(self, kind, params, time_budget=None):
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind '{kind}'")
+        job = Job(kind, params, time_budget)
+        store = self._store()
+        if kind in self._result_keys:
+            job.result_key = self._result_keys[kind](params)
+            missing = object()
+            stored = missing
+            if store is not None and job.result_key is not None:
+                stored = store.try_get(job.result_key, missing)
+            if stored is not missing:
+                now = time.time()
+                job._touch(status='completed', progress=1.0, result=stored, started=now, finished=now)
+                self._retire(job, computed=False)
+                return job
+        with self._lock:
+            self._active[job.id] = job
+        self._executor.submit(self._run, job)
+        return job
+
+    def _run(self, job):
+        if job.status == 'cancelled':
+            self._retire(job)
+            return
+        job._touch(status='running', started=time.time())
+        try:
+            job.check()
+            result = self._handlers[job.kind](job, job.params)
+            job._touch(status='completed', progress=1.0, result=result, finished=time.time())
+        except JobStopped as stop:
+            # Keep whatever the job had published so far
+            job._touch(status=stop.status, result=job.partial, finished=time.time())
+        except Exception as e:
+            job._touch(status='failed', error=f"{type(e).__name__}: {e}",
+                       finished=time.time())
+            traceback.print_exc()
+        self._retire(job)
+
+    def _retire(self, job, computed=True):
+        with self._lock:
+            self._active.pop(job.id, None)
+        self._finished.set(job.id, job)
+        store = self._store()
+        if store is not None:
+            if computed and job.status == 'completed' and job.result_key is not None:
+                store.try_set(job.result_key, job.result, operation=f"job.{job.kind}")
+            store.try_set(_record_key(job.id), job.to_record(), operation="job")
+
+    def get(self, job_id):
+        """A job of this process, or a finished one read back from the result store."""
+        with self._lock:
+            job = self._active.get(job_id)
+        job = job or self._finished.get(job_id)
+        store = self._store()
+        if job is not None or store is None:
+            return job
+        record = store.try_get(_record_key(job_id))
+        if record is None:
+            return None
+        result = store.try_get(record["result_key"]) if record["result_key"] is not None else None
+        return Job.from_record(record, result)
+
+    def cancel(self, job_id):
+        job = self.get(job_id)
+        if job is not None and not job.done:
+            job.cancel()
+        return job
+
+    def active_jobs(self):
+        with self._lock:
+            active = list(self._active.values())
+        return active
+
+    def queue_depth(self):
+        """Number of submitted jobs that have not started yet."""
+        with self._lock:
+            return sum(1 for job in self._active.values() if job.status == 'queued')
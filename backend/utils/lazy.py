@@ -0,0 +1,76 @@
+import importlib
+import importlib.util
+import threading
+import time
+import types
+
+# Every proxy created by lazy_import, keyed by module name
+_registry = {}
+_lock = threading.Lock()
+
+class LazyModule(types.ModuleType):
+    """
+    Stand-in for a module that is imported on first attribute access, so heavy libraries
+    (scipy.stats, statsmodels, sklearn) cost nothing until an endpoint actually uses them.
+    """
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__["_lazy_module"] = None
+        self.__dict__["_lazy_info"] = {"loaded": False, "load_seconds": None, "loaded_by": None}
+        self.__dict__["_lazy_lock"] = threading.Lock()
+
+    def _load(self, reason="first use"):
+        module = self.__dict__["_lazy_module"]
+        if module is not None:
+            return module
+        info = self.__dict__["_lazy_info"]
+        # Only the first caller records the import; concurrent callers wait for it
+        with self.__dict__["_lazy_lock"]:
+            module = self.__dict__["_lazy_module"]
+            if module is None:
+                start = time.perf_counter()
+                module = importlib.import_module(self.__name__)
+                # Near zero when another library already pulled the module in
+                info.update(loaded=True, load_seconds=time.perf_counter() - start, loaded_by=reason)
+                self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__["_lazy_module"] is not None else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+def lazy_import(name):
+    """Returns a proxy for module `name` (one shared proxy per name)."""
+    with _lock:
+        proxy = _registry.get(name)
+        if proxy is None:
+            proxy = _registry[name] = LazyModule(name)
+    return proxy
+
+def available(name):
+    """Whether module `name`'s package is installed, checked without importing it."""
+    return importlib.util.find_spec(name.partition(".")[0]) is not None
+
+def preload(names=None):
+    """
+    Imports the given lazy modules (all registered ones by default), e.g. from a background
+    thread. Optional packages that aren't installed are skipped.
+    """
+    for name in names or list(_registry):
+        if available(name):
+            lazy_import(name)._load(reason="preload")
+
+def preload_in_background(names=None):
+    thread = threading.Thread(target=preload, args=(names,), name="lazy-preload", daemon=True)
+    thread.start()
+    return thread
+
+def lazy_status():
+    """Load state and import time of every lazy module, keyed by module name."""
+    return {name: dict(proxy.__dict__["_lazy_info"]) for name, proxy in sorted(_registry.items())}
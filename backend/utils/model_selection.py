@@ -0,0 +1,178 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from backend.utils.stat_utils import encode_binary_target
+from backend.utils.lazy import lazy_import
+
+stats = lazy_import("scipy.stats")
+sm = lazy_import("statsmodels.api")
+
+METRICS = {
+    'OLS': ['rmse', 'mae', 'r_squared'],
+    'Logit': ['auc', 'log_loss', 'accuracy'],
+}
+
+# Metric used to rank candidates, and whether lower is better
+PRIMARY_METRIC = {
+    'OLS': ('rmse', True),
+    'Logit': ('log_loss', True),
+}
+
+@lru_cache(maxsize=32)
+def make_folds(n_rows, k=5, repeats=1, seed=0):
+    """
+    Assigns every row of the dataset to one of k folds, once per repeat.
+    Returns a read-only (repeats, n_rows) array of fold ids.
+    Computed once per (n_rows, k, repeats, seed) and shared by every candidate model,
+    so all predictor sets are scored on exactly the same partitions.
+    """
+    if k < 2 or k > n_rows:
+        raise ValueError(f"k must be between 2 and the number of rows ({n_rows})")
+    if repeats < 1:
+        raise ValueError("repeats must be at least 1")
+
+    rng = np.random.default_rng(seed)
+    base = np.arange(n_rows) % k
+    folds = np.vstack([rng.permutation(base) for _ in range(repeats)])
+    folds.setflags(write=False)
+    return folds
+
+def roc_auc(y_true, scores):
+    """Area under the ROC curve via the Mann-Whitney rank formula (ties averaged)."""
+    y_true = np.asarray(y_true, dtype=bool)
+    n_pos = y_true.sum()
+    n_neg = y_true.size - n_pos
+    if n_pos == 0 or n_neg == 0:
+        return np.nan
+    ranks = stats.rankdata(scores)
+    return (ranks[y_true].sum() - n_pos * (n_pos + 1) / 2) / (n_pos * n_neg)
+
+def log_loss(y_true, probs, eps=1e-15):
+    """Mean binary cross-entropy."""
+    probs = np.clip(probs, eps, 1 - eps)
+    return float(-np.mean(y_true * np.log(probs) + (1 - y_true) * np.log(1 - probs)))
+
+def _score_fold(model_type, X_train, y_train, X_test, y_test):
+    """Fits one fold and returns its out-of-sample metrics."""
+    if model_type == 'OLS':
+        params = sm.OLS(y_train, X_train).fit().params
+        pred = X_test @ params
+        resid = y_test - pred
+        ss_tot = np.sum((y_test - y_test.mean()) ** 2)
+        return {
+            'rmse': float(np.sqrt(np.mean(resid ** 2))),
+            'mae': float(np.mean(np.abs(resid))),
+            'r_squared': float(1 - np.sum(resid ** 2) / ss_tot) if ss_tot > 0 else np.nan,
+        }
+
+    params = sm.Logit(y_train, X_train).fit(disp=0).params
+    probs = 1 / (1 + np.exp(-(X_test @ params)))
+    return {
+        'auc': float(roc_auc(y_test, probs)),
+        'log_loss': log_loss(y_test, probs),
+        'accuracy': float(np.mean((probs >= 0.5) == y_test)),
+    }
+
+def _summarize(values):
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        return {'mean': None, 'std': None, 'min': None, 'max': None}
+    return {
+        'mean': float(values.mean()),
+        'std': float(values.std(ddof=1)) if values.size > 1 else 0.0,
+        'min': float(values.min()),
+        'max': float(values.max()),
+    }
+
+def cross_validate_models(df, target_col, candidates, model_type='OLS', k=5, repeats=1,
+                          seed=0, positive_label='Yes', n_jobs=None, progress=None):
+    """
+    Repeated k-fold cross-validation of several predictor sets for the same target.
+    Fold ids are assigned once over the full dataset and reused by every candidate;
+    each candidate then drops its own incomplete rows. All (candidate, repeat, fold)
+    fits run in a thread pool.
+    Returns one result dict per candidate, ranked by the primary out-of-sample metric.
+    progress, if given, is called as progress(fraction_done) as folds complete.
+    """
+    if model_type not in METRICS:
+        raise ValueError(f"Unsupported model_type '{model_type}'")
+
+    folds = make_folds(len(df), k, repeats, seed)
+    target = df[target_col]
+    if model_type == 'Logit':
+        target = encode_binary_target(target, positive_label)
+
+    # Build every design matrix up front so worker threads only touch numpy arrays
+    designs = []
+    for predictors in candidates:
+        data = pd.concat([target.rename('__target__'), df[predictors]], axis=1)
+        mask = data.notna().all(axis=1).to_numpy()
+        complete = data[mask]
+        X = np.column_stack([np.ones(len(complete)), complete[predictors].to_numpy(dtype=float)])
+        y = complete['__target__'].to_numpy(dtype=float)
+        designs.append((list(predictors), X, y, folds[:, mask]))
+
+    tasks = []
+    for c, (_, X, y, cand_folds) in enumerate(designs):
+        for r in range(repeats):
+            for f in range(k):
+                test = cand_folds[r] == f
+                tasks.append((c, r, f, X[~test], y[~test], X[test], y[test]))
+
+    def run(task):
+        c, r, f, X_train, y_train, X_test, y_test = task
+        try:
+            scores = _score_fold(model_type, X_train, y_train, X_test, y_test)
+        except Exception:
+            # Singular designs or perfect separation in a fold
+            scores = None
+        return c, r, f, scores
+
+    if n_jobs is None:
+        n_jobs = min(32, os.cpu_count() or 1)
+    pool = ThreadPoolExecutor(max_workers=max(1, n_jobs))
+    try:
+        futures = [pool.submit(run, task) for task in tasks]
+        outcomes = []
+        for done, future in enumerate(as_completed(futures), 1):
+            outcomes.append(future.result())
+            if progress is not None:
+                progress(done / len(futures))
+    finally:
+        # Drop queued folds if the caller stopped us early (e.g. a cancelled job)
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    per_candidate = [[] for _ in candidates]
+    failed = [0] * len(candidates)
+    for c, r, f, scores in outcomes:
+        if scores is None:
+            failed[c] += 1
+        else:
+            # NaN is not valid JSON; undefined fold metrics are reported as null
+            scores = {m: (None if np.isnan(v) else v) for m, v in scores.items()}
+            per_candidate[c].append({'repeat': r, 'fold': f, **scores})
+
+    results = []
+    for c, (predictors, X, _, _) in enumerate(designs):
+        fold_scores = per_candidate[c]
+        results.append({
+            'predictors': predictors,
+            'n': int(X.shape[0]),
+            'n_folds_failed': failed[c],
+            'metrics': {m: _summarize([s[m] for s in fold_scores]) for m in METRICS[model_type]},
+            'folds': fold_scores,
+        })
+
+    metric, lower_is_better = PRIMARY_METRIC[model_type]
+    missing = np.inf if lower_is_better else -np.inf
+    results.sort(key=lambda res: res['metrics'][metric]['mean'] if res['metrics'][metric]['mean'] is not None else missing,
+                 reverse=not lower_is_better)
+    for rank, res in enumerate(results, 1):
+        res['rank'] = rank
+
+    return results
@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+
+from backend.utils.cache import LRUCache, dataset_version, readonly
+from backend.utils.data_loader import INTEGER_COLUMNS
+
+# Tukey fences: values beyond OUTLIER_IQR interquartile ranges outside [Q1, Q3]
+OUTLIER_IQR = 1.5
+
+_profile_cache = LRUCache("profile", maxsize=4)
+
+def _float(value):
+    return float(value) if np.isfinite(value) else None
+
+def _sorted_quantiles(sorted_block, counts, q):
+    """Linear-interpolated quantile q of each column of a column-sorted block (NaNs last)."""
+    pos = np.maximum(counts - 1, 0) * q
+    lo = np.floor(pos).astype(np.int64)
+    hi = np.minimum(lo + 1, np.maximum(counts - 1, 0))
+    a = np.take_along_axis(sorted_block, lo[None, :], axis=0)[0]
+    b = np.take_along_axis(sorted_block, hi[None, :], axis=0)[0]
+    return np.where(counts > 0, a + (b - a) * (pos - lo), np.nan)
+
+def _numeric_column(col, dtype, missing, coerced, distinct, low, high, q1, q3, outliers, fractional):
+    non_integer = int(fractional) if col in INTEGER_COLUMNS else 0
+    return {
+        "kind": "numeric",
+        "dtype": dtype,
+        "missing": int(missing),
+        "coerced": coerced,
+        "distinct": int(distinct),
+        "min": _float(low),
+        "max": _float(high),
+        "q1": _float(q1),
+        "q3": _float(q3),
+        "outliers": int(outliers),
+        "non_integer": non_integer,
+        "type_violations": (coerced or 0) + non_integer
+    }
+
+def _categorical_column(dtype, n_rows, levels):
+    # Distinct levels are few, so type checks run on them rather than on every row
+    numeric_like = int(levels[pd.to_numeric(levels.index.astype(str), errors='coerce').notna()].sum())
+    return {
+        "kind": "categorical",
+        "dtype": dtype,
+        "missing": int(n_rows - levels.sum()),
+        "coerced": 0,
+        "distinct": int(len(levels)),
+        "numeric_like": numeric_like,
+        "type_violations": numeric_like
+    }
+
+def _counts_quantile(values, cumulative, q):
+    """Linear-interpolated quantile q of the data that sorted distinct values/cumulative counts describe."""
+    pos = (cumulative[-1] - 1) * q
+    lo = int(np.floor(pos))
+    a, b = values[np.searchsorted(cumulative, [lo, min(lo + 1, cumulative[-1] - 1)], side='right')]
+    return a + (b - a) * (pos - lo)
+
+class DatasetProfile:
+    """
+    Data-quality profile of a DataFrame: per-column missing, coerced (unparseable values that
+    load_data turned into NaN), distinct, min/max, outlier and type-violation counts. All
+    numeric columns are profiled together from one column-wise sort of a single float block.
+    A packed bitmask of missing cells is kept so the rows any set of columns leaves for
+    analysis (effective_n) is a bitwise OR away.
+    """
+    def __init__(self, df):
+        self.n_rows = len(df)
+        self.names = list(df.columns)
+        coerced = df.attrs.get("coerced")
+        missing = df.isna().to_numpy()
+        self.missing_bits = readonly(np.packbits(missing, axis=0))
+        self.complete_rows = int(self.n_rows - missing.any(axis=1).sum()) if self.names else self.n_rows
+        self.columns = {}
+
+        numeric = [c for c in self.names
+                   if pd.api.types.is_numeric_dtype(df[c]) and not pd.api.types.is_bool_dtype(df[c])]
+        if numeric:
+            X = df[numeric].to_numpy(dtype=float)
+            present = ~np.isnan(X)
+            counts = present.sum(axis=0)
+            S = np.sort(X, axis=0)
+            distinct = ((np.diff(S, axis=0) != 0) & ~np.isnan(S[1:])).sum(axis=0) + (counts > 0)
+            q1, q3 = _sorted_quantiles(S, counts, 0.25), _sorted_quantiles(S, counts, 0.75)
+            low, high = _sorted_quantiles(S, counts, 0.0), _sorted_quantiles(S, counts, 1.0)
+            iqr = q3 - q1
+            with np.errstate(invalid='ignore'):
+                outliers = ((X < q1 - OUTLIER_IQR * iqr) | (X > q3 + OUTLIER_IQR * iqr)).sum(axis=0)
+                fractional = (present & (X != np.round(X))).sum(axis=0)
+            for j, col in enumerate(numeric):
+                n_coerced = coerced.get(col, 0) if coerced is not None else None
+                self.columns[col] = _numeric_column(
+                    col, str(df[col].dtype), self.n_rows - counts[j], n_coerced, distinct[j],
+                    low[j], high[j], q1[j], q3[j], outliers[j], fractional[j])
+
+        for col in self.names:
+            if col not in self.columns:
+                self.columns[col] = _categorical_column(str(df[col].dtype), self.n_rows, df[col].value_counts())
+        self.columns = {col: self.columns[col] for col in self.names}
+
+    def effective_n(self, cols):
+        """Rows with no missing value in any of cols."""
+        if not cols:
+            return self.n_rows
+        idx = [self.names.index(c) for c in cols]
+        any_missing = np.bitwise_or.reduce(self.missing_bits[:, idx], axis=1)
+        return int(self.n_rows - np.unpackbits(any_missing, count=self.n_rows).sum())
+
+    def to_dict(self):
+        return {"n_rows": self.n_rows, "complete_rows": self.complete_rows, "columns": self.columns}
+
+def profile_from_counts(n_rows, complete_rows, columns):
+    """
+    The DatasetProfile dict built from per-column value counts rather than rows, for data
+    that is only ever seen in chunks. columns maps each name, in order, to
+    (dtype, value_counts, numeric, coerced); quantiles and outliers are exact.
+    """
+    profile = {}
+    for col, (dtype, levels, numeric, coerced) in columns.items():
+        if not numeric:
+            profile[col] = _categorical_column(dtype, n_rows, levels)
+            continue
+        values = levels.index.to_numpy(dtype=float)
+        counts = levels.to_numpy()
+        if not len(values):
+            profile[col] = _numeric_column(col, dtype, n_rows, coerced, 0, np.nan, np.nan, np.nan, np.nan, 0, 0)
+            continue
+        order = np.argsort(values)
+        values, counts = values[order], counts[order]
+        cumulative = np.cumsum(counts)
+        q1, q3 = _counts_quantile(values, cumulative, 0.25), _counts_quantile(values, cumulative, 0.75)
+        iqr = q3 - q1
+        outliers = counts[(values < q1 - OUTLIER_IQR * iqr) | (values > q3 + OUTLIER_IQR * iqr)].sum()
+        fractional = counts[values != np.round(values)].sum()
+        profile[col] = _numeric_column(col, dtype, n_rows - cumulative[-1], coerced, len(values),
+                                       values[0], values[-1], q1, q3, outliers, fractional)
+    return {"n_rows": int(n_rows), "complete_rows": int(complete_rows), "columns": profile}
+
+def profile_for(df):
+    """The DatasetProfile of an in-memory DataFrame, built once per dataset version."""
+    return _profile_cache.get_or_compute(dataset_version(df), lambda: DatasetProfile(df))
@@ -0,0 +1,220 @@
+from math import comb
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from backend.utils.lazy import lazy_import
+
+stats = lazy_import("scipy.stats")
+
+PERMUTATION_STATISTICS = ('mean_diff', 'median_diff', 'f_stat', 'chi_square')
+
+# Upper bound on the size of one (block x n) permutation matrix
+MAX_BLOCK_ELEMENTS = 5_000_000
+
+def _group_layout(labels):
+    """Stable sort order that makes each group contiguous, plus group names, sizes and start offsets."""
+    codes, names = pd.factorize(labels, sort=True)
+    order = np.argsort(codes, kind='stable')
+    sizes = np.bincount(codes, minlength=len(names))
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    return order, list(names), sizes, starts
+
+def _make_statistic(statistic, values, sizes, starts):
+    """
+    Returns a function mapping a (B, n) matrix of permuted values (groups occupy fixed
+    contiguous column ranges) to the B test statistics, computed as batched array ops.
+    """
+    n = values.shape[0]
+    n0 = sizes[0]
+
+    if statistic == 'mean_diff':
+        total = values.sum()
+        def stat(V):
+            s0 = V[:, :n0].sum(axis=1)
+            return s0 / n0 - (total - s0) / (n - n0)
+        return stat
+
+    if statistic == 'median_diff':
+        def stat(V):
+            return np.median(V[:, :n0], axis=1) - np.median(V[:, n0:], axis=1)
+        return stat
+
+    if statistic == 'f_stat':
+        k = len(sizes)
+        total = values.sum()
+        # Total sum of squares is invariant under relabelling; only the between-group part changes
+        sst = np.sum((values - total / n) ** 2)
+        def stat(V):
+            group_sums = np.add.reduceat(V, starts, axis=1)
+            ssb = np.sum(group_sums ** 2 / sizes, axis=1) - total ** 2 / n
+            ssw = np.maximum(sst - ssb, 1e-300)
+            return (ssb / (k - 1)) / (ssw / (n - k))
+        return stat
+
+    if statistic == 'chi_square':
+        k = len(sizes)
+        n_cats = int(values.max()) + 1
+        group_of_pos = np.repeat(np.arange(k), sizes)
+        # Row and column margins are fixed under permutation, so expected counts are too
+        expected = np.outer(sizes, np.bincount(values, minlength=n_cats)) / n
+        expected = np.where(expected > 0, expected, np.nan)
+        def stat(V):
+            B = V.shape[0]
+            cell = (np.arange(B)[:, None] * k + group_of_pos[None, :]) * n_cats + V
+            observed = np.bincount(cell.ravel(), minlength=B * k * n_cats).reshape(B, k, n_cats)
+            return np.nansum((observed - expected) ** 2 / expected, axis=(1, 2))
+        return stat
+
+    raise ValueError(f"Unsupported statistic '{statistic}'")
+
+def _clopper_pearson(count, m, confidence):
+    tail = (1 - confidence) / 2
+    lower = stats.beta.ppf(tail, count, m - count + 1) if count > 0 else 0.0
+    upper = stats.beta.ppf(1 - tail, count + 1, m - count) if count < m else 1.0
+    return float(lower), float(upper)
+
+def bootstrap_means(data, n_sim, seed=None, block_size=1_000):
+    """Yields bootstrap resample means in vectorized blocks (one (block x n) index draw per block)."""
+    data = np.asarray(data, dtype=float)
+    n = data.shape[0]
+    rng = np.random.default_rng(seed)
+    block = max(1, min(block_size, MAX_BLOCK_ELEMENTS // max(n, 1)))
+    done = 0
+    while done < n_sim:
+        b = min(block, n_sim - done)
+        yield data[rng.integers(0, n, size=(b, n))].mean(axis=1)
+        done += b
+
+def permutation_test(values, labels, statistic='mean_diff', n_resamples=10_000, alternative='two-sided',
+                     alpha=0.05, confidence=0.99, block_size=1_000, exact_threshold=20_000, seed=0,
+                     progress=None):
+    """
+    Permutation test of a group effect on values.
+    Statistics: 'mean_diff' / 'median_diff' (two groups, first minus second in sorted order),
+    'f_stat' (one-way ANOVA F, k groups) and 'chi_square' (values treated as categories).
+
+    Two-group problems with at most exact_threshold distinct relabellings are enumerated
+    exactly. Otherwise permutations are drawn in blocks of block_size; after each block a
+    Clopper-Pearson interval (at `confidence`) around the reported add-one p-value,
+    (count + 1) / (m + 1), is checked and sampling stops early once it lies entirely above or
+    below alpha. F and chi-square are one-sided, so their response reports alternative 'greater'.
+    progress, if given, is called as progress(fraction_done, partial) after every block.
+    """
+    values = np.asarray(values)
+    labels = np.asarray(labels)
+    if statistic not in PERMUTATION_STATISTICS:
+        raise ValueError(f"Unsupported statistic '{statistic}'")
+    if alternative not in ('two-sided', 'greater', 'less'):
+        raise ValueError(f"Unsupported alternative '{alternative}'")
+    if n_resamples < 1:
+        raise ValueError("n_resamples must be at least 1")
+
+    order, groups, sizes, starts = _group_layout(labels)
+    if len(groups) < 2:
+        raise ValueError("At least 2 groups are required")
+    if statistic in ('mean_diff', 'median_diff') and len(groups) != 2:
+        raise ValueError(f"'{statistic}' requires exactly 2 groups; use 'f_stat' for k groups")
+    if statistic == 'f_stat' and len(values) <= len(groups):
+        # The within-group degrees of freedom (n - k) would be zero
+        raise ValueError("'f_stat' needs more observations than groups")
+
+    values = values[order]
+    if statistic == 'chi_square':
+        values, _ = pd.factorize(values, sort=True)
+    else:
+        values = values.astype(float)
+    n = values.shape[0]
+
+    stat_fn = _make_statistic(statistic, values, sizes, starts)
+    observed = float(stat_fn(values[None, :])[0])
+
+    # F and chi-square are inherently one-sided; differences honour `alternative`
+    if statistic in ('f_stat', 'chi_square'):
+        alternative = 'greater'
+    if alternative == 'greater':
+        extremeness = lambda s: s
+    elif alternative == 'less':
+        extremeness = lambda s: -s
+    else:
+        extremeness = np.abs
+    threshold = extremeness(np.array([observed]))[0]
+    tol = 1e-9 * max(1.0, abs(threshold))
+
+    n_relabellings = comb(n, int(sizes[0])) if len(groups) == 2 else None
+    exact = n_relabellings is not None and n_relabellings <= exact_threshold
+    rng = np.random.default_rng(seed)
+    block = max(1, min(block_size, MAX_BLOCK_ELEMENTS // max(n, 1)))
+
+    null_stats = []
+    count = 0
+    m = 0
+    stopped_early = False
+
+    if exact:
+        combo_iter = combinations(range(n), int(sizes[0]))
+        while True:
+            chunk = [c for _, c in zip(range(block), combo_iter)]
+            if not chunk:
+                break
+            in_first = np.zeros((len(chunk), n), dtype=bool)
+            in_first[np.repeat(np.arange(len(chunk)), sizes[0]), np.concatenate(chunk)] = True
+            # Stable argsort of ~mask puts the chosen positions first, the rest after
+            perms = np.argsort(~in_first, axis=1, kind='stable')
+            s = stat_fn(values[perms])
+            null_stats.append(s)
+            count += int(np.sum(extremeness(s) >= threshold - tol))
+            m += len(chunk)
+            if progress is not None:
+                progress(m / n_relabellings, {'n_resamples': m, 'p_value': count / m})
+        p_value = count / m
+        p_ci = (p_value, p_value)
+    else:
+        base = np.tile(np.arange(n), (block, 1))
+        while m < n_resamples:
+            b = min(block, n_resamples - m)
+            perms = rng.permuted(base[:b], axis=1)
+            s = stat_fn(values[perms])
+            null_stats.append(s)
+            count += int(np.sum(extremeness(s) >= threshold - tol))
+            m += b
+            # Add-one estimate keeps Monte Carlo p-values strictly positive; the interval is
+            # built on the same estimate, so it always contains the p-value reported
+            p_value = (count + 1) / (m + 1)
+            p_ci = _clopper_pearson(count + 1, m + 1, confidence)
+            if progress is not None:
+                progress(m / n_resamples, {'n_resamples': m, 'p_value': p_value, 'p_value_ci': list(p_ci)})
+            if m < n_resamples and (p_ci[1] < alpha or p_ci[0] > alpha):
+                stopped_early = True
+                break
+
+    if p_ci[1] < alpha:
+        decision = 'reject'
+    elif p_ci[0] >= alpha:
+        decision = 'fail_to_reject'
+    else:
+        decision = 'undecided'
+
+    null_stats = np.concatenate(null_stats)
+    hist, edges = np.histogram(null_stats, bins=30)
+
+    return {
+        'statistic': statistic,
+        'alternative': alternative,
+        'observed': observed,
+        'p_value': float(p_value),
+        'p_value_ci': [float(p_ci[0]), float(p_ci[1])],
+        'confidence': confidence,
+        'alpha': alpha,
+        'decision': decision,
+        'exact': bool(exact),
+        'n_resamples': int(m),
+        'stopped_early': stopped_early,
+        'groups': [str(g) for g in groups],
+        'group_sizes': sizes.tolist(),
+        'null_distribution': {
+            'x': ((edges[:-1] + edges[1:]) / 2).tolist(),
+            'y': hist.tolist()
+        }
+    }
@@ -0,0 +1,298 @@
+import base64
+import functools
+import hashlib
+import io
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel
+
+from backend.utils.cache import dataset_version
+
+logger = logging.getLogger(__name__)
+
+_PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+# Directory under the per-user cache ($XDG_CACHE_HOME, else ~/.cache) holding the default store
+CACHE_DIR_NAME = "social-media-addiction"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    operation TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    value BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed);
+"""
+
+_code_version = None
+
+def code_version():
+    """
+    Hash of the Python sources under backend/ and utils/, so stored results are never served
+    by a different version of the code that computed them.
+    """
+    global _code_version
+    if _code_version is None:
+        digest = hashlib.sha1()
+        for package in ("backend", "utils"):
+            root = os.path.join(_PROJECT_DIR, package)
+            for dirpath, dirnames, filenames in os.walk(root):
+                dirnames[:] = sorted(d for d in dirnames if d != "__pycache__")
+                for name in sorted(f for f in filenames if f.endswith(".py")):
+                    path = os.path.join(dirpath, name)
+                    digest.update(os.path.relpath(path, _PROJECT_DIR).encode())
+                    with open(path, "rb") as f:
+                        digest.update(f.read())
+        _code_version = digest.hexdigest()[:16]
+    return _code_version
+
+def fingerprint(value):
+    """
+    JSON-serializable stand-in for an argument: data (DataFrames, Series, arrays) is replaced
+    by its content hash, pydantic models by their fields.
+    """
+    if isinstance(value, pd.DataFrame):
+        return {"dataframe": dataset_version(value)}
+    if isinstance(value, pd.Series):
+        return {"series": dataset_version(value), "name": str(value.name)}
+    if isinstance(value, np.ndarray):
+        return {"array": hashlib.sha1(np.ascontiguousarray(value).tobytes()).hexdigest()[:16],
+                "dtype": str(value.dtype), "shape": value.shape}
+    if isinstance(value, BaseModel):
+        return fingerprint(value.model_dump())
+    if isinstance(value, dict):
+        return {str(k): fingerprint(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [fingerprint(v) for v in value]
+    return value
+
+def result_key(operation, params, dataset=None):
+    """Key of a stored result: (dataset hash, operation, params, code version) as one digest."""
+    payload = json.dumps([dataset, operation, fingerprint(params), code_version()], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+def _encode(value):
+    """
+    JSON-compatible form of a result: plain values, lists, tuples, dicts and numeric arrays
+    (as .npy bytes written without pickle). Anything else raises TypeError and is not stored.
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, list):
+        return [_encode(v) for v in value]
+    if type(value) is tuple:
+        return {"__tuple__": [_encode(v) for v in value]}
+    if isinstance(value, dict):
+        return {"__dict__": [[_encode(k), _encode(v)] for k, v in value.items()]}
+    if isinstance(value, np.ndarray) and not value.dtype.hasobject:
+        buffer = io.BytesIO()
+        np.save(buffer, value, allow_pickle=False)
+        return {"__ndarray__": base64.b64encode(buffer.getvalue()).decode()}
+    raise TypeError(f"Can't store a {type(value).__name__} result")
+
+def _decode_object(obj):
+    if "__tuple__" in obj:
+        return tuple(obj["__tuple__"])
+    if "__dict__" in obj:
+        return {(tuple(k) if isinstance(k, list) else k): v for k, v in obj["__dict__"]}
+    if "__ndarray__" in obj:
+        return np.load(io.BytesIO(base64.b64decode(obj["__ndarray__"])), allow_pickle=False)
+    raise ValueError("Unknown stored object")
+
+def dumps(value):
+    return json.dumps(_encode(value), separators=(",", ":")).encode()
+
+def loads(blob):
+    """Decodes a stored result; reading an entry never runs code (no pickle)."""
+    return json.loads(blob, object_hook=_decode_object)
+
+class ResultStore:
+    """
+    Results in a SQLite file, shared by every process pointing at the same path and kept
+    across restarts. WAL mode lets workers read while another one writes. Values are stored
+    as JSON (arrays as .npy without pickle), so write access to the file can't be turned into
+    code execution; results of other types are recomputed instead of stored. When the stored
+    values exceed max_bytes, the least recently used entries are evicted.
+    """
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._connect().executescript(_SCHEMA)
+        # Running size of the stored values: this process's writes are added as they happen,
+        # other workers' are picked up whenever it is recounted before evicting
+        self._total = self._stored_bytes(self._connect())
+
+    def _connect(self):
+        # sqlite3 connections can't be shared across threads; one per thread is cheap
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key, default=None):
+        conn = self._connect()
+        row = conn.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return default
+        conn.execute("UPDATE results SET accessed = ? WHERE key = ?", (time.time(), key))
+        self.hits += 1
+        return loads(row[0])
+
+    def set(self, key, value, operation=""):
+        blob = dumps(value)
+        if len(blob) > self.max_bytes:
+            return
+        now = time.time()
+        conn = self._connect()
+        replaced = conn.execute("SELECT size FROM results WHERE key = ?", (key,)).fetchone()
+        conn.execute("INSERT OR REPLACE INTO results (key, operation, size, created, accessed, value) "
+                     "VALUES (?, ?, ?, ?, ?, ?)", (key, operation, len(blob), now, now, blob))
+        self._total += len(blob) - (replaced[0] if replaced else 0)
+        if self._total > self.max_bytes:
+            self._evict(conn)
+
+    @staticmethod
+    def _stored_bytes(conn):
+        return conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+
+    def _evict(self, conn):
+        total = self._total = self._stored_bytes(conn)
+        if total <= self.max_bytes:
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            freed = 0
+            stale = []
+            for key, size in conn.execute("SELECT key, size FROM results ORDER BY accessed"):
+                if total - freed <= self.max_bytes:
+                    break
+                stale.append((key,))
+                freed += size
+            conn.executemany("DELETE FROM results WHERE key = ?", stale)
+            conn.execute("COMMIT")
+            self._total = total - freed
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def try_get(self, key, default=None):
+        """get() that treats an unreadable store (locked, corrupt entry) as a miss."""
+        try:
+            return self.get(key, default)
+        except (sqlite3.Error, ValueError):
+            self.errors += 1
+            return default
+
+    def try_set(self, key, value, operation=""):
+        """set() that gives up quietly when the store can't be written (full disk, unsupported value)."""
+        try:
+            self.set(key, value, operation)
+        except (sqlite3.Error, TypeError, ValueError):
+            self.errors += 1
+
+    def get_or_compute(self, key, compute, operation=""):
+        """
+        Returns the stored value for key, calling compute() and storing its result on a miss.
+        A store that can't be read or written only costs the recomputation.
+        """
+        missing = object()
+        value = self.try_get(key, missing)
+        if value is not missing:
+            return value
+        value = compute()
+        self.try_set(key, value, operation)
+        return value
+
+    def clear(self):
+        self._connect().execute("DELETE FROM results")
+        self._total = 0
+
+    def stats(self):
+        entries, size = self._connect().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        return {
+            "path": self.path,
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors
+        }
+
+_default_store = None
+_unavailable = set()
+_default_lock = threading.Lock()
+
+def default_store_path():
+    """RESULT_STORE_PATH, or results.sqlite in the per-user cache directory (never the source tree)."""
+    path = os.environ.get("RESULT_STORE_PATH")
+    if path:
+        return path
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, CACHE_DIR_NAME, "results.sqlite")
+
+def default_store():
+    """
+    The process-wide store configured by RESULT_STORE_PATH (default: see default_store_path;
+    "off" disables it) and RESULT_STORE_MAX_MB. None when disabled or when the path can't be
+    written (e.g. a read-only home in a container).
+    """
+    global _default_store
+    path = default_store_path()
+    if path == "off" or path in _unavailable:
+        return None
+    with _default_lock:
+        if _default_store is None or _default_store.path != path:
+            max_mb = float(os.environ.get("RESULT_STORE_MAX_MB", DEFAULT_MAX_BYTES / 2**20))
+            try:
+                _default_store = ResultStore(path, max_bytes=int(max_mb * 2**20))
+            except (OSError, sqlite3.Error) as e:
+                logger.warning("Result store disabled: can't open %s (%s)", path, e)
+                _unavailable.add(path)
+                return None
+        return _default_store
+
+def operation_name(fn):
+    """Operation name persist() stores fn's results under."""
+    return f"{fn.__module__}.{fn.__qualname__}"
+
+def persist(operation=None, dataset=None):
+    """
+    Decorator that keeps results in the default store, keyed by the operation name, the
+    fingerprinted arguments, the code version and, when given, dataset() (a content hash of
+    data the function reads without receiving it as an argument). Exceptions are not stored.
+    functools.wraps keeps the signature FastAPI uses for parameter parsing.
+    """
+    def decorator(fn):
+        name = operation or operation_name(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            store = default_store()
+            if store is None:
+                return fn(*args, **kwargs)
+            key = result_key(name, [args, kwargs], dataset() if dataset else None)
+            return store.get_or_compute(key, lambda: fn(*args, **kwargs), operation=name)
+        return wrapper
+    return decorator
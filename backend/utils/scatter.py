@@ -0,0 +1,157 @@
+import numpy as np
+import pandas as pd
+
+from backend.utils.lazy import lazy_import
+
+stats = lazy_import("scipy.stats")
+
+SCATTER_MODES = ('auto', 'points', 'hexbin')
+# Screen area per plotted point when the point budget comes from the plot size
+PIXELS_PER_POINT = 100
+COVERAGE_GRID = 64
+
+def point_budget(width, height):
+    return max(1, int(width * height) // PIXELS_PER_POINT)
+
+def _grid_cells(values, grid):
+    lo, hi = values.min(), values.max()
+    span = hi - lo if hi > lo else 1.0
+    return np.minimum(((values - lo) / span * grid).astype(np.int64), grid - 1)
+
+def density_sample(x, y, max_points, grid=COVERAGE_GRID, seed=0):
+    """
+    Sorted row positions of a downsample that keeps the point density: a uniform random
+    sample, except that every occupied cell of a grid x grid raster keeps at least one point
+    so sparse regions and outliers stay visible.
+    """
+    n = len(x)
+    if n <= max_points:
+        return np.arange(n)
+    rng = np.random.default_rng(seed)
+    cell = _grid_cells(x, grid) * grid + _grid_cells(y, grid)
+
+    order = rng.permutation(n)
+    # First (random) point of each occupied cell, then the rest in random order
+    _, first = np.unique(cell[order], return_index=True)
+    if len(first) >= max_points:
+        return np.sort(order[rng.choice(first, size=max_points, replace=False)])
+    rest = np.delete(order, first)
+    return np.sort(np.concatenate([order[first], rest[:max_points - len(first)]]))
+
+def hexbin(x, y, width=800, height=500, hex_px=12):
+    """
+    Counts on a hexagonal lattice sized to the plot: roughly width / hex_px hexagons across
+    (the lattice matplotlib's hexbin uses). Returns centers and counts of the occupied hexagons
+    and the hexagon size in data units.
+    """
+    nx = max(1, int(width / hex_px))
+    ny = max(1, int(nx * height / width / np.sqrt(3)))
+    xmin, xmax, ymin, ymax = x.min(), x.max(), y.min(), y.max()
+    sx = (xmax - xmin) / nx if xmax > xmin else 1.0
+    sy = (ymax - ymin) / ny if ymax > ymin else 1.0
+    gx, gy = (x - xmin) / sx, (y - ymin) / sy
+
+    # Each point goes to the nearer of two offset rectangular lattices
+    ix1, iy1 = np.round(gx).astype(np.int64), np.round(gy).astype(np.int64)
+    ix2, iy2 = np.floor(gx).astype(np.int64), np.floor(gy).astype(np.int64)
+    d1 = (gx - ix1) ** 2 + 3.0 * (gy - iy1) ** 2
+    d2 = (gx - ix2 - 0.5) ** 2 + 3.0 * (gy - iy2 - 0.5) ** 2
+    first = d1 < d2
+
+    # Both lattices are indexed on an (nx + 1) x (ny + 1) raster; the second is offset by half a cell
+    n1 = (nx + 1) * (ny + 1)
+    index = np.where(first, ix1 * (ny + 1) + iy1, n1 + ix2 * (ny + 1) + iy2)
+    counts = np.bincount(index, minlength=2 * n1)
+    occupied = np.flatnonzero(counts)
+    i, j = np.divmod(occupied % n1, ny + 1)
+    offset = np.where(occupied < n1, 0.0, 0.5)
+    return {
+        "x": (xmin + (i + offset) * sx).tolist(),
+        "y": (ymin + (j + offset) * sy).tolist(),
+        "count": counts[occupied].tolist(),
+        "size": [float(sx), float(sy)]
+    }
+
+def ols_fits(x, y, codes, k, confidence=0.95, n_grid=50):
+    """
+    Simple OLS line of y on x for each of k groups (codes in 0..k-1) from grouped sums,
+    with the confidence band of the mean response on a grid over each group's x range.
+    """
+    n = np.bincount(codes, minlength=k).astype(float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mx = np.bincount(codes, weights=x, minlength=k) / n
+        my = np.bincount(codes, weights=y, minlength=k) / n
+        dx, dy = x - mx[codes], y - my[codes]
+        sxx = np.bincount(codes, weights=dx * dx, minlength=k)
+        sxy = np.bincount(codes, weights=dx * dy, minlength=k)
+        syy = np.bincount(codes, weights=dy * dy, minlength=k)
+        slope = sxy / sxx
+        rss = np.maximum(syy - slope * sxy, 0.0)
+        s = np.sqrt(rss / (n - 2))
+
+    lo = pd.Series(x).groupby(codes).min().reindex(range(k)).to_numpy()
+    hi = pd.Series(x).groupby(codes).max().reindex(range(k)).to_numpy()
+    fits = []
+    for g in range(k):
+        if n[g] < 3 or not sxx[g] > 0:
+            fits.append(None)
+            continue
+        grid = np.linspace(lo[g], hi[g], n_grid)
+        fitted = my[g] + slope[g] * (grid - mx[g])
+        t = stats.t.ppf(0.5 + confidence / 2, n[g] - 2)
+        half = t * s[g] * np.sqrt(1 / n[g] + (grid - mx[g]) ** 2 / sxx[g])
+        fits.append({
+            "slope": float(slope[g]),
+            "intercept": float(my[g] - slope[g] * mx[g]),
+            "r_squared": float(sxy[g] ** 2 / (sxx[g] * syy[g])) if syy[g] > 0 else None,
+            "n": int(n[g]),
+            "x": grid.tolist(),
+            "y": fitted.tolist(),
+            "ci_low": (fitted - half).tolist(),
+            "ci_high": (fitted + half).tolist()
+        })
+    return fits
+
+def scatter_summary(df, x_col, y_col, color_col=None, mode='auto', width=800, height=500,
+                    max_points=None, hex_px=12, confidence=0.95, seed=0):
+    """
+    What a scatter plot with OLS trendlines needs, sized to the plot instead of the data:
+    a density-preserving sample of points (mode 'points', or 'auto' when the data fits the
+    budget) or hexagon counts ('hexbin'; 'auto' beyond the budget when there is no color),
+    plus the fitted line and confidence band per color group and overall.
+    """
+    if mode not in SCATTER_MODES:
+        raise ValueError(f"Unsupported mode '{mode}'")
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1")
+    if max_points is not None and max_points < 1:
+        raise ValueError("max_points must be at least 1")
+    cols = [x_col, y_col] + ([color_col] if color_col else [])
+    data = df[cols].dropna()
+    if len(data) < 3:
+        raise ValueError("Need at least 3 complete rows")
+    x = data[x_col].to_numpy(dtype=float)
+    y = data[y_col].to_numpy(dtype=float)
+    max_points = max_points if max_points is not None else point_budget(width, height)
+    if mode == 'auto':
+        mode = 'points' if len(x) <= max_points or color_col else 'hexbin'
+
+    result = {"mode": mode, "n": int(len(x)), "x_col": x_col, "y_col": y_col, "color_col": color_col}
+    if color_col:
+        codes, groups = pd.factorize(data[color_col], sort=True)
+        groups = [str(g) for g in groups]
+    else:
+        codes, groups = np.zeros(len(x), dtype=np.int64), []
+
+    if mode == 'points':
+        picked = density_sample(x, y, max_points, seed=seed)
+        result["points"] = {"x": x[picked].tolist(), "y": y[picked].tolist()}
+        if color_col:
+            result["points"]["color"] = [groups[c] for c in codes[picked]]
+    else:
+        result["hexbin"] = hexbin(x, y, width, height, hex_px)
+
+    result["fit"] = ols_fits(x, y, np.zeros(len(x), dtype=np.int64), 1, confidence)[0]
+    if color_col:
+        result["group_fits"] = dict(zip(groups, ols_fits(x, y, codes, len(groups), confidence)))
+    return result
@@ -0,0 +1,95 @@
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from backend.utils.cache import dataset_version, set_dataset_version
+
+MANIFEST = "manifest.json"
+
+def _code_dtype(n_categories):
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+def export_dataset(df, directory, source=None):
+    """
+    Writes each column of df to `directory` as a .npy file that can be memory-mapped:
+    numeric columns as-is, everything else as categorical codes (-1 = missing) with the
+    categories kept in the manifest. The export is written to a sibling temporary directory
+    and renamed into place, so readers never see a partial one.
+    `source` (any JSON value, e.g. the source file's path, size and mtime) is stored so a
+    later export_is_current() can tell whether the files still match it.
+    """
+    parent = os.path.dirname(os.path.abspath(directory))
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=".export-", dir=parent)
+
+    columns = []
+    for i, col in enumerate(df.columns):
+        series = df[col]
+        entry = {"name": col, "file": f"{i}.npy"}
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            values = series.to_numpy()
+            entry["kind"] = "numeric"
+        else:
+            codes, categories = pd.factorize(series, sort=True)
+            values = codes.astype(_code_dtype(len(categories)))
+            entry["kind"] = "categorical"
+            entry["categories"] = [str(c) for c in categories]
+        np.save(os.path.join(staging, entry["file"]), np.ascontiguousarray(values))
+        columns.append(entry)
+
+    # attrs carry load-time bookkeeping such as the coerced-value counts of the data profile
+    manifest = {"n_rows": int(len(df)), "columns": columns, "source": source, "attrs": dict(df.attrs)}
+    with open(os.path.join(staging, MANIFEST), "w") as f:
+        json.dump(manifest, f)
+
+    # The content hash is taken on the attached form so every worker can reuse it
+    manifest["version"] = dataset_version(attach_dataset(staging, register_version=False))
+    with open(os.path.join(staging, MANIFEST), "w") as f:
+        json.dump(manifest, f)
+
+    if os.path.exists(directory):
+        shutil.rmtree(directory)
+    os.rename(staging, directory)
+    return manifest
+
+def read_manifest(directory):
+    path = os.path.join(directory, MANIFEST)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+def export_is_current(directory, source):
+    manifest = read_manifest(directory)
+    return manifest is not None and manifest.get("source") == source and "version" in manifest
+
+def attach_dataset(directory, register_version=True):
+    """
+    DataFrame over the memory-mapped columns of an export. Pages are shared with every
+    other process mapping the same files and the arrays are read-only; categorical columns
+    are pandas Categoricals whose codes point straight at the mapped file.
+    """
+    manifest = read_manifest(directory)
+    if manifest is None:
+        raise FileNotFoundError(f"No dataset export in {directory}")
+
+    data = {}
+    for entry in manifest["columns"]:
+        values = np.load(os.path.join(directory, entry["file"]), mmap_mode="r")
+        if entry["kind"] == "categorical":
+            categories = pd.Index(entry["categories"], dtype=object)
+            values = pd.Categorical.from_codes(values, categories=categories, validate=False)
+        data[entry["name"]] = values
+    df = pd.DataFrame(data, copy=False)
+    df.attrs.update(manifest.get("attrs", {}))
+
+    if register_version and "version" in manifest:
+        set_dataset_version(df, manifest["version"])
+    return df
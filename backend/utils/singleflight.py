@@ -0,0 +1,91 @@
+import functools
+import json
+import threading
+
+from fastapi.encoders import jsonable_encoder
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls with the same key: the first caller (the leader) runs
+    the computation, later callers block until it finishes and share its result or exception.
+    Nothing is cached once the call completes.
+    """
+    registry = {}
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+        self._inflight = {}
+        self._lock = threading.Lock()
+        SingleFlight.registry[name] = self
+
+    def do(self, key, fn):
+        with self._lock:
+            self.calls += 1
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._inflight[key] = call
+                self.executions += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = fn()
+            return call.value
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            call.done.set()
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._inflight)
+
+    def stats(self):
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight": self.in_flight()
+        }
+
+def singleflight_stats():
+    """Stats for every single-flight group, keyed by group name."""
+    return {name: group.stats() for name, group in SingleFlight.registry.items()}
+
+def request_key(name, kwargs):
+    """Normalized key for a call: the function name plus its arguments as canonical JSON."""
+    return name + ":" + json.dumps(jsonable_encoder(kwargs), sort_keys=True, default=str)
+
+def coalesce(group):
+    """
+    Decorator for FastAPI endpoints: identical concurrent requests (same route and same
+    normalized arguments) share a single execution. functools.wraps keeps the signature
+    FastAPI uses for parameter parsing.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = request_key(fn.__qualname__, [args, kwargs])
+            return group.do(key, lambda: fn(*args, **kwargs))
+        return wrapper
+    return decorator
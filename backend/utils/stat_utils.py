@@ -1,10 +1,13 @@
 
 import numpy as np
 import pandas as pd
-from scipy import stats
-from sklearn.decomposition import PCA
-from sklearn.preprocessing import StandardScaler
-import statsmodels.api as sm
+from backend.utils.lazy import lazy_import
+
+from backend.utils.decomposition import fit_pca, standardize
+from backend.utils.hypothesis import chi_square_from_table
+
+stats = lazy_import("scipy.stats")
+sm = lazy_import("statsmodels.api")
 
 def calculate_entropy(series):
     """Calculates the Shannon Entropy of a categorical series."""
@@ -41,23 +44,34 @@ def fit_distribution(data, dist_name='norm'):
 
     return x, pdf, params
 
-def perform_pca(df, numeric_cols):
+def perform_pca(df, numeric_cols, n_components=None, method='full'):
     """
     Performs PCA on specified numeric columns.
     Returns pca object, standardized data, and transformed components.
+    The scaler and decomposition are cached per column set (see backend.utils.decomposition).
     """
-    data = df[numeric_cols].dropna()
-    scaler = StandardScaler()
-    scaled_data = scaler.fit_transform(data)
+    fit = fit_pca(df, numeric_cols, n_components=n_components, method=method)
+    _, scaled_data, _ = standardize(df, numeric_cols)
+    components = fit['pca'].transform(scaled_data)
     
-    pca = PCA()
-    components = pca.fit_transform(scaled_data)
-    
-    return pca, scaled_data, components
+    return fit['pca'], scaled_data, components
+
+def encode_binary_target(series, positive_label='Yes'):
+    """
+    Encodes a binary target as 0/1.
+    Numeric series are passed through; anything else is compared against positive_label.
+    NaNs are preserved so callers can still dropna().
+    """
+    if pd.api.types.is_numeric_dtype(series):
+        return series
+    encoded = series.eq(positive_label).astype(float)
+    return encoded.where(series.notna())
 
 def regression_analysis(df, target_col, predictor_cols, model_type='OLS'):
     """
     Runs OLS or Logit regression using statsmodels.
+    For Logit, a non-numeric target is encoded with encode_binary_target ('Yes' = 1);
+    see classification.fit_classifier for cached fits, scoring and ROC/calibration.
     """
     data = df[[target_col] + predictor_cols].dropna()
     Y = data[target_col]
@@ -67,7 +81,8 @@ def regression_analysis(df, target_col, predictor_cols, model_type='OLS'):
     if model_type == 'OLS':
         model = sm.OLS(Y, X).fit()
     elif model_type == 'Logit':
-        model = sm.Logit(Y, X).fit(disp=0)
+        # Label targets (e.g. Yes/No) are encoded in one vectorized pass
+        model = sm.Logit(encode_binary_target(Y), X).fit(disp=0)
     else:
         return None
         
@@ -83,16 +98,13 @@ def ks_test_normality(data):
     standardized_data = (data - data.mean()) / data.std()
     return stats.kstest(standardized_data, 'norm')
 
-from scipy.stats import chi2_contingency
 
 def cramers_v(x, y):
-    """Calculates Cramers V statistic for categorical-categorical association."""
-    confusion_matrix = pd.crosstab(x, y)
-    chi2 = chi2_contingency(confusion_matrix)[0]
-    n = confusion_matrix.sum().sum()
-    phi2 = chi2 / n
-    r, k = confusion_matrix.shape
-    return np.sqrt(phi2 / min(k-1, r-1))
+    """
+    Calculates Cramers V statistic for categorical-categorical association
+    (see hypothesis.cramers_v_matrix for every pair at once from the contingency cube).
+    """
+    return chi_square_from_table(pd.crosstab(x, y))["cramers_v"]
 
 def perform_ttest(df, group_col, value_col):
     """
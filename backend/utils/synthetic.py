@@ -0,0 +1,197 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from backend.utils.correlation import pairwise_pearson
+from backend.utils.data_loader import load_data, get_data_dictionary, default_dataset_path
+from backend.utils.lazy import available, lazy_import
+
+stats = lazy_import("scipy.stats")
+# Optional; only needed for Parquet output
+pa = lazy_import("pyarrow")
+pq = lazy_import("pyarrow.parquet")
+
+DEFAULT_CHUNK_SIZE = 250_000
+
+def _decimals(values, max_decimals=6):
+    """Smallest number of decimals that represents every value exactly."""
+    for d in range(max_decimals + 1):
+        if np.allclose(values, np.round(values, d)):
+            return d
+    return max_decimals
+
+def _normal_scores(values):
+    """Midrank normal scores, Phi^-1((rank - 0.5) / n), with NaN kept as NaN."""
+    ranks = pd.Series(values).rank(method='average').to_numpy()
+    n = np.count_nonzero(~np.isnan(ranks))
+    return stats.norm.ppf((ranks - 0.5) / n)
+
+def _nearest_correlation(matrix):
+    """Clips negative eigenvalues and rescales to a unit diagonal so the matrix is a valid correlation."""
+    matrix = np.nan_to_num((matrix + matrix.T) / 2)
+    np.fill_diagonal(matrix, 1.0)
+    w, v = np.linalg.eigh(matrix)
+    fixed = (v * np.maximum(w, 1e-8)) @ v.T
+    d = np.sqrt(np.diag(fixed))
+    return fixed / np.outer(d, d)
+
+def fit_copula(df=None, id_cols=None):
+    """
+    Fits a Gaussian copula to the survey, with columns ordered as in get_data_dictionary().
+    Numeric columns keep their empirical marginals (inverted through the sorted observed values).
+    Categorical columns keep their level frequencies. Each one is treated as an ordinal latent
+    variable whose levels are ordered by the mean of the numeric first principal component, so
+    the associations with the numeric columns carry over. The latent correlation matrix comes
+    from the normal scores of every column.
+    ID columns (unique integers; by default those named *_ID) are regenerated as sequences.
+    Defaults to the bundled survey, even when DATASET_PATH points elsewhere.
+    """
+    df = load_data(default_dataset_path()) if df is None else df
+    if df.empty:
+        raise ValueError("Cannot fit a synthetic model to an empty dataset")
+
+    schema = [c for c in get_data_dictionary() if c in df.columns]
+    columns = schema + [c for c in df.columns if c not in schema]
+    if id_cols is None:
+        id_cols = [c for c in columns if c.endswith('_ID') and df[c].is_unique]
+
+    numeric = [c for c in columns if c not in id_cols and pd.api.types.is_numeric_dtype(df[c])]
+    categorical = [c for c in columns if c not in id_cols and c not in numeric]
+
+    scores = {c: _normal_scores(df[c].to_numpy(dtype=float)) for c in numeric}
+    if numeric:
+        Z = np.column_stack([scores[c] for c in numeric])
+        r, _ = pairwise_pearson(Z)
+        _, vectors = np.linalg.eigh(_nearest_correlation(r))
+        pc1 = np.nan_to_num(Z) @ vectors[:, -1]
+    else:
+        pc1 = np.zeros(len(df))
+
+    marginals = {}
+    for c in numeric:
+        values = np.sort(df[c].dropna().to_numpy(dtype=float))
+        marginals[c] = {
+            'kind': 'numeric',
+            'values': values,
+            'integer': bool(pd.api.types.is_integer_dtype(df[c]) or np.all(values == np.round(values))),
+            'decimals': _decimals(values),
+            'missing': float(df[c].isna().mean()),
+            'dtype': df[c].dtype
+        }
+    for c in categorical:
+        observed = df[c].notna()
+        order = pd.Series(pc1[observed.to_numpy()]).groupby(df[c][observed].to_numpy()).mean().sort_values()
+        levels = order.index.to_numpy(dtype=object)
+        freqs = df[c].value_counts(normalize=True).reindex(levels).to_numpy()
+        codes = pd.Categorical(df[c], categories=levels).codes.astype(float)
+        codes[codes < 0] = np.nan
+        scores[c] = _normal_scores(codes)
+        marginals[c] = {
+            'kind': 'categorical',
+            'levels': levels,
+            'cumulative': np.cumsum(freqs) / freqs.sum(),
+            'missing': float(1 - observed.mean())
+        }
+
+    latent = numeric + categorical
+    r, _ = pairwise_pearson(np.column_stack([scores[c] for c in latent])) if latent else (np.eye(0), None)
+    correlation = _nearest_correlation(r)
+    return {
+        'columns': columns,
+        'id_cols': list(id_cols),
+        'latent': latent,
+        'marginals': marginals,
+        'correlation': correlation,
+        'cholesky': np.linalg.cholesky(correlation) if latent else correlation,
+        'source_rows': int(len(df))
+    }
+
+def sample(model, n_rows, rng, start_id=1):
+    """Draws n_rows synthetic rows from a fitted model as a DataFrame."""
+    rng = rng if isinstance(rng, np.random.Generator) else np.random.default_rng(rng)
+    latent = model['latent']
+    U = stats.norm.cdf(rng.standard_normal((n_rows, len(latent))) @ model['cholesky'].T)
+
+    data = {}
+    for j, c in enumerate(latent):
+        m = model['marginals'][c]
+        u = U[:, j]
+        if m['kind'] == 'numeric':
+            values = m['values']
+            if m['integer']:
+                column = values[np.minimum((u * len(values)).astype(np.int64), len(values) - 1)]
+            else:
+                # Interpolating between order statistics gives a continuous marginal
+                column = np.round(np.interp(u * (len(values) - 1), np.arange(len(values)), values), m['decimals'])
+            if m['missing'] > 0:
+                column = np.where(rng.random(n_rows) < m['missing'], np.nan, column)
+            elif pd.api.types.is_integer_dtype(m['dtype']):
+                column = column.astype(m['dtype'])
+        else:
+            codes = np.minimum(np.searchsorted(m['cumulative'], u, side='right'), len(m['levels']) - 1)
+            column = m['levels'][codes]
+            if m['missing'] > 0:
+                column = np.where(rng.random(n_rows) < m['missing'], None, column)
+        data[c] = column
+
+    for c in model['id_cols']:
+        data[c] = np.arange(start_id, start_id + n_rows, dtype=np.int64)
+    return pd.DataFrame(data, columns=model['columns'])
+
+def iter_chunks(model, n_rows, chunk_size=DEFAULT_CHUNK_SIZE, seed=0):
+    """Yields n_rows synthetic rows as DataFrames of at most chunk_size rows."""
+    rng = np.random.default_rng(seed)
+    done = 0
+    while done < n_rows:
+        size = min(chunk_size, n_rows - done)
+        yield sample(model, size, rng, start_id=done + 1)
+        done += size
+
+def generate(n_rows, seed=0, model=None):
+    """Synthetic dataset held in memory (see write_dataset for datasets larger than RAM)."""
+    model = model or fit_copula()
+    return sample(model, n_rows, np.random.default_rng(seed))
+
+def write_dataset(path, n_rows, chunk_size=DEFAULT_CHUNK_SIZE, seed=0, model=None, fmt=None):
+    """
+    Streams n_rows synthetic rows to CSV or Parquet (chosen by fmt or the file extension).
+    Only one chunk is in memory at a time; each Parquet chunk becomes one row group.
+    """
+    fmt = fmt or ('parquet' if path.endswith(('.parquet', '.pq')) else 'csv')
+    if fmt not in ('csv', 'parquet'):
+        raise ValueError(f"Unsupported format '{fmt}'")
+    if fmt == 'parquet' and not available("pyarrow"):
+        raise ValueError("Parquet output requires pyarrow")
+    model = model or fit_copula()
+
+    writer = None
+    try:
+        for i, chunk in enumerate(iter_chunks(model, n_rows, chunk_size, seed)):
+            if fmt == 'csv':
+                chunk.to_csv(path, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+            else:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+    return path
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic survey fitted to the real dataset.")
+    parser.add_argument("output", help="Destination .csv or .parquet file")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--format", choices=("csv", "parquet"))
+    args = parser.parse_args(argv)
+
+    write_dataset(args.output, args.rows, args.chunk_size, args.seed, fmt=args.format)
+    print(f"Wrote {args.rows:,} rows to {os.path.abspath(args.output)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+from collections import namedtuple
+
+from backend.utils import stat_utils
+
+NUMERIC = ['Age', 'Avg_Daily_Usage_Hours', 'Sleep_Hours_Per_Night',
+           'Mental_Health_Score', 'Conflicts_Over_Social_Media', 'Addicted_Score']
+PREDICTORS = ['Avg_Daily_Usage_Hours', 'Sleep_Hours_Per_Night', 'Mental_Health_Score']
+
+# target: the stat_utils function name or "METHOD /route/template" the case exercises.
+# max_rows: cases that are inherently O(rows x resamples) are skipped above this size.
+Case = namedtuple('Case', ['name', 'target', 'run', 'max_rows'], defaults=[None])
+
+def _function_cases():
+    return [
+        Case('entropy', 'calculate_entropy',
+             lambda df, client: stat_utils.calculate_entropy(df['Most_Used_Platform'])),
+        Case('fit_distribution_norm', 'fit_distribution',
+             lambda df, client: stat_utils.fit_distribution(df['Addicted_Score'], 'norm')),
+        Case('fit_distribution_gamma', 'fit_distribution',
+             lambda df, client: stat_utils.fit_distribution(df['Avg_Daily_Usage_Hours'], 'gamma'),
+             max_rows=1_000_000),
+        Case('perform_pca', 'perform_pca',
+             lambda df, client: stat_utils.perform_pca(df, NUMERIC)),
+        Case('encode_binary_target', 'encode_binary_target',
+             lambda df, client: stat_utils.encode_binary_target(df['Affects_Academic_Performance'])),
+        Case('regression_ols', 'regression_analysis',
+             lambda df, client: stat_utils.regression_analysis(df, 'Addicted_Score', PREDICTORS, 'OLS')),
+        Case('regression_logit', 'regression_analysis',
+             lambda df, client: stat_utils.regression_analysis(
+                 df.assign(Affects_Academic_Performance=stat_utils.encode_binary_target(
+                     df['Affects_Academic_Performance'])),
+                 'Affects_Academic_Performance', PREDICTORS, 'Logit')),
+        Case('ks_test_normality', 'ks_test_normality',
+             lambda df, client: stat_utils.ks_test_normality(df['Addicted_Score'])),
+        Case('cramers_v', 'cramers_v',
+             lambda df, client: stat_utils.cramers_v(df['Gender'], df['Most_Used_Platform'])),
+        Case('perform_ttest', 'perform_ttest',
+             lambda df, client: stat_utils.perform_ttest(df, 'Gender', 'Addicted_Score')),
+        Case('calculate_gini', 'calculate_gini',
+             lambda df, client: stat_utils.calculate_gini(df['Avg_Daily_Usage_Hours'].dropna().values)),
+    ]
+
+def _request(method, path, **kwargs):
+    def run(df, client):
+        response = client.request(method, path, **kwargs)
+        if response.status_code != 200:
+            raise RuntimeError(f"{method} {path} returned {response.status_code}: {response.text[:200]}")
+        return response
+    return run
+
+def _job(kind, params):
+    """Submits a job and follows its event stream until the final event."""
+    def run(df, client):
+        submitted = _request('POST', f'/api/jobs/{kind}', json={'params': params})(df, client).json()
+        _request('GET', submitted['events'], params={'poll_interval': 0.01})(df, client)
+        return submitted
+    return run
+
+def _cancel_job(df, client):
+    submitted = _request('POST', '/api/jobs/monte_carlo', json={'params': {'n_sim': 1000}})(df, client).json()
+    return _request('DELETE', f"/api/jobs/{submitted['id']}")(df, client)
+
+def _job_status(df, client):
+    submitted = _request('POST', '/api/jobs/regression',
+                         json={'params': {'target': 'Addicted_Score', 'predictors': PREDICTORS}})(df, client).json()
+    return _request('GET', f"/api/jobs/{submitted['id']}")(df, client)
+
+def _route_cases():
+    group = {'group_col': 'Gender', 'value_col': 'Addicted_Score'}
+    return [
+        Case('root', 'GET /', _request('GET', '/')),
+        Case('metrics', 'GET /metrics', _request('GET', '/metrics')),
+        Case('coalescing', 'GET /api/system/coalescing', _request('GET', '/api/system/coalescing')),
+        Case('startup', 'GET /api/system/startup', _request('GET', '/api/system/startup')),
+        Case('result_store', 'GET /api/system/result_store', _request('GET', '/api/system/result_store')),
+        Case('result_store_clear', 'DELETE /api/system/result_store', _request('DELETE', '/api/system/result_store')),
+        Case('summary', 'GET /api/summary', _request('GET', '/api/summary')),
+        Case('profile', 'GET /api/profile', _request('GET', '/api/profile')),
+        Case('raw_data', 'GET /api/raw_data', _request('GET', '/api/raw_data', params={'limit': 1000})),
+        Case('export_csv', 'POST /api/export/dataset',
+             _request('POST', '/api/export/dataset',
+                      json={'format': 'csv', 'columns': NUMERIC, 'where': {'Gender': ['Female']}})),
+        Case('export_arrow', 'POST /api/export/dataset', _request('POST', '/api/export/dataset', json={'format': 'arrow'})),
+        Case('export_artifact', 'POST /api/export/artifacts/{kind}',
+             _request('POST', '/api/export/artifacts/pca_scores', json={'format': 'parquet', 'params': {'cols': NUMERIC}})),
+        Case('dist', 'GET /api/eda/dist/{col}', _request('GET', '/api/eda/dist/Addicted_Score')),
+        Case('dist_fd', 'GET /api/eda/dist/{col}',
+             _request('GET', '/api/eda/dist/Avg_Daily_Usage_Hours', params={'bins': 'fd'})),
+        Case('pmf', 'GET /api/eda/pmf/{col}', _request('GET', '/api/eda/pmf/Conflicts_Over_Social_Media')),
+        Case('correlation_pearson', 'POST /api/bivariate/correlation',
+             _request('POST', '/api/bivariate/correlation', json={'method': 'pearson'})),
+        Case('correlation_spearman_partial', 'POST /api/bivariate/correlation',
+             _request('POST', '/api/bivariate/correlation', json={'method': 'spearman', 'partial': True})),
+        Case('correlation_kendall', 'POST /api/bivariate/correlation',
+             _request('POST', '/api/bivariate/correlation', json={'method': 'kendall'}), max_rows=1_000_000),
+        Case('regression', 'POST /api/models/regression',
+             _request('POST', '/api/models/regression',
+                      json={'target': 'Addicted_Score', 'predictors': PREDICTORS})),
+        Case('predict', 'POST /api/models/predict',
+             _request('POST', '/api/models/predict',
+                      json={'predictors': ['Addicted_Score', 'Sleep_Hours_Per_Night'],
+                            'rows': [{'Addicted_Score': 7, 'Sleep_Hours_Per_Night': 6}] * 100})),
+        Case('cv', 'POST /api/models/cv',
+             _request('POST', '/api/models/cv',
+                      json={'target': 'Addicted_Score', 'candidates': [PREDICTORS, PREDICTORS[:1]]}),
+             max_rows=1_000_000),
+        Case('pca', 'POST /api/multivariate/pca',
+             _request('POST', '/api/multivariate/pca', json={'cols': NUMERIC})),
+        Case('factor', 'POST /api/multivariate/factor',
+             _request('POST', '/api/multivariate/factor', json={'cols': NUMERIC})),
+        Case('cluster', 'POST /api/multivariate/cluster',
+             _request('POST', '/api/multivariate/cluster', json={'cols': NUMERIC, 'k_max': 6})),
+        Case('boxplot', 'POST /api/bivariate/boxplot',
+             _request('POST', '/api/bivariate/boxplot',
+                      json={'x_col': 'Most_Used_Platform', 'y_col': 'Addicted_Score'})),
+        Case('scatter_points', 'POST /api/bivariate/scatter',
+             _request('POST', '/api/bivariate/scatter',
+                      json={'x_col': 'Avg_Daily_Usage_Hours', 'y_col': 'Addicted_Score', 'color_col': 'Gender'})),
+        Case('scatter_hexbin', 'POST /api/bivariate/scatter',
+             _request('POST', '/api/bivariate/scatter',
+                      json={'x_col': 'Avg_Daily_Usage_Hours', 'y_col': 'Addicted_Score', 'mode': 'hexbin'})),
+        Case('crosstab_dimensions', 'GET /api/bivariate/crosstab', _request('GET', '/api/bivariate/crosstab')),
+        Case('crosstab_chi_square', 'POST /api/bivariate/crosstab',
+             _request('POST', '/api/bivariate/crosstab',
+                      json={'row': 'Academic_Level', 'col': 'Most_Used_Platform', 'chi_square': True})),
+        Case('crosstab_conditional', 'POST /api/bivariate/crosstab',
+             _request('POST', '/api/bivariate/crosstab',
+                      json={'row': 'Affects_Academic_Performance', 'normalize': 'all',
+                            'given': {'Most_Used_Platform': ['Instagram']}})),
+        Case('monte_carlo', 'GET /api/metrics/monte_carlo',
+             _request('GET', '/api/metrics/monte_carlo', params={'n_sim': 1000}), max_rows=100_000),
+        Case('ttest', 'POST /api/inference/ttest', _request('POST', '/api/inference/ttest', json=group)),
+        Case('test_welch', 'POST /api/inference/test',
+             _request('POST', '/api/inference/test', json={**group, 'test': 'welch'})),
+        Case('test_anova', 'POST /api/inference/test',
+             _request('POST', '/api/inference/test',
+                      json={'group_col': 'Most_Used_Platform', 'value_col': 'Addicted_Score', 'test': 'anova'})),
+        Case('all_pairs', 'POST /api/inference/all_pairs', _request('POST', '/api/inference/all_pairs', json={})),
+        Case('permutation', 'POST /api/inference/permutation',
+             _request('POST', '/api/inference/permutation', json={**group, 'n_resamples': 2000}),
+             max_rows=100_000),
+        Case('cramers', 'POST /api/bivariate/cramers',
+             _request('POST', '/api/bivariate/cramers',
+                      json={'cols': ['Gender', 'Academic_Level', 'Country', 'Most_Used_Platform', 'Relationship_Status']})),
+        Case('information', 'POST /api/bivariate/information', _request('POST', '/api/bivariate/information')),
+        Case('counterfactual', 'POST /api/inference/counterfactual',
+             _request('POST', '/api/inference/counterfactual',
+                      json={'predictors': ['Avg_Daily_Usage_Hours', 'Sleep_Hours_Per_Night'], 'n_boot': 500}),
+             max_rows=100_000),
+        Case('inequality', 'GET /api/metrics/inequality', _request('GET', '/api/metrics/inequality')),
+        Case('inequality_cols', 'GET /api/metrics/inequality',
+             _request('GET', '/api/metrics/inequality', params={'cols': NUMERIC})),
+        Case('composite_index', 'POST /api/metrics/index',
+             _request('POST', '/api/metrics/index',
+                      json={'weighting': 'pca',
+                            'rows': [{'Avg_Daily_Usage_Hours': 5, 'Addicted_Score': 7, 'Conflicts_Over_Social_Media': 3}]})),
+        Case('job_monte_carlo', 'POST /api/jobs/{kind}', _job('monte_carlo', {'n_sim': 2000}), max_rows=100_000),
+        Case('job_events', 'GET /api/jobs/{job_id}/events',
+             _job('regression', {'target': 'Addicted_Score', 'predictors': PREDICTORS})),
+        Case('job_list', 'GET /api/jobs', _request('GET', '/api/jobs')),
+        Case('job_status', 'GET /api/jobs/{job_id}', _job_status),
+        Case('job_cancel', 'DELETE /api/jobs/{job_id}', _cancel_job, max_rows=100_000),
+    ]
+
+def all_cases():
+    """(kind, case) pairs: 'function' cases call stat_utils directly, 'route' cases go through the TestClient."""
+    return [('function', c) for c in _function_cases()] + [('route', c) for c in _route_cases()]
+
+def uncovered(app):
+    """stat_utils functions and app routes that no case exercises."""
+    targets = {c.target for _, c in all_cases()}
+    functions = [name for name, obj in vars(stat_utils).items()
+                 if callable(obj) and getattr(obj, '__module__', None) == stat_utils.__name__
+                 and not name.startswith('_')]
+    routes = [f"{method} {route.path}" for route in app.routes if hasattr(route, 'methods')
+              for method in sorted(route.methods - {'HEAD', 'OPTIONS'})
+              if route.path not in ('/openapi.json', '/docs', '/docs/oauth2-redirect', '/redoc')]
+    return [t for t in functions + routes if t not in targets]
@@ -0,0 +1,52 @@
+import argparse
+import json
+import sys
+
+def load(path):
+    with open(path) as f:
+        report = json.load(f)
+    return report["meta"], {(r["case"], r["rows"]): r for r in report["results"]}
+
+def compare(base, new, metric="p50", threshold=1.10):
+    """Rows of (case, rows, base value, new value, ratio, flag) for cases measured in both runs."""
+    rows = []
+    for key in sorted(set(base) & set(new), key=lambda k: (k[1], k[0])):
+        b, n = base[key], new[key]
+        if b.get("status") != "ok" or n.get("status") != "ok":
+            continue
+        ratio = n[metric] / b[metric] if b[metric] else float("inf")
+        if ratio > threshold:
+            flag = "REGRESSION"
+        elif ratio < 1 / threshold:
+            flag = "improved"
+        else:
+            flag = ""
+        rows.append((key[0], key[1], b[metric], n[metric], ratio, flag))
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files.")
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument("--metric", default="p50",
+                        help="Result field to compare (p50, p95, p99, mean, peak_memory_bytes)")
+    parser.add_argument("--threshold", type=float, default=1.10,
+                        help="Ratio new/base above which a case counts as a regression")
+    args = parser.parse_args(argv)
+
+    base_meta, base = load(args.base)
+    new_meta, new = load(args.new)
+    print(f"{base_meta['commit']} -> {new_meta['commit']} ({args.metric}, threshold {args.threshold:.2f}x)")
+
+    rows = compare(base, new, args.metric, args.threshold)
+    print(f"{'case':32s} {'rows':>10s} {'base':>12s} {'new':>12s} {'ratio':>7s}")
+    for case, n_rows, b, n, ratio, flag in rows:
+        print(f"{case:32s} {n_rows:>10,d} {b:>12.4g} {n:>12.4g} {ratio:>6.2f}x {flag}")
+
+    regressions = [r for r in rows if r[5] == "REGRESSION"]
+    if regressions:
+        print(f"{len(regressions)} regression(s)")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
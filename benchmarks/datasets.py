@@ -0,0 +1,14 @@
+from functools import lru_cache
+
+from backend.utils.synthetic import fit_copula, generate
+
+@lru_cache(maxsize=1)
+def _model():
+    return fit_copula()
+
+def make_dataset(n_rows, seed=0):
+    """
+    Synthetic survey of n_rows rows drawn from a Gaussian copula fitted to the real data
+    (same schema and dtypes as load_data(), see backend.utils.synthetic).
+    """
+    return generate(n_rows, seed=seed, model=_model())
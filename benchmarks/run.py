@@ -0,0 +1,166 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+
+import backend.main as api
+from backend.utils.cache import LRUCache
+from benchmarks.cases import all_cases, uncovered
+from benchmarks.datasets import make_dataset
+
+DEFAULT_SIZES = "1000,100000,10000000"
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def _clear_caches():
+    for cache in LRUCache.registry.values():
+        cache.clear()
+
+def _timed(run, df, client, warm):
+    if not warm:
+        _clear_caches()
+    gc.collect()
+    start = time.perf_counter()
+    run(df, client)
+    return time.perf_counter() - start
+
+def _peak_memory(run, df, client, warm):
+    """Peak traced allocation (Python and numpy buffers) during one extra run."""
+    if not warm:
+        _clear_caches()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run(df, client)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def bench_case(case, df, client, repeat=5, warmup=1, max_time=30.0, warm=False):
+    """
+    Times one case: warmup runs, then up to `repeat` timed runs (stopping early once
+    max_time seconds have been spent), then one traced run for peak memory.
+    """
+    for _ in range(warmup):
+        _timed(case.run, df, client, warm)
+
+    timings = []
+    spent = 0.0
+    while len(timings) < repeat and (not timings or spent < max_time):
+        t = _timed(case.run, df, client, warm)
+        timings.append(t)
+        spent += t
+
+    timings = np.array(timings)
+    p50, p95, p99 = np.percentile(timings, [50, 95, 99])
+    return {
+        "runs": len(timings),
+        "mean": float(timings.mean()),
+        "min": float(timings.min()),
+        "max": float(timings.max()),
+        "p50": float(p50),
+        "p95": float(p95),
+        "p99": float(p99),
+        "calls_per_s": float(1 / timings.mean()),
+        "rows_per_s": float(len(df) / p50),
+        "peak_memory_bytes": int(_peak_memory(case.run, df, client, warm))
+    }
+
+def run_suite(sizes, repeat=5, warmup=1, max_time=30.0, warm=False, pattern=None, seed=0, log=print):
+    client = TestClient(api.app)
+    original = api.df
+    results = []
+    try:
+        for n_rows in sizes:
+            log(f"Generating {n_rows:,} rows")
+            df = make_dataset(n_rows, seed=seed)
+            # Routes read the module-level frame at call time
+            api.df = df
+            for kind, case in all_cases():
+                if pattern and pattern not in case.name:
+                    continue
+                entry = {"case": case.name, "kind": kind, "target": case.target, "rows": n_rows}
+                if case.max_rows is not None and n_rows > case.max_rows:
+                    entry["status"] = "skipped"
+                    results.append(entry)
+                    continue
+                try:
+                    entry.update(bench_case(case, df, client, repeat, warmup, max_time, warm))
+                    entry["status"] = "ok"
+                    log(f"  {kind:8s} {case.name:32s} p50={entry['p50'] * 1000:10.2f} ms  "
+                        f"peak={entry['peak_memory_bytes'] / 2 ** 20:8.1f} MiB")
+                except Exception as e:
+                    entry["status"] = "error"
+                    entry["error"] = f"{type(e).__name__}: {e}"
+                    log(f"  {kind:8s} {case.name:32s} ERROR {entry['error']}")
+                results.append(entry)
+            api.df = original
+            del df
+            gc.collect()
+    finally:
+        api.df = original
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark stat_utils functions and API routes on synthetic data.")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Comma-separated row counts")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed runs per case")
+    parser.add_argument("--max-time", type=float, default=30.0,
+                        help="Stop repeating a case after this many seconds")
+    parser.add_argument("--warm", action="store_true", help="Keep result caches between runs")
+    parser.add_argument("--filter", dest="pattern", help="Only run cases whose name contains this")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/<commit>.json)")
+    args = parser.parse_args(argv)
+
+    missing = uncovered(api.app)
+    if missing:
+        print(f"Warning: no benchmark case for {', '.join(missing)}", file=sys.stderr)
+
+    if not args.warm:
+        # Cold timings must not be served from the on-disk result store either
+        os.environ["RESULT_STORE_PATH"] = "off"
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    commit = _git_commit()
+    results = run_suite(sizes, args.repeat, args.warmup, args.max_time, args.warm, args.pattern, args.seed)
+
+    report = {
+        "meta": {
+            "commit": commit,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "sizes": sizes,
+            "repeat": args.repeat,
+            "warm_caches": args.warm
+        },
+        "results": results
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Saved {len(results)} results to {output}")
+
+if __name__ == "__main__":
+    main()
@@ -22,7 +22,7 @@ export default function BivariatePage() {
             try {
                 if (activeTab === 'boxplot') {
                     const { data } = await apiClient.post('/bivariate/boxplot', { x_col: xVar, y_col: yVar });
-                    setBoxData(data);
+                    setBoxData(data.groups);
                 } else {
                     const endpoint = activeTab === 'correlation' ? 'correlation' : 'cramers';
                     const { data } = await apiClient.post(`/bivariate/${endpoint}`);
@@ -15,7 +15,7 @@ export default function MetricsPage() {
                     apiClient.get('/metrics/inequality'),
                     apiClient.get('/metrics/monte_carlo')
                 ]);
-                setGini(giniRes.data);
+                setGini(giniRes.data.gini);
 
                 // Transform MC histogram for chart
                 const mcData = mcRes.data.dist.x.map((x: number, i: number) => ({
@@ -5,6 +5,8 @@ import { RefreshCw } from 'lucide-react';
 
 export default function MultivariatePage() {
     const [pcaData, setPcaData] = useState<any>(null);
+    const [factorData, setFactorData] = useState<any>(null);
+    const [clusterData, setClusterData] = useState<any>(null);
     const [loading, setLoading] = useState(false);
 
     // Hardcoded numeric columns for now
@@ -50,8 +52,22 @@ export default function MultivariatePage() {
         }
     };
 
+    const runSegmentation = async () => {
+        try {
+            const [factors, clusters] = await Promise.all([
+                apiClient.post('/multivariate/factor', { cols: selectedCols, n_factors: 2 }),
+                apiClient.post('/multivariate/cluster', { cols: selectedCols, k_min: 2, k_max: 8 })
+            ]);
+            setFactorData(factors.data);
+            setClusterData(clusters.data);
+        } catch (err) {
+            console.log("Segmentation unavailable", err);
+        }
+    };
+
     useEffect(() => {
         runPCA();
+        runSegmentation();
     }, []);
 
     return (
@@ -126,6 +142,58 @@ export default function MultivariatePage() {
                     <p className="text-gray-400">Run PCA to visualize data</p>
                 </div>
             )}
+
+            {factorData && clusterData && (
+                <div className="grid grid-cols-1 lg:grid-cols-12 gap-6">
+                    {/* Silhouette by k */}
+                    <div className="lg:col-span-8 bg-white p-6 rounded-xl border border-gray-100 shadow-sm h-[400px]">
+                        <h3 className="text-lg font-semibold text-gray-800 mb-4">
+                            Student Segments (k-means, best k = {clusterData.best_k})
+                        </h3>
+                        <ResponsiveContainer width="100%" height="90%">
+                            <ComposedChart data={clusterData.sweep}>
+                                <CartesianGrid strokeDasharray="3 3" vertical={false} />
+                                <XAxis dataKey="k" />
+                                <YAxis yAxisId="left" label={{ value: 'Silhouette', angle: -90, position: 'insideLeft' }} />
+                                <YAxis yAxisId="right" orientation="right" label={{ value: 'Inertia', angle: 90, position: 'insideRight' }} />
+                                <Tooltip />
+                                <Legend />
+                                <Bar yAxisId="left" dataKey="silhouette" name="Silhouette" fill="#82ca9d" barSize={30} radius={[4, 4, 0, 0]} />
+                                <Line yAxisId="right" type="monotone" dataKey="inertia" name="Inertia" stroke="#8884d8" strokeWidth={2} dot />
+                            </ComposedChart>
+                        </ResponsiveContainer>
+                    </div>
+
+                    {/* Varimax Factor Loadings */}
+                    <div className="lg:col-span-4 bg-white p-6 rounded-xl border border-gray-100 shadow-sm overflow-auto max-h-[400px]">
+                        <h3 className="text-lg font-semibold text-gray-800 mb-4">Factor Loadings (Varimax)</h3>
+                        <table className="w-full text-xs">
+                            <thead>
+                                <tr className="bg-gray-50 border-b">
+                                    <th className="px-3 py-2 text-left font-medium text-gray-500">Feature</th>
+                                    {factorData.factor_names.map((name: string) => (
+                                        <th key={name} className="px-3 py-2 text-right font-medium text-gray-500">{name}</th>
+                                    ))}
+                                </tr>
+                            </thead>
+                            <tbody>
+                                {factorData.feature_names.map((feature: string, i: number) => (
+                                    <tr key={feature} className="border-b last:border-0 hover:bg-gray-50">
+                                        <td className="px-3 py-2 font-medium text-gray-900 truncate max-w-[120px]" title={feature}>
+                                            {feature}
+                                        </td>
+                                        {factorData.loadings[i].map((value: number, j: number) => (
+                                            <td key={j} className="px-3 py-2 text-right text-gray-600 font-mono">
+                                                {value.toFixed(2)}
+                                            </td>
+                                        ))}
+                                    </tr>
+                                ))}
+                            </tbody>
+                        </table>
+                    </div>
+                </div>
+            )}
         </div>
     );
 }
@@ -2,10 +2,13 @@
 import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
-import pandas as pd
-from scipy.stats import skew, kurtosis
 from utils.data_loader import load_data
-from utils.stat_utils import fit_distribution, ks_test_normality, calculate_entropy
+from utils.stat_utils import fit_distribution, ks_test_normality
+from backend.utils.contingency import cube_for
+from backend.utils.information import cube_information
+from backend.utils.lazy import lazy_import
+
+stats = lazy_import("scipy.stats")
 
 st.set_page_config(page_title="Advanced Univariate Analysis", page_icon="📈", layout="wide")
 
@@ -45,9 +48,9 @@ ks_stat, ks_p = ks_test_normality(df[num_col])
 
 col1, col2, col3 = st.columns(3)
 with col1:
-    st.metric("Skewness", f"{skew(df[num_col], nan_policy='omit'):.3f}", delta_color="off", help=">0: Right skew, <0: Left skew")
+    st.metric("Skewness", f"{stats.skew(df[num_col], nan_policy='omit'):.3f}", delta_color="off", help=">0: Right skew, <0: Left skew")
 with col2:
-    st.metric("Kurtosis", f"{kurtosis(df[num_col], nan_policy='omit'):.3f}", delta_color="off", help=">3: Heavy tails (Leptokurtic)")
+    st.metric("Kurtosis", f"{stats.kurtosis(df[num_col], nan_policy='omit'):.3f}", delta_color="off", help=">3: Heavy tails (Leptokurtic)")
 with col3:
     st.metric("KS Test P-Value", f"{ks_p:.4e}", help="< 0.05 implies NOT Normal")
 
@@ -62,7 +65,9 @@ st.header("3. Categorical Entropy")
 st.markdown("Entropy measures the 'unpredictability' or 'information content' of a variable.")
 
 cat_col = st.selectbox("Select Categorical Variable:", ['Most_Used_Platform', 'Academic_Level', 'Gender', 'Country'], index=0)
-entropy_val = calculate_entropy(df[cat_col])
+# Entropies of every column come from one pass over the dataset's cached count cube
+information = cube_information(cube_for(df), ['Most_Used_Platform', 'Academic_Level', 'Gender', 'Country'])
+entropy_val = information['entropy'][information['cols'].index(cat_col)]
 
 st.metric(f"Shannon Entropy (bits)", f"{entropy_val:.3f}")
 
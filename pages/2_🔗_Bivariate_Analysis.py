@@ -4,6 +4,9 @@ import plotly.express as px
 import pandas as pd
 import numpy as np
 from utils.data_loader import load_data
+from utils.plots import scatter_figure
+from backend.utils.correlation import correlation_matrix
+from backend.utils.scatter import scatter_summary
 
 st.set_page_config(page_title="Bivariate Analysis & Covariance", page_icon="🔗", layout="wide")
 
@@ -17,9 +20,13 @@ st.header("1. Correlation Matrix")
 st.markdown("How strongly are numerical variables related?")
 
 numeric_df = df.select_dtypes(include=[np.number])
-corr_matrix = numeric_df.corr()
+corr_method = st.radio("Correlation method:", ["pearson", "spearman", "kendall"], horizontal=True)
 
-fig_corr = px.imshow(corr_matrix, text_auto=True, aspect="auto", color_continuous_scale="RdBu_r", title="Correlation Heatmap")
+# Cached per method and column set, so switching methods is instant
+corr_result = correlation_matrix(df, numeric_df.columns, method=corr_method)
+corr_matrix = pd.DataFrame(corr_result['r'], index=numeric_df.columns, columns=numeric_df.columns)
+
+fig_corr = px.imshow(corr_matrix, text_auto=True, aspect="auto", color_continuous_scale="RdBu_r", title=f"Correlation Heatmap ({corr_method.title()})")
 st.plotly_chart(fig_corr, use_container_width=True)
 
 # --- Covariance Explanation & Calculation ---
@@ -60,6 +67,8 @@ st.markdown("Visualize the relationship directly.")
 col_scat_color = st.selectbox("Color points by:", ['Gender', 'Academic_Level', 'Most_Used_Platform', 'None'], index=0)
 color_arg = None if col_scat_color == 'None' else col_scat_color
 
-fig_scatter = px.scatter(df, x=col_x, y=col_y, color=color_arg, trendline="ols", 
-                         title=f"Scatter Plot: {col_x} vs {col_y}", opacity=0.7)
+# Points are downsampled to the plot's size and the trendlines fitted server-side,
+# so large datasets never reach the browser in full
+scatter = scatter_summary(df, col_x, col_y, color_arg)
+fig_scatter = scatter_figure(scatter, title=f"Scatter Plot: {col_x} vs {col_y}", opacity=0.7)
 st.plotly_chart(fig_scatter, use_container_width=True)
@@ -4,8 +4,11 @@ import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
-from scipy.stats import norm
 from utils.data_loader import load_data
+from backend.utils.lazy import lazy_import
+from backend.utils.frequency import column_frequencies, density
+
+stats = lazy_import("scipy.stats")
 
 st.set_page_config(page_title="Probability Distributions", page_icon="🎲", layout="wide")
 
@@ -23,9 +26,9 @@ st.markdown("""
 # Use a discrete variable
 pmf_col = st.selectbox("Select Discrete Variable for PMF:", ['Conflicts_Over_Social_Media', 'Academic_Level', 'Gender'], index=0)
 
-# Calculate Probabilities
-pmf_data = df[pmf_col].value_counts(normalize=True).sort_index().reset_index()
-pmf_data.columns = [pmf_col, 'Probability']
+# Probabilities come from the per-column frequency cache built once per dataset
+pmf = column_frequencies(df, pmf_col).pmf()
+pmf_data = pd.DataFrame({pmf_col: pmf.index, 'Probability': pmf.to_numpy()})
 
 fig_pmf = px.bar(pmf_data, x=pmf_col, y='Probability', 
                  title=f"PMF of {pmf_col}", 
@@ -44,15 +47,19 @@ We will fit a **Normal (Gaussian) Distribution** to the data.
 
 pdf_col = st.selectbox("Select Continuous Variable for PDF:", ['Addicted_Score', 'Mental_Health_Score', 'Avg_Daily_Usage_Hours'], index=0)
 
-# Histogram
-fig_pdf = px.histogram(df, x=pdf_col, nbins=15, histnorm='probability density', 
-                       title=f"Histogram & PDF of {pdf_col}", opacity=0.5, color_discrete_sequence=['lightgray'])
+# Histogram, re-aggregated from the cached fine bins
+pdf_freq = column_frequencies(df, pdf_col)
+counts, edges = pdf_freq.histogram(15)
+fig_pdf = go.Figure(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=density(counts, edges), width=np.diff(edges),
+                           name='Histogram', opacity=0.5, marker_color='lightgray'))
+fig_pdf.update_layout(title=f"Histogram & PDF of {pdf_col}", xaxis_title=pdf_col, yaxis_title="probability density",
+                      bargap=0)
 
 # Fit Normal Distribution
-mu, std = norm.fit(df[pdf_col].dropna())
-xmin, xmax = df[pdf_col].min(), df[pdf_col].max()
+mu, std = stats.norm.fit(df[pdf_col].dropna())
+xmin, xmax = pdf_freq.lo, pdf_freq.hi
 x = np.linspace(xmin, xmax, 100)
-p = norm.pdf(x, mu, std)
+p = stats.norm.pdf(x, mu, std)
 
 # Add PDF Line
 fig_pdf.add_trace(go.Scatter(x=x, y=p, mode='lines', name='Normal Distribution (PDF)', line=dict(color='red', width=3)))
@@ -6,6 +6,7 @@ import plotly.graph_objects as go
 import numpy as np
 from utils.data_loader import load_data
 from utils.stat_utils import perform_pca
+from backend.utils.correlation import correlation_matrix
 
 st.set_page_config(page_title="Multivariate Analysis", page_icon="🕸️", layout="wide")
 
@@ -29,7 +30,7 @@ with col1:
 
 with col2:
     st.subheader("Correlation Matrix ($R$)")
-    corr_matrix = df[numeric_cols].corr()
+    corr_matrix = pd.DataFrame(correlation_matrix(df, numeric_cols)['r'], index=numeric_cols, columns=numeric_cols)
     st.dataframe(corr_matrix.style.text_gradient(cmap='RdBu', vmin=-1, vmax=1))
     st.caption("Standardized covariance.")
 
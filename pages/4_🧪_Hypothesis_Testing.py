@@ -1,8 +1,10 @@
 
 import streamlit as st
-import pandas as pd
-from scipy import stats
 from utils.data_loader import load_data
+from backend.utils.contingency import cube_for
+from backend.utils.lazy import lazy_import
+
+stats = lazy_import("scipy.stats")
 
 st.set_page_config(page_title="Hypothesis Testing", page_icon="🧪", layout="wide")
 
@@ -60,7 +62,8 @@ st.markdown("Test if there is a significant association between two categorical
 col_cat1 = st.selectbox("Select Category 1:", ['Gender', 'Academic_Level', 'Country'], index=1)
 col_cat2 = st.selectbox("Select Category 2:", ['Most_Used_Platform', 'Relationship_Status', 'Affects_Academic_Performance'], index=0)
 
-contingency_table = pd.crosstab(df[col_cat1], df[col_cat2])
+# Sliced from the dataset's count cube instead of rescanning the rows
+contingency_table = cube_for(df).table(col_cat1, col_cat2)
 st.write("Contingency Table:")
 st.dataframe(contingency_table)
 
@@ -1,11 +1,13 @@
 
 import streamlit as st
-import pandas as pd
 import numpy as np
 import plotly.express as px
-import statsmodels.api as sm
 from utils.data_loader import load_data
 from utils.stat_utils import regression_analysis
+from utils.plots import scatter_figure
+from backend.utils.scatter import scatter_summary
+from backend.utils.classification import fit_classifier
+from backend.utils.stat_utils import encode_binary_target
 
 st.set_page_config(page_title="Statistical Modeling", page_icon="🔮", layout="wide")
 
@@ -34,36 +36,48 @@ st.divider()
 st.header("2. Logistic Regression (Binary Classification)")
 st.markdown("Model the probability of a binary outcome (e.g., Affects Academic Performance).")
 
-df['Binary_Impact'] = df['Affects_Academic_Performance'].apply(lambda x: 1 if x == 'Yes' else 0)
-
 col_feats_log = st.multiselect("Predictors for Academic Impact:", ['Avg_Daily_Usage_Hours', 'Addicted_Score', 'Sleep_Hours_Per_Night'], default=['Addicted_Score'])
 
 if len(col_feats_log) > 0:
-    model_logit = regression_analysis(df, 'Binary_Impact', col_feats_log, model_type='Logit')
+    # Fitted once per dataset and predictor set; curves, ROC and calibration come precomputed
+    classifier = fit_classifier(df, 'Affects_Academic_Performance', col_feats_log, positive_label='Yes')
     
     st.write("### Logit Model Summary")
-    st.text(model_logit.summary().as_text())
+    st.text(classifier.summary_text)
+    
+    m1, m2, m3 = st.columns(3)
+    m1.metric("AUC", f"{classifier.metrics['auc']:.3f}")
+    m2.metric("Accuracy", f"{classifier.metrics['accuracy']:.1%}")
+    m3.metric("Brier Score", f"{classifier.metrics['brier']:.3f}")
     
     # Visualizing the Sigmoid
     if len(col_feats_log) == 1:
         x_name = col_feats_log[0]
         st.subheader(f"Probability Curve: Impact vs {x_name}")
+        curve = classifier.curves[x_name]
         
-        # Plot
-        x_range = np.linspace(df[x_name].min(), df[x_name].max(), 100)
-        exog = sm.add_constant(pd.DataFrame({x_name: x_range}))
-        
-        # Verify feature name match for prediction
-        # Statsmodels is tricky with names in add_constant. 
-        # Manual prediction for visualization: 1/(1+e^-(b0 + b1x))
-        params = model_logit.params
-        b0 = params['const']
-        b1 = params[x_name]
-        y_prob = 1 / (1 + np.exp(-(b0 + b1 * x_range)))
-        
-        fig_log = px.scatter(df, x=x_name, y='Binary_Impact', title="Logistic Regression Fit", opacity=0.3)
-        fig_log.add_scatter(x=x_range, y=y_prob, mode='lines', name='Probability')
+        # Downsampled to the plot's size; the OLS line is replaced by the logistic curve below
+        impact = df[[x_name]].assign(Binary_Impact=encode_binary_target(df['Affects_Academic_Performance']))
+        points = scatter_summary(impact, x_name, 'Binary_Impact', mode='points')['points']
+        fig_log = px.scatter(x=points['x'], y=points['y'], labels={'x': x_name, 'y': 'Binary_Impact'},
+                             title="Logistic Regression Fit", opacity=0.3)
+        fig_log.add_scatter(x=curve['x'], y=curve['probability'], mode='lines', name='Probability')
         st.plotly_chart(fig_log, use_container_width=True)
+    
+    c1, c2 = st.columns(2)
+    with c1:
+        fig_roc = px.line(x=classifier.roc['fpr'], y=classifier.roc['tpr'],
+                          labels={'x': 'False Positive Rate', 'y': 'True Positive Rate'},
+                          title=f"ROC Curve (AUC = {classifier.metrics['auc']:.3f})")
+        fig_roc.add_scatter(x=[0, 1], y=[0, 1], mode='lines', line=dict(dash='dash', color='gray'), name='Chance')
+        st.plotly_chart(fig_roc, use_container_width=True)
+    with c2:
+        cal = classifier.calibration
+        fig_cal = px.scatter(x=cal['predicted'], y=cal['observed'], size=cal['count'],
+                             labels={'x': 'Mean Predicted Probability', 'y': 'Observed Rate'},
+                             title="Calibration")
+        fig_cal.add_scatter(x=[0, 1], y=[0, 1], mode='lines', line=dict(dash='dash', color='gray'), name='Perfect')
+        st.plotly_chart(fig_cal, use_container_width=True)
 
 # --- Section 3: Quantile Regression Visual ---
 st.divider()
@@ -73,6 +87,6 @@ st.markdown("Does the relationship change for extreme users (90th percentile)?")
 q_target = 'Addicted_Score'
 q_feat = 'Avg_Daily_Usage_Hours'
 
-fig_quant = px.scatter(df, x=q_feat, y=q_target, trendline="ols", title=f"OLS Trend for {q_target}")
+fig_quant = scatter_figure(scatter_summary(df, q_feat, q_target), title=f"OLS Trend for {q_target}")
 st.plotly_chart(fig_quant, use_container_width=True)
 st.caption("Standard OLS shows the mean effect. Quantile regression would show slopes for the top 10% separate from the median.")
@@ -1,9 +1,12 @@
 
 import streamlit as st
-import pandas as pd
 import numpy as np
-from scipy import stats
+import plotly.graph_objects as go
 from utils.data_loader import load_data
+from backend.utils.lazy import lazy_import
+from backend.utils.counterfactual import fit_counterfactual_model, counterfactual_curve
+
+stats = lazy_import("scipy.stats")
 
 st.set_page_config(page_title="Hypothesis & Inference", page_icon="🧪", layout="wide")
 
@@ -57,24 +60,36 @@ st.header("2. Counterfactual Simulation (Causal Inference)")
 st.markdown("Simulating a 'What-If' scenario: **What if we reduced everyone's social media usage?**")
 
 reduction_hours = st.slider("Reduce Daily Usage by (Hours):", 0.0, 5.0, 2.0, 0.5)
+controls = st.multiselect("Adjust for (multivariable OLS):", ['Sleep_Hours_Per_Night', 'Mental_Health_Score', 'Conflicts_Over_Social_Media', 'Age'])
 
-# Simple Linear Model: Addiction = b0 + b1*Usage
-# Estimate b1 from data first
-slope, intercept, r_value, p_value, std_err = stats.linregress(df['Avg_Daily_Usage_Hours'], df['Addicted_Score'])
+# Addiction = b0 + b1*Usage (+ controls). The model and its bootstrapped coefficients are fitted
+# once per dataset and the whole 0-5 hour curve is evaluated in one pass; the slider only looks it up.
+model = fit_counterfactual_model(df, 'Addicted_Score', ['Avg_Daily_Usage_Hours'] + controls)
+curve = counterfactual_curve(model, 'Avg_Daily_Usage_Hours', np.linspace(-5.0, 0.0, 51), lower=0.0)
+slope = model['coefficients'][1]
 
 st.info(f"**Current Model:** Addiction Score increases by **{slope:.2f}** for every 1 hour of usage.")
 
-# Counterfactual Data
-df['Counterfactual_Usage'] = (df['Avg_Daily_Usage_Hours'] - reduction_hours).clip(lower=0)
-df['Projected_Addiction'] = df['Addicted_Score'] - (slope * reduction_hours)
+# Usage can't drop below 0 hours, so large reductions shift the mean by less than the slider value
+i = int(np.argmin(np.abs(curve['shift'] + reduction_hours)))
 
-current_mean = df['Addicted_Score'].mean()
-new_mean = df['Projected_Addiction'].mean()
+current_mean = model['baseline_mean']
+new_mean = curve['projected_mean'][i]
 
 col_c1, col_c2, col_c3 = st.columns(3)
 col_c1.metric("Current Avg Addiction", f"{current_mean:.2f}")
 col_c2.metric("Projected Avg Addiction", f"{new_mean:.2f}")
 col_c3.metric("Improvement", f"{(current_mean - new_mean):.2f}", delta_color="normal")
+st.caption(f"95% bootstrap interval for the projected average: {curve['ci_low'][i]:.2f} – {curve['ci_high'][i]:.2f}")
+
+fig_cf = go.Figure([
+    go.Scatter(x=-curve['shift'], y=curve['ci_high'], line=dict(width=0), showlegend=False, hoverinfo='skip'),
+    go.Scatter(x=-curve['shift'], y=curve['ci_low'], fill='tonexty', line=dict(width=0), name="95% band"),
+    go.Scatter(x=-curve['shift'], y=curve['projected_mean'], name="Projected mean")
+])
+fig_cf.add_vline(x=reduction_hours, line_dash="dash")
+fig_cf.update_layout(xaxis_title="Reduction in daily usage (hours)", yaxis_title="Avg Addiction Score")
+st.plotly_chart(fig_cf, use_container_width=True)
 
 st.markdown(f"""
 > **Intervention Interpretation:** If we could casually intervene to reduce usage by {reduction_hours} hours for everyone, 
@@ -4,8 +4,9 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from scipy import stats
 from utils.data_loader import load_data
+from backend.utils.composite_index import build_index
+from utils.engine import get_engine
 
 st.set_page_config(page_title="Experimental Metrics", page_icon="🧮", layout="wide")
 
@@ -13,6 +14,7 @@ st.title("7️⃣ Experimental & Research Metrics")
 st.markdown("Advanced custom indices, inequality measures, and simulations.")
 
 df = load_data()
+engine = get_engine(df)
 
 # --- Section 1: Index Construction ---
 st.header("1. Latent Index Construction (Digital Addiction Index)")
@@ -20,21 +22,25 @@ st.markdown("Constructing a composite score using Z-Score Normalization.")
 
 # Variables for index
 index_vars = ['Avg_Daily_Usage_Hours', 'Addicted_Score', 'Conflicts_Over_Social_Media']
-idx_df = df[index_vars].dropna()
-
-# Calculate Z-Scores
-for col in index_vars:
-    idx_df[f'Z_{col}'] = stats.zscore(idx_df[col])
-
-# Composite Index (Mean of Z-Scores)
-idx_df['Digital_Index'] = idx_df[[f'Z_{c}' for c in index_vars]].mean(axis=1)
-
+weighting = st.radio("Weighting:", ['equal', 'pca'], horizontal=True,
+                     format_func={'equal': "Equal (mean of Z-scores)", 'pca': "First principal component loadings"}.get)
+
+# Per-column mean/std and the index range are computed once per dataset and cached;
+# only the rows shown are normalized here
+index = build_index(df, index_vars, weighting=weighting)
+
+preview = df[index_vars].dropna().head(10)
+for j, col in enumerate(index_vars):
+    preview[f'Z_{col}'] = (preview[col] - index.center[j]) / index.scale[j]
+scores = index.score(preview[index_vars].to_numpy())
+preview['Digital_Index'] = scores['raw']
 # Rescale to 0-100 for readability
-min_val = idx_df['Digital_Index'].min()
-max_val = idx_df['Digital_Index'].max()
-idx_df['Digital_Index_Scaled'] = ((idx_df['Digital_Index'] - min_val) / (max_val - min_val)) * 100
+preview['Digital_Index_Scaled'] = scores['scaled']
+preview['Percentile'] = scores['percentile']
+
+st.dataframe(preview)
 
-st.dataframe(idx_df.head(10))
+idx_df = pd.DataFrame({'Digital_Index_Scaled': index.rescale(index.sorted_scores)})
 
 fig_hist = px.histogram(idx_df, x='Digital_Index_Scaled', nbins=30, title="Distribution of Constructed Digital Addiction Index", color_discrete_sequence=['teal'])
 st.plotly_chart(fig_hist, use_container_width=True)
@@ -45,14 +51,8 @@ st.divider()
 st.header("2. Inequality Analysis (Gini Coefficient)")
 st.markdown("Is usage concentrated among a small 'heavy user' group?")
 
-def gini(x):
-    total = 0
-    for i, xi in enumerate(x[:-1], 1):
-        total += np.sum(np.abs(xi - x[i:]))
-    return total / (len(x)**2 * np.mean(x))
-
 usage_sorted = np.sort(df['Avg_Daily_Usage_Hours'].dropna())
-gini_val = gini(usage_sorted)
+gini_val = engine.gini(['Avg_Daily_Usage_Hours'])['Avg_Daily_Usage_Hours']
 
 st.metric("Gini Coefficient (Usage)", f"{gini_val:.3f}", help="0 = Perfect Equality, 1 = Perfect Inequality")
 
@@ -74,13 +74,8 @@ st.header("3. Monte Carlo Simulation (Bootstrapping)")
 st.markdown("Estimating the confidence interval of the Mean Addiction Score via resampling.")
 
 n_simulations = st.slider("Number of Simulations:", 100, 5000, 1000)
-sample_means = []
-
-data_col = df['Addicted_Score'].dropna().values
-
-for _ in range(n_simulations):
-    resample = np.random.choice(data_col, size=len(data_col), replace=True)
-    sample_means.append(np.mean(resample))
+# Resample means drawn in vectorized blocks (the same core as /api/metrics/monte_carlo)
+sample_means = engine.bootstrap_means('Addicted_Score', n_simulations)
 
 lower_ci = np.percentile(sample_means, 2.5)
 upper_ci = np.percentile(sample_means, 97.5)
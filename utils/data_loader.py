@@ -1,6 +1,11 @@
+import logging
 import pandas as pd
 import os
 
+from backend.utils.data_loader import coerce_numeric
+
+logger = logging.getLogger(__name__)
+
 def load_data():
     """
     Loads the Students Social Media Addiction dataset.
@@ -21,31 +26,31 @@ def load_data():
         "/Users/gg/Documents/project_QT/Students Social Media Addiction.csv"
     ]
     
-    file_path = None
-    for path in possible_paths:
-        if os.path.exists(path):
-            file_path = path
-            break
+    # DATASET_PATH overrides the bundled file (e.g. a synthetic export for load testing)
+    file_path = os.environ.get("DATASET_PATH")
+    if not file_path:
+        for path in possible_paths:
+            if os.path.exists(path):
+                file_path = path
+                break
             
     if not file_path:
-        print("Dataset not found.")
+        logger.warning("Dataset not found.")
         return pd.DataFrame()
     
     try:
         df = pd.read_csv(file_path)
         
-        # Ensure numeric columns are actually numeric
-        numeric_cols = ['Age', 'Avg_Daily_Usage_Hours', 'Sleep_Hours_Per_Night', 
-                        'Mental_Health_Score', 'Conflicts_Over_Social_Media', 'Addicted_Score']
-        
-        for col in numeric_cols:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
+        # Ensure numeric columns are actually numeric (coerced counts land in df.attrs)
+        df = coerce_numeric(df)
+        for col, count in df.attrs["coerced"].items():
+            if count:
+                logger.warning("%s: %d unparseable values set to NaN", col, count)
                 
         return df
         
-    except Exception as e:
-        print(f"An error occurred while loading data: {e}")
+    except Exception:
+        logger.exception("Failed to load dataset %s", file_path)
         return pd.DataFrame()
 
 def get_data_dictionary():
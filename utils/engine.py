@@ -0,0 +1,76 @@
+import io
+import json
+import os
+import urllib.error
+import urllib.parse
+import urllib.request
+
+import numpy as np
+import pandas as pd
+
+from backend.utils.contingency import cube_for
+from backend.utils.hypothesis import cramers_v_matrix
+from backend.utils.resampling import bootstrap_means
+from backend.utils.stat_utils import calculate_gini
+
+# Base URL of a running API (e.g. http://localhost:8000); unset = compute in-process
+API_URL_ENV = "ANALYTICS_API_URL"
+
+class LocalEngine:
+    """Runs the shared analytics core in this process on the page's DataFrame."""
+    def __init__(self, df):
+        self.df = df
+
+    def cramers_matrix(self, cols):
+        return cramers_v_matrix(cube_for(self.df), cols)["cramers_v"]
+
+    def gini(self, cols):
+        return {col: calculate_gini(self.df[col].dropna().to_numpy(dtype=float)) for col in cols}
+
+    def bootstrap_means(self, col, n_sim, seed=None):
+        data = self.df[col].dropna().to_numpy(dtype=float)
+        return np.concatenate(list(bootstrap_means(data, n_sim, seed=seed)))
+
+class ApiEngine:
+    """
+    The same calls answered by the FastAPI backend, so its caches, request coalescing and
+    result store serve the Streamlit pages too. The API works on the dataset it loaded itself.
+    """
+    def __init__(self, base_url, timeout=120):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def _request(self, method, path, params=None, body=None):
+        url = self.base_url + path
+        if params:
+            url += "?" + urllib.parse.urlencode(params, doseq=True)
+        data = json.dumps(body).encode() if body is not None else None
+        request = urllib.request.Request(url, data=data, method=method,
+                                         headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return response.read()
+        except urllib.error.HTTPError as e:
+            detail = e.read().decode(errors="replace")[:200]
+            raise RuntimeError(f"{method} {path} returned {e.code}: {detail}") from None
+
+    def _json(self, method, path, **kwargs):
+        return json.loads(self._request(method, path, **kwargs))
+
+    def cramers_matrix(self, cols):
+        result = self._json("POST", "/api/bivariate/cramers", body={"cols": list(cols)})
+        return pd.DataFrame(result["cramers_v"], index=result["cols"], columns=result["cols"], dtype=float)
+
+    def gini(self, cols):
+        return self._json("GET", "/api/metrics/inequality", params={"cols": list(cols)})["gini"]
+
+    def bootstrap_means(self, col, n_sim, seed=None):
+        # Every draw, streamed by the export endpoint rather than only its summary
+        data = self._request("POST", "/api/export/artifacts/bootstrap",
+                             body={"format": "csv", "params": {"col": col, "n_sim": n_sim, "seed": seed}})
+        return pd.read_csv(io.BytesIO(data))["mean"].to_numpy()
+
+def get_engine(df):
+    """ApiEngine when ANALYTICS_API_URL is set, otherwise a LocalEngine over df."""
+    url = os.environ.get(API_URL_ENV)
+    return ApiEngine(url) if url else LocalEngine(df)
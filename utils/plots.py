@@ -0,0 +1,51 @@
+import plotly.express as px
+import plotly.graph_objects as go
+
+def _add_fit(fig, fit, name, color=None):
+    """Fitted line plus its shaded confidence band."""
+    fig.add_trace(go.Scatter(x=fit['x'], y=fit['ci_high'], line=dict(width=0), showlegend=False,
+                             hoverinfo='skip', legendgroup=name))
+    fig.add_trace(go.Scatter(x=fit['x'], y=fit['ci_low'], line=dict(width=0, color=color), fill='tonexty',
+                             opacity=0.2, showlegend=False, hoverinfo='skip', legendgroup=name))
+    fig.add_trace(go.Scatter(x=fit['x'], y=fit['y'], mode='lines', name=f"{name} (OLS)", legendgroup=name,
+                             line=dict(color=color)))
+
+def scatter_figure(summary, title=None, opacity=0.7):
+    """
+    Plotly figure for a backend scatter summary (see backend/utils/scatter.py): the sampled
+    points or hexagon counts plus the precomputed OLS lines, so the browser never receives
+    the full frame and plotly never refits.
+    """
+    fig = go.Figure()
+    palette = px.colors.qualitative.Plotly
+    group_colors = {}
+
+    if summary['mode'] == 'points':
+        points = summary['points']
+        if 'color' in points:
+            for i, group in enumerate(summary['group_fits']):
+                group_colors[group] = palette[i % len(palette)]
+                picked = [k for k, c in enumerate(points['color']) if c == group]
+                fig.add_trace(go.Scatter(x=[points['x'][k] for k in picked], y=[points['y'][k] for k in picked],
+                                         mode='markers', name=group, opacity=opacity, legendgroup=group,
+                                         marker=dict(color=group_colors[group])))
+        else:
+            fig.add_trace(go.Scatter(x=points['x'], y=points['y'], mode='markers', name="rows", opacity=opacity))
+    else:
+        hexes = summary['hexbin']
+        fig.add_trace(go.Scatter(x=hexes['x'], y=hexes['y'], mode='markers', name="rows per hexagon",
+                                 marker=dict(symbol='hexagon', size=12, color=hexes['count'],
+                                             colorscale='Viridis', showscale=True),
+                                 text=hexes['count'], hovertemplate="%{text} rows<extra></extra>"))
+
+    if summary.get('group_fits'):
+        for group, fit in summary['group_fits'].items():
+            if fit is not None:
+                _add_fit(fig, fit, group, group_colors.get(group))
+    elif summary['fit'] is not None:
+        _add_fit(fig, summary['fit'], "All rows", "crimson")
+
+    shown = len(summary['points']['x']) if summary['mode'] == 'points' else summary['n']
+    caption = f" ({shown:,} of {summary['n']:,} rows shown)" if shown < summary['n'] else ""
+    fig.update_layout(title=(title or "") + caption, xaxis_title=summary['x_col'], yaxis_title=summary['y_col'])
+    return fig